@@ -1,4 +1,4 @@
-from .utilities import open, fetch, fetch_over_ssh
+from .utilities import open, iter_models, fetch, fetch_over_ssh
 from .structures import Atom, Residue, Ligand, Chain, Model
 
 __author__ = "Sam Ireland"
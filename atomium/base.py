@@ -1,6 +1,15 @@
 """Decorators and metaclasses used by atomium structures."""
 
 import re
+import operator
+from functools import lru_cache
+from itertools import chain
+import numpy as np
+
+COLUMN_ATTRIBUTES = {"element", "name", "het__name", "chain__id"}
+COLUMN_OPERATORS = {"regex", "gt", "lt", "ge", "le", "ne", "eq"}
+RANGE_ATTRIBUTES = {"bvalue", "charge"}
+RANGE_OPERATORS = {"gt": "right", "ge": "left", "lt": "left", "le": "right"}
 
 def get_object_from_filter(obj, components):
     """Gets the object whose attributes are actually being queried, which may be
@@ -40,6 +49,11 @@ def attribute_matches_value(attribute, value, components):
     will determine whether an exact match is sought, or whether a more complex
     criterion is used.
     
+    Ordering comparisons which the attribute can't make itself are handed to
+    Python's own operators, so that ints and floats are compared as numbers,
+    and values which can't be ordered against each other (such as ``None``
+    and a number) don't match.
+
     :param attribute: the value of an object's attribute.
     :param value: the value to match against.
     :param list components: the components of the original key.
@@ -49,7 +63,12 @@ def attribute_matches_value(attribute, value, components):
         return re.match(value, attribute)
     possible_magic = f"__{components[-1]}__"
     if hasattr(attribute, possible_magic):
-        return getattr(attribute, possible_magic)(value)
+        result = getattr(attribute, possible_magic)(value)
+        if result is NotImplemented and components[-1] in RANGE_OPERATORS:
+            try:
+                return getattr(operator, components[-1])(attribute, value)
+            except TypeError: return False
+        return result
     return getattr(attribute, "__eq__")(value)
 
 
@@ -67,14 +86,98 @@ def filter_objects(objects, key, value):
     :param value: the value that the attribute must have.
     :rtype: ``dict``"""
 
+    structures = objects.structures
+    indices = compile_filter(key, value)(objects, np.arange(len(structures)))
+    return StructureSet(*[structures[index] for index in indices])
+
+
+def compile_filter(key, value):
+    """Turns a query keyword argument into a function which filters the
+    structures of a :py:class:`.StructureSet`. The function takes the
+    structure set and an array of positions within its
+    :py:meth:`~.StructureSet.structures`, and returns the positions of those
+    that match.
+
+    The key is only parsed once - compiled filters are cached by key and
+    value, where the value is a string, a number or ``None``. Filters on any
+    other value, such as a structure, are made afresh each time, so that the
+    cache doesn't keep the value (and everything it refers to) alive.
+
+    If the key is for one of the common attributes in ``COLUMN_ATTRIBUTES``,
+    the filter works on the structure set's cached column of that attribute,
+    so that each distinct value is checked once rather than every structure,
+    and when filtering a whole structure set the matching structures are
+    taken straight from its hash index of that attribute. Numeric comparisons
+    of the attributes in ``RANGE_ATTRIBUTES`` use the structure set's sorted
+    range index instead. Filters which can use an index have an ``indexed``
+    attribute of ``True``.
+
+    :param str key: the attribute to search, as in :py:func:`.filter_objects`.
+    :param value: the value that the attribute must have.
+    :rtype: ``function``"""
+
+    if value is None or isinstance(value, (str, int, float)):
+        return cached_filter(key, value)
+    return cached_filter.__wrapped__(key, value)
+
+
+@lru_cache(maxsize=1024, typed=True)
+def cached_filter(key, value):
+    """Compiles a query keyword argument into a filter function - this is what
+    :py:func:`.compile_filter` does, with the results cached.
+
+    :param str key: the attribute to search.
+    :param value: the value that the attribute must have.
+    :rtype: ``function``"""
+
     components = key.split("__")
-    matching_objects = []
-    for structure in objects.structures:
+    column = key if key in COLUMN_ATTRIBUTES else None
+    if components[-1] in COLUMN_OPERATORS:
+        if "__".join(components[:-1]) in COLUMN_ATTRIBUTES:
+            column = "__".join(components[:-1])
+    ranged = len(components) == 2 and components[0] in RANGE_ATTRIBUTES and (
+     components[1] in RANGE_OPERATORS and isinstance(value, (int, float))
+    )
+
+    def matches(structure):
         obj = get_object_from_filter(structure, components)
         attr = get_object_attribute_from_filter(obj, components)
-        if attribute_matches_value(attr, value, components):
-            matching_objects.append(structure)
-    return StructureSet(*matching_objects)
+        return attribute_matches_value(attr, value, components)
+
+    def apply(objects, indices):
+        structures = objects.structures
+        if column:
+            try:
+                codes, values = objects.column(column)
+            except TypeError: pass
+            else:
+                matching = [code for code, attr in enumerate(values)
+                 if attribute_matches_value(attr, value, components)]
+                if len(indices) < len(structures):
+                    return indices[np.isin(codes[indices], matching)]
+                index = objects.index(column)
+                return np.sort(np.concatenate(
+                 [index[code] for code in matching] + [np.zeros(0, dtype=int)]
+                ))
+        if ranged:
+            try:
+                numbers, order = objects.range_index(components[0])
+            except (TypeError, ValueError): pass
+            else:
+                side = RANGE_OPERATORS[components[1]]
+                position = np.searchsorted(numbers, value, side)
+                found = order[position:] if components[1][0] == "g" else (
+                 order[:position]
+                )
+                found = np.sort(found)
+                if len(indices) < len(structures):
+                    return indices[np.isin(indices, found)]
+                return found
+        return np.array(
+         [index for index in indices if matches(structures[index])], dtype=int
+        )
+    apply.indexed = bool(column or ranged)
+    return apply
 
 
 def query(func, tuple_=False):
@@ -90,17 +193,17 @@ def query(func, tuple_=False):
 
     def structures(self, *args, **kwargs):
         objects = func(self)
-        original = {s: n for n, s in enumerate(objects.structures)}
         if len(args) == 1:
             return {objects.get(args[0])} if args[0] in objects.ids else set()
-        for k, v in kwargs.items():
-            objects = filter_objects(objects, k, v)
-        if tuple_:
-            return tuple(sorted(
-             objects.structures, key=lambda s: original[s]
-            ))
-        else:
-            return set(objects.structures)
+        if not kwargs:
+            return tuple(objects.structures) if tuple_ else set(objects.members)
+        structures = objects.structures
+        indices = np.arange(len(structures))
+        filters = [compile_filter(k, v) for k, v in kwargs.items()]
+        for f in sorted(filters, key=lambda f: not f.indexed):
+            indices = f(objects, indices)
+        matching = [structures[index] for index in indices]
+        return tuple(matching) if tuple_ else set(matching)
     return structures
 
 
@@ -154,10 +257,18 @@ class StructureSet:
 
     They're basically sets optimised to lookup things by ID.
 
+    Because they don't change, the flat tuple of their structures and the set
+    used for membership tests are each made once, the first time they are
+    needed. Membership is checked in that set first, and only then by equality
+    against each structure.
+
     :param \* args: the structures that will make up the StructureSet."""
 
+    changes = 0
+
     def __init__(self, *args):
-        self._d = {}
+        self._d, self._columns, self._indexes = {}, {}, {}
+        self._structures, self._members = None, None
         for obj in args:
             if obj._id in self._d:
                 self._d[obj._id].add(obj)
@@ -172,7 +283,7 @@ class StructureSet:
                 if key in new._d:
                     new._d[key].update(value)
                 else:
-                    new._d[key] = value
+                    new._d[key] = set(value)
         return new
 
 
@@ -180,6 +291,14 @@ class StructureSet:
         return len(self.structures)
 
 
+    def __iter__(self):
+        return iter(self.structures)
+
+
+    def __contains__(self, obj):
+        return obj in self.members
+
+
     @property
     def ids(self):
         """Returns the IDs of the StructureSet.
@@ -193,11 +312,23 @@ class StructureSet:
     def structures(self):
         """Returns the structures of the StructureSet.
 
-        :rtype: ``list``"""
+        :rtype: ``tuple``"""
 
-        structures = []
-        for s in self._d.values(): structures += s
-        return structures
+        if self._structures is None:
+            self._structures = tuple(chain.from_iterable(self._d.values()))
+        return self._structures
+
+
+    @property
+    def members(self):
+        """Returns the structures of the StructureSet as a set, for quick
+        membership tests.
+
+        :rtype: ``frozenset``"""
+
+        if self._members is None:
+            self._members = frozenset(self.structures)
+        return self._members
 
 
     def get(self, id):
@@ -208,3 +339,83 @@ class StructureSet:
 
         matches = self._d.get(id, set())
         for match in matches: return match
+
+
+    def column(self, key):
+        """Gets the values that the structures have for some attribute, which
+        can be a double-underscore separated chain of attributes such as
+        ``het__name``. So that they can be filtered quickly, they are returned
+        as an array of integer codes (one for each structure, in the order of
+        :py:meth:`structures`) and a list of the distinct values that the codes
+        refer to.
+
+        Columns are made the first time they are needed, and made again if
+        ``StructureSet.changes`` has been incremented since - which happens
+        whenever a structure's name, or the structure it belongs to, changes.
+
+        :param str key: the attribute to get.
+        :raises TypeError: if the values can't be hashed.
+        :rtype: ``tuple``"""
+
+        column = self._columns.get(key)
+        if column is None or column[0] != StructureSet.changes:
+            components, values = key.split("__"), {}
+            codes = np.array([values.setdefault(
+             get_object_attribute_from_filter(
+              get_object_from_filter(structure, components), components
+             ), len(values)
+            ) for structure in self.structures], dtype=int)
+            column = (StructureSet.changes, codes, list(values))
+            self._columns[key] = column
+        return column[1], column[2]
+
+
+    def index(self, key):
+        """Gets a hash index of the structures by some attribute - a list with
+        an array for each of the distinct values in the attribute's
+        :py:meth:`column`, holding the positions of the structures which have
+        that value.
+
+        :param str key: the attribute to index by.
+        :raises TypeError: if the values can't be hashed.
+        :rtype: ``list``"""
+
+        codes, values = self.column(key)
+        index = self._indexes.get(key)
+        if index is None or index[0] is not codes:
+            order = np.argsort(codes, kind="stable")
+            counts = np.bincount(codes, minlength=len(values))
+            index = (codes, np.split(order, np.cumsum(counts)[:-1]))
+            self._indexes[key] = index
+        return index[1]
+
+
+    def range_index(self, key):
+        """Gets a range index of the structures by some numeric attribute, for
+        quickly finding those above or below some value. Two arrays are
+        returned - the sorted values, and the positions of the structures in
+        that order. Structures whose value is ``None`` or ``nan`` are left out,
+        as they don't match any comparison.
+
+        Like columns, range indexes are remade when ``StructureSet.changes`` is
+        incremented, which happens when an atom's B-value or charge is set.
+
+        :param str key: the attribute to index by.
+        :raises ValueError: if the values aren't numbers.
+        :rtype: ``tuple``"""
+
+        index = self._indexes.get(("range", key))
+        if index is None or index[0] != StructureSet.changes:
+            values = [
+             get_object_attribute_from_filter(structure, [key])
+             for structure in self.structures
+            ]
+            numbers = np.array(
+             [np.nan if value is None else value for value in values],
+             dtype=float
+            )
+            order = np.nonzero(~np.isnan(numbers))[0]
+            order = order[np.argsort(numbers[order], kind="stable")]
+            index = (StructureSet.changes, numbers[order], order)
+            self._indexes[("range", key)] = index
+        return index[1:]
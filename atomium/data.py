@@ -1,5 +1,9 @@
 """Contains logic for turning data dictionaies into a parsed Python objects."""
 
+import re
+import numpy as np
+from functools import lru_cache
+from itertools import groupby, product
 from .structures import *
 
 class File:
@@ -171,7 +175,7 @@ class File:
         return self._models[0]
 
 
-    def generate_assembly(self, id):
+    def generate_assembly(self, id, lazy=False):
         """Generates a new model from the existing model using one of the file's
         set of assembly instructions (for which you provide the ID).
 
@@ -186,7 +190,18 @@ class File:
             >>> pdb.generate_assembly(5)
             <Model (12 chains, 24 ligands)>
 
+        All the copies are stored in the new model's coordinate store, and the
+        transformations are applied to that in batches rather than atom by atom.
+
+        If you only need part of a large assembly, or summary values for it,
+        ``lazy=True`` gives an :py:class:`.AssemblyView` instead, which only
+        makes or moves atoms when they are asked for:
+
+            >>> pdb.generate_assembly(5, lazy=True)
+            <AssemblyView (3 copies)>
+
         :param int id: the ID of the assembly to generate.
+        :param bool lazy: if ``True``, an ``AssemblyView`` is returned.
         :rtype: ``Model``"""
         
         m = self._models[0]
@@ -194,22 +209,517 @@ class File:
             if assembly["id"] == id: break
         else:
             raise ValueError(f"No assembly with ID {id}")
-        all_structures = []
-        for t in assembly["transformations"]:
-            structures = {}
-            for chain_id in t["chains"]:
-                for obj in list(m.chains()) + list(m.ligands() | m.waters()):
-                    if obj._internal_id == chain_id:
-                        copy = obj.copy()
-                        if isinstance(copy, Ligand):
-                            copy._chain = structures.get(obj.chain)
-                        structures[obj] = copy
-            atoms = set()
-            for s in structures.values(): atoms.update(s.atoms())
-            Atom.transform_atoms(t["matrix"], *atoms)
-            Atom.translate_atoms(t["vector"], *atoms)
-            all_structures += structures.values()
-        return Model(*all_structures)
+        if lazy: return AssemblyView(m, assembly["transformations"])
+        return assemble_model(
+         molecules_by_internal_id(m), assembly["transformations"]
+        )
+
+
+    def generate_unit_cell(self):
+        """Generates a new model containing the contents of the structure's
+        crystal unit cell, by applying each of the space group's symmetry
+        operators to the existing model. Each copy is moved by whole unit cells
+        so that its centre lies within the cell:
+
+            >>> pdb = atomium.fetch('1lol')
+            >>> pdb.generate_unit_cell()
+            <Model (4 chains, 12 ligands)>
+
+        :raises ValueError: if the file has no unit cell, or its space group\
+        isn't one that proteins crystallise in.
+        :rtype: ``Model``"""
+
+        m = self._models[0]
+        molecules = molecules_by_internal_id(m)
+        return assemble_model(molecules, unit_cell_transformations(
+         m._atom_arrays()[0].coordinates, list(molecules),
+         getattr(self, "_crystallography", {})
+        ))
+
+
+
+class AssemblyView:
+    """A biological assembly which is never made into a single
+    :py:class:`.Model`. It holds the asymmetric unit model and the assembly's
+    transformations, and each copy's atoms are only moved into place (or made
+    at all) when they are asked for. Copies are numbered in the order of the
+    transformations that make them.
+
+    Spatial searches work across every copy without making any of them.
+
+    :param Model model: the asymmetric unit.
+    :param list transformations: the assembly's transformations."""
+
+    def __init__(self, model, transformations):
+        self._model, self._transformations = model, transformations
+        self._matrices = np.array(
+         [t["matrix"] for t in transformations], dtype=float
+        ).reshape(-1, 3, 3)
+        self._vectors = np.array(
+         [t["vector"] for t in transformations], dtype=float
+        ).reshape(-1, 3)
+        self._store = None
+
+
+    def __repr__(self):
+        return "<AssemblyView ({} cop{})>".format(
+         len(self), "y" if len(self) == 1 else "ies"
+        )
+
+
+    def __len__(self):
+        return len(self._transformations)
+
+
+    @property
+    def model(self):
+        """The asymmetric unit model that the copies are made from.
+
+        :rtype: ``Model``"""
+
+        return self._model
+
+
+    @property
+    def transformations(self):
+        """The transformations which make each copy.
+
+        :rtype: ``list``"""
+
+        return self._transformations
+
+
+    @property
+    def mass(self):
+        """The mass of the whole assembly.
+
+        :rtype: ``float``"""
+
+        masses = self._arrays().masses
+        return round(float(sum(masses[rows].sum() for rows in self._rows)), 12)
+
+
+    @property
+    def center_of_mass(self):
+        """The centre of mass of the whole assembly, worked out from each
+        copy's coordinates without making any atoms.
+
+        :rtype: ``numpy.ndarray``"""
+
+        masses = self._arrays().masses
+        total = sum(
+         (self.coordinates(n) * masses[rows, None]).sum(axis=0)
+         for n, rows in enumerate(self._rows)
+        )
+        return total / self.mass
+
+
+    def molecules(self, n):
+        """Returns the molecules of the asymmetric unit that one of the copies
+        is made from.
+
+        :param int n: the number of the copy.
+        :rtype: ``set``"""
+
+        self._arrays()
+        return self._molecules_of(n)
+
+
+    def atoms(self, n):
+        """Returns the atoms of the asymmetric unit that one of the copies is
+        made from, in the same order as the rows of :py:meth:`coordinates`.
+
+        :param int n: the number of the copy.
+        :rtype: ``tuple``"""
+
+        arrays = self._arrays()
+        return tuple(arrays.atoms[row] for row in self._rows[n])
+
+
+    def coordinates(self, n):
+        """Returns the coordinates that the atoms of one of the copies have
+        once transformed, without making any atoms.
+
+        :param int n: the number of the copy.
+        :rtype: ``numpy.ndarray``"""
+
+        coordinates = self._arrays().coordinates[self._rows[n]]
+        return coordinates @ self._matrices[n].T + self._vectors[n]
+
+
+    def copy(self, n):
+        """Makes one of the copies into a :py:class:`.Model` of its own, with
+        new atoms in their transformed locations. Each copy is only made once.
+
+        :param int n: the number of the copy.
+        :rtype: ``Model``"""
+
+        self._arrays()
+        if n not in self._copies:
+            self._copies[n] = assemble_model(
+             self._molecules, [self._transformations[n]]
+            )
+        return self._copies[n]
+
+
+    def atoms_in_sphere(self, location, radius, *args, **kwargs):
+        """Finds the atoms of every copy which are within a given distance of
+        some location. Copies which can't reach the sphere are ruled out using
+        their bounding spheres, and the rest are searched using the asymmetric
+        unit's spatial index - no atoms are made or moved.
+
+        They are returned as ``(n, atom)`` pairs, where ``n`` is the number of
+        the copy and ``atom`` is the asymmetric unit atom it is a copy of. Any
+        other arguments filter the atoms as with :py:meth:`~.Model.atoms`.
+
+        :param tuple location: the centre of the sphere.
+        :param float radius: the radius of the sphere.
+        :rtype: ``set``"""
+
+        location = np.array(location, dtype=float)
+        arrays = self._arrays()
+        grid = arrays.grid(self._model._cell_size)
+        found = set()
+        for n in self._reachable(location, radius):
+            rows = self._rows[n]
+            matrix, vector = self._matrices[n], self._vectors[n]
+            if np.allclose(matrix @ matrix.T, np.identity(3)):
+                local = matrix.T @ (location - vector)
+                _, indices, _ = grid.pairs([local], radius)
+                indices = indices[np.isin(indices, rows)]
+            else:
+                distances = np.linalg.norm(
+                 self.coordinates(n) - location, axis=1
+                )
+                indices = rows[distances <= radius]
+            found.update((int(n), arrays.atoms[index]) for index in indices)
+        if args or kwargs:
+            atoms = StructureSet(*{atom for _, atom in found})
+            atoms = query(lambda self: atoms)(self, *args, **kwargs)
+            found = {(n, atom) for n, atom in found if atom in atoms}
+        return found
+
+
+    def _reachable(self, location, radius):
+        """Gets the numbers of the copies whose bounding spheres come within
+        some distance of a location.
+
+        :param numpy.ndarray location: the location.
+        :param float radius: the distance.
+        :rtype: ``numpy.ndarray``"""
+
+        arrays = self._arrays()
+        if self._bounds is None or self._bounds[:2] != (arrays, arrays.moves):
+            bounds = {}
+            for n, rows in enumerate(self._rows):
+                key = id(rows)
+                if key not in bounds:
+                    bounds[key] = (np.zeros(3), -np.inf)
+                    if len(rows):
+                        coordinates = arrays.coordinates[rows]
+                        center = coordinates.mean(axis=0)
+                        bounds[key] = (center, np.linalg.norm(
+                         coordinates - center, axis=1
+                        ).max())
+            centers = np.array([bounds[id(rows)][0] for rows in self._rows])
+            radii = np.array([bounds[id(rows)][1] for rows in self._rows])
+            centers = np.einsum(
+             "nij,nj->ni", self._matrices, centers.reshape(-1, 3)
+            ) + self._vectors
+            radii = radii * np.linalg.norm(self._matrices, ord=2, axis=(1, 2))
+            self._bounds = (arrays, arrays.moves, centers, radii)
+        _, _, centers, radii = self._bounds
+        distances = np.linalg.norm(centers - location, axis=1)
+        return np.nonzero(distances <= radii + radius)[0]
+
+
+    def _arrays(self):
+        """Gets the asymmetric unit's :py:class:`.AtomArrays` store. If the
+        store is new (because the model's atoms have changed), the molecules
+        and rows that each copy is made from are worked out again, and any
+        copies already made are discarded.
+
+        :rtype: ``AtomArrays``"""
+
+        arrays = self._model._atom_arrays()[0]
+        if arrays is not self._store:
+            self._molecules = molecules_by_internal_id(self._model)
+            rows = {}
+            for n, t in enumerate(self._transformations):
+                chains = tuple(t["chains"])
+                if chains not in rows:
+                    rows[chains] = self._model._rows_of(self._molecules_of(n))
+            self._rows = [
+             rows[tuple(t["chains"])] for t in self._transformations
+            ]
+            self._store, self._copies, self._bounds = arrays, {}, None
+        return arrays
+
+
+    def _molecules_of(self, n):
+        """Gets the asymmetric unit molecules one of the copies is made from.
+
+        :param int n: the number of the copy.
+        :rtype: ``set``"""
+
+        return set(molecule for chain_id in self._transformations[n]["chains"]
+         for molecule in self._molecules.get(chain_id, []))
+
+
+def molecules_by_internal_id(model):
+    """Groups the chains, ligands and waters of a model by their internal
+    IDs, which are the IDs that assembly transformations refer to.
+
+    :param Model model: the model to look in.
+    :rtype: ``dict``"""
+
+    molecules = {}
+    for obj in list(model.chains()) + list(model.ligands() | model.waters()):
+        molecules.setdefault(obj._internal_id, []).append(obj)
+    return molecules
+
+
+def assemble_model(molecules, transformations):
+    """Makes a new model by copying molecules for each of some assembly
+    transformations and moving the copies into place.
+
+    :param dict molecules: the molecules to copy, by internal ID.
+    :param list transformations: the transformations to apply.
+    :rtype: ``Model``"""
+
+    all_structures, atoms, blocks = [], [], []
+    for t in transformations:
+        structures = {}
+        for chain_id in t["chains"]:
+            for obj in molecules.get(chain_id, []):
+                copy = obj.copy()
+                if isinstance(copy, Ligand):
+                    copy._chain = structures.get(obj.chain)
+                structures[obj] = copy
+        block = [a for s in structures.values() for a in s.atoms()]
+        blocks.append((t["matrix"], t["vector"], len(block)))
+        atoms += block
+        all_structures += structures.values()
+    model = Model(*all_structures)
+    model._arrays = AtomArrays(*atoms)
+    transform_blocks(model._arrays.coordinates, blocks)
+    model._arrays.moved()
+    return model
+
+
+def transform_blocks(coordinates, blocks):
+    """Transforms consecutive blocks of rows of a coordinates array in place,
+    each by its own matrix and then vector. Runs of blocks with the same number
+    of rows are transformed together as one ``(blocks, rows, 3)`` array.
+
+    :param numpy.ndarray coordinates: the ``(N, 3)`` array to transform.
+    :param list blocks: ``(matrix, vector, rows)`` for each block, in order."""
+
+    start = 0
+    for size, run in groupby(blocks, key=lambda block: block[2]):
+        run = list(run)
+        end = start + size * len(run)
+        matrices = np.array([block[0] for block in run], dtype=float)
+        vectors = np.array([block[1] for block in run], dtype=float)
+        coordinates[start:end] = (np.matmul(
+         coordinates[start:end].reshape(len(run), size, 3),
+         matrices.transpose(0, 2, 1)
+        ) + vectors[:, None, :]).reshape(-1, 3)
+        start = end
+
+
+def unit_cell_transformations(coordinates, chains, crystallography):
+    """Gets the transformations which fill a crystal's unit cell with copies of
+    some coordinates, one per symmetry operator, each moved by whole unit cells
+    so that the copy's centre lies within the cell.
+
+    :param numpy.ndarray coordinates: the ``(N, 3)`` coordinates to copy.
+    :param list chains: the internal IDs the transformations apply to.
+    :param dict crystallography: the space group and unit cell.
+    :rtype: ``list``"""
+
+    matrices, vectors, orthogonal, fractional = crystal_operators(
+     crystallography
+    )
+    centre = coordinates.mean(axis=0) if len(coordinates) else np.zeros(3)
+    centres = matrices @ centre + vectors
+    vectors = vectors - np.floor(centres @ fractional.T) @ orthogonal.T
+    return [{
+     "chains": chains, "matrix": matrix.tolist(), "vector": vector.tolist()
+    } for matrix, vector in zip(matrices, vectors)]
+
+
+def symmetry_mate_transformations(arrays, grid, chains, crystallography,
+                                  radius):
+    """Gets the transformations which make the neighbours of some atoms in their
+    crystal - the copies, made by a symmetry operator and a whole number of
+    unit cell translations, with an atom within some distance of the atoms.
+
+    Every operator and translation is first tested at once using bounding
+    boxes, and only the copies whose boxes overlap the atoms' (expanded by the
+    distance) are transformed and checked against the spatial index.
+
+    Unit cells with less than a cubic Ångström for each atom in them can't be
+    real - NMR and cryo-EM .pdb files give a 1 Å placeholder cell - and so are
+    rejected, as is any search which would have to try more than
+    ``MAX_LATTICE_SHIFTS`` unit cell translations.
+
+    :param AtomArrays arrays: the atoms' coordinate store.
+    :param AtomGrid grid: the spatial index of the atoms.
+    :param list chains: the internal IDs the transformations apply to.
+    :param dict crystallography: the space group and unit cell.
+    :param float radius: the distance.
+    :raises ValueError: if the unit cell is a placeholder, or too small for\
+    the search.
+    :rtype: ``list``"""
+
+    matrices, vectors, orthogonal, fractional = crystal_operators(
+     crystallography
+    )
+    coordinates = arrays.coordinates
+    if not len(coordinates): return []
+    if abs(np.linalg.det(orthogonal)) < len(coordinates) * len(matrices):
+        raise ValueError("Unit cell is too small to hold the atoms")
+    corners = np.array(list(product([0, 1], repeat=3)))
+    box_low, box_high = coordinates.min(axis=0), coordinates.max(axis=0)
+    low, high = box_low - radius, box_high + radius
+    images = (box_low + (box_high - box_low) * corners) @ matrices.transpose(
+     0, 2, 1
+    ) + vectors[:, None, :]
+    image_cells = images @ fractional.T
+    target_cells = (low + (high - low) * corners) @ fractional.T
+    first = np.ceil(target_cells.min(axis=0) - image_cells.max(axis=1))
+    last = np.floor(target_cells.max(axis=0) - image_cells.min(axis=1))
+    start, end = first.min(axis=0), last.max(axis=0)
+    if np.prod(np.maximum(end - start + 1, 0)) > MAX_LATTICE_SHIFTS:
+        raise ValueError("Too many unit cell translations to search")
+    shifts = np.array(list(product(*[
+     range(int(n), int(m) + 1) for n, m in zip(start, end)
+    ])))
+    if not len(shifts): return []
+    possible = ((shifts >= first[:, None]) & (shifts <= last[:, None])).all(2)
+    offsets = shifts @ orthogonal.T
+    possible &= (
+     (images.min(axis=1)[:, None] + offsets <= high) &
+     (images.max(axis=1)[:, None] + offsets >= low)
+    ).all(axis=2)
+    possible[0, (shifts == 0).all(axis=1)] = False
+    transformations = []
+    for n, m in zip(*np.nonzero(possible)):
+        vector = vectors[n] + offsets[m]
+        moved = coordinates @ matrices[n].T + vector
+        moved = moved[((moved >= low) & (moved <= high)).all(axis=1)]
+        if len(moved) and len(grid.pairs(moved, radius)[0]):
+            transformations.append({
+             "chains": chains, "matrix": matrices[n].tolist(),
+             "vector": vector.tolist()
+            })
+    return transformations
+
+
+def crystal_operators(crystallography):
+    """Gets a crystal's symmetry operators as Cartesian matrices and vectors,
+    along with the matrices which convert Cartesian coordinates to and from
+    fractional coordinates. Space groups given as ``R`` with a hexagonal
+    unit cell are taken to be in their hexagonal ``H`` setting.
+
+    :param dict crystallography: the space group and unit cell.
+    :raises ValueError: if there is no space group or unit cell.
+    :rtype: ``tuple``"""
+
+    space_group = crystallography.get("space_group")
+    unit_cell = crystallography.get("unit_cell")
+    if not space_group or not unit_cell:
+        raise ValueError("No space group and unit cell to use")
+    if space_group.startswith("R") and abs(unit_cell[5] - 120) < 1:
+        space_group = "H" + space_group[1:]
+    rotations, translations = space_group_operators(space_group)
+    orthogonal, fractional = cell_matrices(unit_cell)
+    return (
+     orthogonal @ rotations @ fractional, translations @ orthogonal.T,
+     orthogonal, fractional
+    )
+
+
+@lru_cache()
+def space_group_operators(space_group):
+    """Gets the symmetry operators of a space group, in fractional coordinates,
+    as an ``(N, 3, 3)`` array of rotations and an ``(N, 3)`` array of
+    translations. The identity comes first.
+
+    The operators are generated from the few listed for each space group in
+    ``SPACE_GROUPS``, along with the centering translations of its lattice.
+
+    :param str space_group: the Hermann-Mauguin name of the space group.
+    :raises ValueError: if the space group isn't one proteins crystallise in.
+    :rtype: ``tuple``"""
+
+    name = " ".join(space_group.split())
+    name = SPACE_GROUP_ALIASES.get(name, name)
+    if name not in SPACE_GROUPS:
+        raise ValueError("Space group {} is not supported".format(space_group))
+    generators = [parse_symmetry_operator(operator)
+     for operator in CENTERINGS[name[0]] + SPACE_GROUPS[name]]
+    identity = (np.identity(3, dtype=int), np.zeros(3, dtype=int))
+    key = identity[0].tobytes() + identity[1].tobytes()
+    operators, new = {key: identity}, [identity]
+    while new:
+        found = []
+        for rotation, translation in new:
+            for r, t in generators:
+                operator = (r @ rotation, (r @ translation + t) % 12)
+                key = operator[0].tobytes() + operator[1].tobytes()
+                if key not in operators:
+                    operators[key] = operator
+                    found.append(operator)
+        new = found
+    return (
+     np.array([r for r, _ in operators.values()], dtype=float),
+     np.array([t for _, t in operators.values()]) / 12
+    )
+
+
+def parse_symmetry_operator(operator):
+    """Turns a symmetry operator such as ``"-y,x-y,z+1/3"`` into an integer
+    rotation matrix and a translation, in twelfths of a unit cell.
+
+    :param str operator: the operator to parse.
+    :rtype: ``tuple``"""
+
+    rotation = np.zeros((3, 3), dtype=int)
+    translation = np.zeros(3, dtype=int)
+    for row, component in enumerate(operator.replace(" ", "").split(",")):
+        for sign, term in re.findall(r"([+-]?)(x|y|z|\d+/\d+)", component):
+            value = -1 if sign == "-" else 1
+            if term in ("x", "y", "z"):
+                rotation[row, "xyz".index(term)] = value
+            else:
+                numerator, denominator = term.split("/")
+                numerator, denominator = int(numerator), int(denominator)
+                translation[row] = value * 12 * numerator // denominator
+    return rotation, translation % 12
+
+
+def cell_matrices(unit_cell):
+    """Gets the matrix which turns fractional coordinates into Cartesian
+    coordinates for a unit cell (with the a axis along x and b in the xy
+    plane), and its inverse.
+
+    :param list unit_cell: the cell's a, b, c, alpha, beta and gamma.
+    :rtype: ``tuple``"""
+
+    a, b, c = unit_cell[:3]
+    cos_a, cos_b, cos_g = np.cos(np.radians(unit_cell[3:6]))
+    sin_g = np.sin(np.radians(unit_cell[5]))
+    volume = a * b * c * np.sqrt(
+     1 - cos_a ** 2 - cos_b ** 2 - cos_g ** 2 + 2 * cos_a * cos_b * cos_g
+    )
+    orthogonal = np.array([
+     [a, b * cos_g, c * cos_b],
+     [0, b * sin_g, c * (cos_a - cos_b * cos_g) / sin_g],
+     [0, 0, volume / (a * b * sin_g)]
+    ])
+    return orthogonal, np.linalg.inv(orthogonal)
 
 
 def data_dict_to_file(data_dict, filetype):
@@ -225,6 +735,7 @@ def data_dict_to_file(data_dict, filetype):
             for subkey, value in data_dict[key].items():
                 setattr(f, "_" + subkey, value)
     f._models = [model_dict_to_model(m) for m in data_dict["models"]]
+    for model in f._models: model._file = f
     return f
 
 
@@ -397,3 +908,80 @@ CODES = {
  "DA": "A", "DG": "G", "DC": "C", "DT": "T", "A": "A", "G": "G", "C": "C",
  "U": "U"
 }
+
+MAX_LATTICE_SHIFTS = 10000
+
+CENTERINGS = {
+ "P": [], "A": ["x,y+1/2,z+1/2"], "B": ["x+1/2,y,z+1/2"],
+ "C": ["x+1/2,y+1/2,z"], "I": ["x+1/2,y+1/2,z+1/2"],
+ "F": ["x,y+1/2,z+1/2", "x+1/2,y,z+1/2"], "H": ["x+2/3,y+1/3,z+1/3"],
+ "R": []
+}
+
+SPACE_GROUPS = {
+ "P 1": [], "P 1 2 1": ["-x,y,-z"], "P 1 21 1": ["-x,y+1/2,-z"],
+ "C 1 2 1": ["-x,y,-z"], "A 1 2 1": ["-x,y,-z"], "I 1 2 1": ["-x,y,-z"],
+ "P 1 1 2": ["-x,-y,z"], "P 1 1 21": ["-x,-y,z+1/2"],
+ "P 2 2 2": ["-x,-y,z", "-x,y,-z"], "P 2 2 21": ["-x,-y,z+1/2", "-x,y,-z+1/2"],
+ "P 21 2 2": ["x+1/2,-y,-z", "-x,y,-z"], "P 2 21 2": ["x,-y,-z", "-x,y+1/2,-z"],
+ "P 21 21 2": ["-x,-y,z", "-x+1/2,y+1/2,-z"],
+ "P 21 2 21": ["-x,y,-z", "x+1/2,-y,-z+1/2"],
+ "P 2 21 21": ["x,-y,-z", "-x,y+1/2,-z+1/2"],
+ "P 21 21 21": ["-x+1/2,-y,z+1/2", "-x,y+1/2,-z+1/2"],
+ "C 2 2 21": ["-x,-y,z+1/2", "-x,y,-z+1/2"], "C 2 2 2": ["-x,-y,z", "-x,y,-z"],
+ "F 2 2 2": ["-x,-y,z", "-x,y,-z"], "I 2 2 2": ["-x,-y,z", "-x,y,-z"],
+ "I 21 21 21": ["-x+1/2,-y,z+1/2", "-x,y+1/2,-z+1/2"],
+ "P 4": ["-y,x,z"], "P 41": ["-y,x,z+1/4"], "P 42": ["-y,x,z+1/2"],
+ "P 43": ["-y,x,z+3/4"], "I 4": ["-y,x,z"], "I 41": ["-y,x+1/2,z+1/4"],
+ "P 4 2 2": ["-y,x,z", "-x,y,-z"],
+ "P 4 21 2": ["-y+1/2,x+1/2,z", "-x+1/2,y+1/2,-z"],
+ "P 41 2 2": ["-y,x,z+1/4", "-x,y,-z"],
+ "P 41 21 2": ["-y+1/2,x+1/2,z+1/4", "-x+1/2,y+1/2,-z+1/4"],
+ "P 42 2 2": ["-y,x,z+1/2", "-x,y,-z"],
+ "P 42 21 2": ["-y+1/2,x+1/2,z+1/2", "-x+1/2,y+1/2,-z+1/2"],
+ "P 43 2 2": ["-y,x,z+3/4", "-x,y,-z"],
+ "P 43 21 2": ["-y+1/2,x+1/2,z+3/4", "-x+1/2,y+1/2,-z+3/4"],
+ "I 4 2 2": ["-y,x,z", "-x,y,-z"],
+ "I 41 2 2": ["-y,x+1/2,z+1/4", "-x+1/2,y,-z+3/4"],
+ "P 3": ["-y,x-y,z"], "P 31": ["-y,x-y,z+1/3"], "P 32": ["-y,x-y,z+2/3"],
+ "H 3": ["-y,x-y,z"], "R 3": ["z,x,y"],
+ "P 3 1 2": ["-y,x-y,z", "-y,-x,-z"], "P 3 2 1": ["-y,x-y,z", "y,x,-z"],
+ "P 31 1 2": ["-y,x-y,z+1/3", "-y,-x,-z+2/3"],
+ "P 31 2 1": ["-y,x-y,z+1/3", "y,x,-z"],
+ "P 32 1 2": ["-y,x-y,z+2/3", "-y,-x,-z+1/3"],
+ "P 32 2 1": ["-y,x-y,z+2/3", "y,x,-z"],
+ "H 3 2": ["-y,x-y,z", "y,x,-z"], "R 3 2": ["z,x,y", "-y,-x,-z"],
+ "P 6": ["x-y,x,z"], "P 61": ["x-y,x,z+1/6"], "P 65": ["x-y,x,z+5/6"],
+ "P 62": ["x-y,x,z+1/3"], "P 64": ["x-y,x,z+2/3"], "P 63": ["x-y,x,z+1/2"],
+ "P 6 2 2": ["x-y,x,z", "y,x,-z"], "P 61 2 2": ["x-y,x,z+1/6", "y,x,-z+1/3"],
+ "P 65 2 2": ["x-y,x,z+5/6", "y,x,-z+2/3"],
+ "P 62 2 2": ["x-y,x,z+1/3", "y,x,-z+2/3"],
+ "P 64 2 2": ["x-y,x,z+2/3", "y,x,-z+1/3"],
+ "P 63 2 2": ["x-y,x,z+1/2", "y,x,-z"],
+ "P 2 3": ["-x,-y,z", "-x,y,-z", "z,x,y"],
+ "F 2 3": ["-x,-y,z", "-x,y,-z", "z,x,y"],
+ "I 2 3": ["-x,-y,z", "-x,y,-z", "z,x,y"],
+ "P 21 3": ["-x+1/2,-y,z+1/2", "-x,y+1/2,-z+1/2", "z,x,y"],
+ "I 21 3": ["-x+1/2,-y,z+1/2", "-x,y+1/2,-z+1/2", "z,x,y"],
+ "P 4 3 2": ["-x,-y,z", "-x,y,-z", "z,x,y", "y,x,-z"],
+ "P 42 3 2": ["-x,-y,z", "-x,y,-z", "z,x,y", "y+1/2,x+1/2,-z+1/2"],
+ "F 4 3 2": ["-x,-y,z", "-x,y,-z", "z,x,y", "y,x,-z"],
+ "F 41 3 2": [
+  "-x,-y+1/2,z+1/2", "-x+1/2,y+1/2,-z", "z,x,y", "y+3/4,x+1/4,-z+3/4"
+ ],
+ "I 4 3 2": ["-x,-y,z", "-x,y,-z", "z,x,y", "y,x,-z"],
+ "P 43 3 2": [
+  "-x+1/2,-y,z+1/2", "-x,y+1/2,-z+1/2", "z,x,y", "y+1/4,x+3/4,-z+3/4"
+ ],
+ "P 41 3 2": [
+  "-x+1/2,-y,z+1/2", "-x,y+1/2,-z+1/2", "z,x,y", "y+3/4,x+1/4,-z+1/4"
+ ],
+ "I 41 3 2": [
+  "-x+1/2,-y,z+1/2", "-x,y+1/2,-z+1/2", "z,x,y", "y+3/4,x+1/4,-z+1/4"
+ ]
+}
+
+SPACE_GROUP_ALIASES = {
+ "P 2": "P 1 2 1", "P 21": "P 1 21 1", "C 2": "C 1 2 1", "A 2": "A 1 2 1",
+ "I 2": "I 1 2 1"
+}
@@ -1,187 +1,283 @@
 """Contains functions for dealing with the .cif file format."""
 
-from collections import deque
 import re
+from collections.abc import Mapping
 from datetime import datetime
 import numpy as np
 import valerius
 from itertools import groupby
 from .data import CODES, Chain, Residue, Ligand
 
-def mmcif_string_to_mmcif_dict(filestring):
+MMCIF_BLOCK_LINE = re.compile(r"^(?:_[^.\s]*|loop_|;|data_)", re.MULTILINE)
+MMCIF_SPECIAL = re.compile(r"[;'\"#]")
+MMCIF_SPECIAL_TOKENS = {
+ "'": re.compile(r"'(.*?)'(?!\S)"), '"': re.compile(r'"(.*?)"(?!\S)'),
+ ";": re.compile(r";([^\n]*(?:\n(?!;)[^\n]*)*)\n;"), "#": re.compile(r"#.*")
+}
+
+def mmcif_string_to_mmcif_dict(filestring, columnar=False, categories=None,
+ lazy=False):
     """Takes a .cif filestring and turns into a ``dict`` which represents its
-    table structure. Only lines which aren't empty and which don't begin with
-    ``#`` are used.
+    table structure.
+
+    The filestring is read once, from start to finish, by a tokenizer which
+    handles multi-line text fields, quoted values and comments as it goes.
+    Each ``loop_`` body is cut into columns directly from the token stream, and
+    every other value is assigned to the tag that precedes it.
+
+    By default each table is a ``list`` of row ``dict`` objects. If
+    ``columnar`` is ``True``, each table is instead a ``dict`` mapping column
+    names to ``list`` objects of values, which for large tables like
+    ``atom_site`` uses far less memory.
 
-    Multi-line strings are consolidated onto one line, and the whole thing is
-    then split into the blocks that will become table lists. At the end, quote
-    marks are removed from any string which retains them.
+    If a collection of category names is given, only those tables will be
+    read. The blocks of lines belonging to every other table are skipped over
+    without being tokenized at all.
+
+    If ``lazy`` is ``True``, a :py:class:`.LazyMmcifDict` is returned instead,
+    which only tokenizes each table when it is first accessed.
 
     :param str filestring: the .cif filestring to process.
+    :param bool columnar: if ``True``, tables will be column ``dict`` objects.
+    :param categories: if given, the only categories to read.
+    :param bool lazy: if ``True``, tables will be read on demand.
     :rtype: ``dict``"""
 
-    lines = deque(filter(lambda l: l and l[0] != "#", filestring.split("\n")))
-    lines = consolidate_strings(lines)
-    blocks = mmcif_lines_to_mmcif_blocks(lines)
+    if lazy: return LazyMmcifDict(filestring, columnar, categories)
+    if categories is not None:
+        filestring = "\n".join(filestring[start:end] for category, start, end
+         in mmcif_string_to_blocks(filestring) if category in categories)
     mmcif_dict = {}
-    for block in blocks:
-        if block["lines"][0] == "loop_":
-            mmcif_dict[block["category"]] = loop_block_to_list(block)
-        else:
-            mmcif_dict[block["category"]] = non_loop_block_to_list(block)
-    strip_quotes(mmcif_dict)
+    tokens, quoted = mmcif_string_to_tokens(filestring)
+    index, length = 0, len(tokens)
+    while index < length:
+        token, reserved = tokens[index], index not in quoted
+        index += 1
+        if reserved and token == "loop_":
+            index = add_loop_to_mmcif_dict(tokens, quoted, index, mmcif_dict)
+        elif reserved and token[0] == "_" and index < length:
+            category, name = token[1:].split(".", 1)
+            mmcif_dict.setdefault(category, {})[name] = [tokens[index]]
+            index += 1
+    if not columnar:
+        for category, table in mmcif_dict.items():
+            mmcif_dict[category] = columns_to_rows(table)
     return mmcif_dict
 
 
-def consolidate_strings(lines):
-    """Generally, .cif files have a one file line to one table row
-    correspondence. Sometimes however, a string cell is given a line of its own,
-    breaking the row over several lines. This function takes the lines of a .cif
-    file and puts all table rows on a single line.
-
-    :param deque lines: the .cif file lines.
-    :rtype: ``deque``"""
-
-    new_lines = deque()
-    while lines:
-        line = lines.popleft()
-        if line.startswith(";"):
-            string = [line[1:].strip()]
-            while not lines[0].startswith(";"):
-                string.append(lines.popleft())
-            lines.popleft()
-            new_lines[-1] += " \"{}\"".format(
-             " ".join(string).replace('"', "\x1a").replace("'", "\x1b")
-            )
-        else:
-            new_lines.append(line)
-    return new_lines
+class LazyMmcifDict(Mapping):
+    """A read-only mmcif ``dict`` which doesn't read its tables until they are
+    needed. When created, the filestring is only scanned for where each table
+    starts and ends - the lines of a table are tokenized the first time that
+    table is accessed, and the result is kept for later lookups.
+
+    This makes getting a few values from a large file, such as its title or
+    resolution, far cheaper than reading the whole thing.
+
+    :param str filestring: the .cif filestring to read from.
+    :param bool columnar: if ``True``, tables will be column ``dict`` objects.
+    :param categories: if given, the only categories to make available."""
+
+    def __init__(self, filestring, columnar=False, categories=None):
+        self._filestring, self._columnar = filestring, columnar
+        self._blocks, self._tables = {}, {}
+        for category, start, end in mmcif_string_to_blocks(filestring):
+            if categories is None or category in categories:
+                self._blocks.setdefault(category, []).append((start, end))
+
+
+    def __repr__(self):
+        return "<LazyMmcifDict ({} categories, {} read)>".format(
+         len(self._blocks), len(self._tables)
+        )
+
+
+    def __getitem__(self, category):
+        if category not in self._tables:
+            filestring = "\n".join(self._filestring[start:end]
+             for start, end in self._blocks[category])
+            self._tables[category] = mmcif_string_to_mmcif_dict(
+             filestring, columnar=self._columnar
+            ).get(category, {} if self._columnar else [])
+        return self._tables[category]
+
+
+    def __iter__(self):
+        return iter(self._blocks)
+
 
+    def __len__(self):
+        return len(self._blocks)
 
-def mmcif_lines_to_mmcif_blocks(lines):
-    """A .cif file is ultimately a list of tables. This function takes a list of
-    .cif file lines and splits them into these table blocks. Each block will be
-    a ``dict`` containing a category name and a list of lines.
 
-    :param deque lines: the .cif file lines.
+    def __contains__(self, category):
+        return category in self._blocks
+
+
+def mmcif_string_to_blocks(filestring):
+    """Finds the block of lines that each table in a .cif filestring occupies,
+    without splitting any of those lines into values. Only the lines which
+    start with a tag, ``loop_``, ``data_`` or a text field semicolon are looked
+    at, and lines inside text fields are ignored.
+
+    Each block is returned as a ``(category, start, end)`` tuple, where
+    ``start`` and ``end`` are positions in the filestring.
+
+    :param str filestring: the .cif filestring to scan.
     :rtype: ``list``"""
 
-    category = None
-    block, blocks = [], []
-    while lines:
-        line = lines.popleft()
-        if line.startswith("data_"): continue
-        if line.startswith("_"):
-            line_category = line.split(".")[0]
-            if line_category != category:
-                if category:
-                    blocks.append({"category": category[1:], "lines": block})
-                category = line_category
-                block = []
-        if line.startswith("loop_"):
-            if category:
-                blocks.append({"category": category[1:], "lines": block})
-            category = lines[0].split(".")[0]
-            block = []
-        block.append(line)
-    if block: blocks.append({"category": category[1:], "lines": block})
+    blocks, in_text, loop_start, block = [], False, None, None
+    for match in MMCIF_BLOCK_LINE.finditer(filestring):
+        token, position = match.group(), match.start()
+        if token == ";":
+            in_text = not in_text
+        elif in_text or (token[0] == "_" and loop_start is None and
+         block and block[0] == token[1:]):
+            continue
+        elif token[0] == "_":
+            if block: blocks.append((*block, loop_start or position))
+            block = (token[1:], loop_start or position)
+            loop_start = None
+        else:
+            if block: blocks.append((*block, position))
+            block, loop_start = None, position if token == "loop_" else None
+    if block: blocks.append((*block, len(filestring)))
     return blocks
 
 
-def non_loop_block_to_list(block):
-    """Takes a simple block ``dict`` with no loop and turns it into a table
-    ``list``.
+def mmcif_string_to_tokens(filestring):
+    """Splits a .cif filestring into a list of tokens in a single scan.
 
-    :param dict block: the .cif block to process.
-    :rtype: ``list``"""
+    Most of a .cif file is plain whitespace-separated values, so the scan only
+    stops at characters which might start something else - a quoted value, a
+    multi-line text field or a comment. Everything between those points is
+    split on whitespace in one go. Quote marks are removed from quoted values,
+    multi-line text fields are put on one line, and comments are discarded.
 
-    d = {}
-    category = block["lines"][0].split(".")[0]
-    for index in range(len(block["lines"]) - 1):
-        if block["lines"][index + 1][0] != "_":
-            block["lines"][index] += " " + block["lines"][index + 1]
-    block["lines"] = [l for l in block["lines"] if l[0] == "_"]
-    for line in block["lines"]:
-        name = line.split(".")[1].split()[0]
-        value = line
-        if line.startswith("_"):
-            value = " ".join(line.split()[1:])
-        d[name] = value
-    return [d]
-
-
-def loop_block_to_list(block):
-    """Takes a loop block ``dict`` where the initial lines are table headers and
-    turns it into a table ``list``. Sometimes a row is broken over several lines
-    so this function deals with that too.
-
-    :param dict block: the .cif block to process.
-    :rtype: ``list``"""
+    As well as the tokens, the indices of those tokens which came from quoted
+    values or text fields are returned, as these can never be tags.
 
-    names, lines, header = [], [], True
-    body_start = 0
-    for index, line in enumerate(block["lines"][1:], start=1):
-        if not line.startswith("_" + block["category"]):
-            body_start = index
-            break
-    names = [l.split(".")[1].rstrip() for l in block["lines"][1:body_start]]
-    lines = [split_values(l) for l in block["lines"][body_start:]]
-    l = []
-    for n in range(len(lines) - 1):
-        while n < len(lines) - 1 and\
-         len(lines[n]) + len(lines[n + 1]) <= len(names):
-            lines[n] += lines[n + 1]
-            lines.pop(n + 1)
-    for line in lines:
-        l.append({
-         name: value for name, value in zip(names, line)
-        })
-    return l
+    :param str filestring: the .cif filestring to split.
+    :rtype: ``tuple``"""
+
+    tokens, quoted, position = [], set(), 0
+    match = MMCIF_SPECIAL.search(filestring)
+    while match:
+        start, char = match.start(), match.group()
+        previous = filestring[start - 1] if start else "\n"
+        special = None
+        if previous == "\n" or (previous.isspace() and char != ";"):
+            special = MMCIF_SPECIAL_TOKENS[char].match(filestring, start)
+        if special:
+            tokens += filestring[position:start].split()
+            if char != "#":
+                quoted.add(len(tokens))
+                tokens.append(text_field_to_value(special.group(1))
+                 if char == ";" else special.group(1))
+            position = special.end()
+        match = MMCIF_SPECIAL.search(filestring, special.end() if special
+         else start + 1)
+    tokens += filestring[position:].split()
+    return tokens, quoted
+
+
+def text_field_to_value(text):
+    """Takes the contents of a multi-line .cif text field and puts it on one
+    line, with each line separated by a space.
+
+    :param str text: the text between the field's semicolons.
+    :rtype: ``str``"""
+
+    lines = text.split("\n")
+    return " ".join([lines[0].strip()] + [l for l in lines[1:] if l.strip()])
+
+
+def add_loop_to_mmcif_dict(tokens, quoted, index, mmcif_dict):
+    """Takes the tokens of a .cif file and the position just after a ``loop_``
+    keyword, and reads the loop's header tags and values from that point. The
+    values are cut into rows, one per header tag, and the resulting table is
+    added to the mmcif ``dict`` as columns.
+
+    :param list tokens: the .cif file tokens.
+    :param set quoted: the indices of tokens which came from quoted values.
+    :param int index: the position of the loop's first header tag.
+    :param dict mmcif_dict: the mmcif ``dict`` to update.
+    :returns: the position of the first token after the loop."""
+
+    names, length = [], len(tokens)
+    while index < length and tokens[index][0] == "_" and index not in quoted:
+        names.append(tokens[index])
+        index += 1
+    start = index
+    if names:
+        index = find_loop_end(tokens, quoted, start, len(names))
+        category = names[0][1:].split(".")[0]
+        names = [name.split(".", 1)[1] for name in names]
+        end = index - (index - start) % len(names)
+        mmcif_dict[category] = {name: tokens[start + n:end:len(names)]
+         for n, name in enumerate(names)}
+    return index
+
+
+def find_loop_end(tokens, quoted, start, width):
+    """Finds where the body of a ``loop_`` ends - the first tag or keyword
+    after its values. Because every row of a loop has the same number of
+    values, only the first token of each row needs checking, so the loop body
+    is crossed one row at a time rather than one value at a time.
+
+    :param list tokens: the .cif file tokens.
+    :param set quoted: the indices of tokens which came from quoted values.
+    :param int start: the position of the loop's first value.
+    :param int width: the number of values in each row.
+    :returns: the position of the first token after the loop."""
+
+    is_reserved = lambda i: i not in quoted and (tokens[i][0] == "_" or
+     tokens[i] == "loop_" or tokens[i].startswith("data_"))
+    length = len(tokens)
+    for row_start in range(start, length, width):
+        if is_reserved(row_start): break
+    else: row_start = length
+    for index in range(max(row_start - width, start), row_start):
+        if is_reserved(index): return index
+    return row_start
+
+
+def columns_to_rows(table):
+    """Takes an mmcif table in columnar form - a ``dict`` of column names to
+    values - and turns it into a ``list`` of row ``dict`` objects.
+
+    :param dict table: the columns to convert.
+    :rtype: ``list``"""
 
+    return [dict(zip(table, row)) for row in zip(*table.values())]
 
-def split_values(line):
-    """The body of a .cif table is a series of lines, with each cell divided by
-    whitespace. This function takes a string line and breaks it into cells.
 
-    There are a few peculiarities to handle. Sometimes a cell is a string
-    enclosed in quote marks, and spaces within this string obviously shouldn't
-    be used to break the line. This function handles all of that.
+def get_rows(mmcif_dict, category):
+    """Gets a table from an mmcif ``dict`` as a ``list`` of row ``dict``
+    objects, whichever form the mmcif ``dict`` stores its tables in. If the
+    table doesn't exist, an empty ``list`` is returned.
 
-    :param str line: the .cif line to split.
+    :param dict mmcif_dict: the .mmcif dictionary to read.
+    :param str category: the name of the table to get.
     :rtype: ``list``"""
 
-    if not re.search("[\'\"]", line): return line.split()
-    chars = deque(line.strip())
-    values, value, in_string = [], [], False
-    while chars:
-        char = chars.popleft()
-        if char == " " and not in_string:
-            values.append(value)
-            value = []
-        elif char in "'\"":
-            if in_string and chars and chars[0] != " ":
-                value.append(char)
-            else:
-                in_string = not in_string
-        else:
-            value.append(char)
-    values.append(value)
-    return ["".join(v) for v in values if v]
+    table = mmcif_dict.get(category, [])
+    return columns_to_rows(table) if isinstance(table, dict) else table
 
 
-def strip_quotes(mmcif_dict):
-    """Goes through each table in the mmcif ``dict`` and removes any unneeded
-    quote marks from the cells.
+def get_columns(mmcif_dict, category):
+    """Gets a table from an mmcif ``dict`` as a ``dict`` of column names to
+    values, whichever form the mmcif ``dict`` stores its tables in. If the
+    table doesn't exist, an empty ``dict`` is returned.
 
-    :param dict mmcif_dict: the almost finished .mmcif dictionary to clean."""
+    :param dict mmcif_dict: the .mmcif dictionary to read.
+    :param str category: the name of the table to get.
+    :rtype: ``dict``"""
 
-    for name, table in mmcif_dict.items():
-        for row in table:
-            for k, value in row.items():
-                for char in "'\"":
-                    if value[0] == char and value[-1] == char:
-                        row[k] = value[1:-1]
-                    row[k] = row[k].replace("\x1a", '"').replace("\x1b", "'")
+    table = mmcif_dict.get(category, {})
+    if isinstance(table, dict): return table
+    return {name: [row[name] for row in table] for name in table[0]}\
+     if table else {}
 
 
 def mmcif_dict_to_data_dict(mmcif_dict):
@@ -249,7 +345,7 @@ def update_experiment_dict(mmcif_dict, data_dict):
         if data_dict["experiment"]["source_organism"] not in [None, "?"]: break
     mmcif_to_data_transfer(mmcif_dict, data_dict, "experiment",
      "expression_system", "entity_src_gen", "pdbx_host_org_scientific_name")
-    for r in mmcif_dict.get("pdbx_unobs_or_zero_occ_residues", []):
+    for r in get_rows(mmcif_dict, "pdbx_unobs_or_zero_occ_residues"):
         insert = "" if r["PDB_ins_code"] in "?." else r["PDB_ins_code"]
         data_dict["experiment"]["missing_residues"].append({
          "id": f"{r['auth_asym_id']}.{r['auth_seq_id']}{insert}",
@@ -289,11 +385,11 @@ def update_geometry_dict(mmcif_dict, data_dict):
      "id": int(a["id"]), "software": a.get("method_details", None),
      "delta_energy": None, "buried_surface_area": None, "surface_area": None,
      "transformations": []
-    } for a in mmcif_dict.get("pdbx_struct_assembly", [])]
+    } for a in get_rows(mmcif_dict, "pdbx_struct_assembly")]
     operations = {o["id"]: [
      [float(o["matrix[{}][{}]".format(r, c)]) for c in [1, 2, 3]
     ] + [float(o["vector[{}]".format(r)])] for r in [1, 2, 3]] + [[0, 0, 0, 1]]
-     for o in mmcif_dict.get("pdbx_struct_oper_list", [])}
+     for o in get_rows(mmcif_dict, "pdbx_struct_oper_list")}
     for assembly in data_dict["geometry"]["assemblies"]:
         if assembly["software"] == "?": assembly["software"] = None
         assign_metrics_to_assembly(mmcif_dict, assembly)
@@ -308,7 +404,7 @@ def assign_metrics_to_assembly(mmcif_dict, assembly):
     :param dict mmcif_dict: The dictionary to read.
     :param dict assembly: The assembly to update."""
 
-    for a in mmcif_dict.get("pdbx_struct_assembly_prop", []):
+    for a in get_rows(mmcif_dict, "pdbx_struct_assembly_prop"):
         if a["biol_id"] == str(assembly["id"]):
             if a["type"] == "MORE":
                 assembly["delta_energy"] = float(a["value"].split("/")[0])
@@ -326,7 +422,7 @@ def assign_transformations_to_assembly(mmcif_dict, operations, assembly):
     :param dict operations: the processed operations matrices.
     :param dict assembly: the assembly to update."""
 
-    for gen in mmcif_dict.get("pdbx_struct_assembly_gen", []):
+    for gen in get_rows(mmcif_dict, "pdbx_struct_assembly_gen"):
         if gen["assembly_id"] == str(assembly["id"]):
             op_ids_groups = get_operation_id_groups(gen["oper_expression"])
             ops = operation_id_groups_to_operations(operations, op_ids_groups)
@@ -370,11 +466,12 @@ def update_crystallography_dict(mmcif_dict, data_dict):
     :param dict mmcif_dict: the .mmcif dictionary to read.
     :param dict data_dict: the data dictionary to update."""
 
-    if mmcif_dict.get("cell"):
+    cell = get_rows(mmcif_dict, "cell")
+    if cell:
         mmcif_to_data_transfer(mmcif_dict, data_dict["geometry"],
          "crystallography", "space_group", "symmetry", "space_group_name_H-M")
         data_dict["geometry"]["crystallography"]["unit_cell"] = [
-         float(mmcif_dict["cell"][0][key].replace("?", "0")) for key in [
+         float(cell[0][key].replace("?", "0")) for key in [
           "length_a", "length_b", "length_c",
           "angle_alpha", "angle_beta", "angle_gamma"
          ]
@@ -411,43 +508,64 @@ def update_models_list(mmcif_dict, data_dict):
     :param dict data_dict: the data dictionary to update."""
 
     data_dict["models"] = []
-    types = {e["id"]: e["type"] for e in mmcif_dict.get("entity", {})}
-    names = {e["id"]: e["name"] for e in mmcif_dict.get("chem_comp", {})
+    types = {e["id"]: e["type"] for e in get_rows(mmcif_dict, "entity")}
+    names = {e["id"]: e["name"] for e in get_rows(mmcif_dict, "chem_comp")
      if e["mon_nstd_flag"] != "y"}
     entities = {
-     m["id"]: m["entity_id"] for m in mmcif_dict.get("struct_asym", []) 
+     m["id"]: m["entity_id"] for m in get_rows(mmcif_dict, "struct_asym") 
     }
     sequences = make_sequences(mmcif_dict)
     secondary_structure = make_secondary_structure(mmcif_dict)
     aniso = make_aniso(mmcif_dict)
+    site = get_columns(mmcif_dict, "atom_site")
+    if not site: return
     model = {"polymer": {}, "non-polymer": {}, "water": {}}
-    model_num = mmcif_dict["atom_site"][0]["pdbx_PDB_model_num"]
-    for atom in mmcif_dict["atom_site"]:
-        if atom["pdbx_PDB_model_num"] != model_num:
+    model_nums, asym_ids = site["pdbx_PDB_model_num"], site["label_asym_id"]
+    model_num = model_nums[0]
+    for index in range(len(model_nums)):
+        if model_nums[index] != model_num:
             data_dict["models"].append(model)
             model = {"polymer": {}, "non-polymer": {}, "water": {}}
-            model_num = atom["pdbx_PDB_model_num"]
-        mol_type = types[entities[atom["label_asym_id"]]]
+            model_num = model_nums[index]
+        mol_type = types.get(entities.get(asym_ids[index]))\
+         or guess_molecule_type(site, index)
         if mol_type == "polymer":
-            add_atom_to_polymer(atom, aniso, model, names)
+            add_atom_to_polymer(site, index, aniso, model, names)
         else:
-            add_atom_to_non_polymer(atom, aniso, model, mol_type, names)
+            add_atom_to_non_polymer(site, index, aniso, model, mol_type, names)
     data_dict["models"].append(model)
     for model in data_dict["models"]:
-        add_sequences_to_polymers(model, mmcif_dict, entities)
+        add_sequences_to_polymers(model, sequences, entities)
         add_secondary_structure_to_polymers(model, secondary_structure)
 
 
+def guess_molecule_type(site, index):
+    """Works out whether an atom is part of a polymer, non-polymer or water
+    from its own atom_site row, for when the entity information that would
+    normally say so hasn't been read.
+
+    :param dict site: the .mmcif atom_site columns to read.
+    :param int index: the row of the atom.
+    :rtype: ``str``"""
+
+    if site["auth_comp_id"][index] in ("HOH", "DOD"): return "water"
+    if "group_PDB" in site and site["group_PDB"][index] == "ATOM":
+        return "polymer"
+    return "non-polymer"
+
+
 def make_aniso(mmcif_dict):
     """Makes a mapping of atom IDs to anisotropy information.
 
     :param mmcif_dict: the .mmcif dict to read.
     :rtype: ``dict``"""
 
-    return {int(a["id"]): [
-     float(a["U[{}][{}]".format(x, y)]) for
-      x, y in ["11", "22", "33", "12", "13", "23"]
-    ] for a in mmcif_dict.get("atom_site_anisotrop", [])}
+    aniso = get_columns(mmcif_dict, "atom_site_anisotrop")
+    if not aniso: return {}
+    return {int(id): [float(u) for u in values] for id, *values in zip(
+     aniso["id"], *[aniso["U[{}][{}]".format(x, y)]
+      for x, y in ["11", "22", "33", "12", "13", "23"]]
+    )}
 
 
 def make_secondary_structure(mmcif_dict):
@@ -458,12 +576,12 @@ def make_secondary_structure(mmcif_dict):
     :rtype: ``dict``"""
 
     helices, strands = [], []
-    for helix in mmcif_dict.get("struct_conf", []):
+    for helix in get_rows(mmcif_dict, "struct_conf"):
         helices.append(["{}.{}{}".format(
          helix[f"{x}_auth_asym_id"], helix[f"{x}_auth_seq_id"],
          helix[f"pdbx_{x}_PDB_ins_code"].replace("?", ""),
         ) for x in ["beg", "end"]])
-    for strand in mmcif_dict.get("struct_sheet_range", []):
+    for strand in get_rows(mmcif_dict, "struct_sheet_range"):
         strands.append(["{}.{}{}".format(
          strand[f"{x}_auth_asym_id"], strand[f"{x}_auth_seq_id"],
          strand[f"pdbx_{x}_PDB_ins_code"].replace("?", ""),
@@ -471,84 +589,92 @@ def make_secondary_structure(mmcif_dict):
     return {"helices": helices, "strands": strands}
 
 
-def add_atom_to_polymer(atom, aniso, model, names):
-    """Takes an MMCIF atom dictionary, converts it, and adds it to a polymer
-    dictionary.
+def add_atom_to_polymer(site, index, aniso, model, names):
+    """Takes a row of an MMCIF atom_site table, converts it, and adds it to a
+    polymer dictionary.
 
-    :param dict atom: the .mmcif dictionary to read.
+    :param dict site: the .mmcif atom_site columns to read.
+    :param int index: the row of the atom to add.
     :param dict aniso: lookup dictionary for anisotropy information.
     :param dict model: the model to update.
     :param dict names: the lookup dictionary for full name information."""
 
-    mol_id = atom["auth_asym_id"]
-    res_id = make_residue_id(atom)
+    mol_id = site["auth_asym_id"][index]
+    res_id = make_residue_id(site, index)
+    atom_id = int(site["id"][index])
     try:
         model["polymer"][mol_id]["residues"][res_id]["atoms"][
-         int(atom["id"])
-        ] = atom_dict_to_atom_dict(atom, aniso)
+         atom_id
+        ] = atom_site_to_atom_dict(site, index, aniso)
     except:
-        name = atom["auth_comp_id"]
+        name = site["auth_comp_id"][index]
         try:
             model["polymer"][mol_id]["residues"][res_id] = {
              "name": name, "full_name": names.get(name),
-             "atoms": {int(atom["id"]) : atom_dict_to_atom_dict(atom, aniso)},
+             "atoms": {atom_id: atom_site_to_atom_dict(site, index, aniso)},
              "number": len(model["polymer"][mol_id]["residues"]) + 1
             }
         except:
             model["polymer"][mol_id] = {
-             "internal_id": atom["label_asym_id"], "helices": [], "strands": [],
+             "internal_id": site["label_asym_id"][index],
+             "helices": [], "strands": [],
              "residues": {res_id: {
               "name": name,
-              "atoms": {int(atom["id"]) : atom_dict_to_atom_dict(atom, aniso)},
+              "atoms": {atom_id: atom_site_to_atom_dict(site, index, aniso)},
               "number": 1, "full_name": names.get(name),
              }}
             }
 
 
-def add_atom_to_non_polymer(atom, aniso, model, mol_type, names):
-    """Takes an MMCIF atom dictionary, converts it, and adds it to a non-polymer
-    dictionary.
+def add_atom_to_non_polymer(site, index, aniso, model, mol_type, names):
+    """Takes a row of an MMCIF atom_site table, converts it, and adds it to a
+    non-polymer dictionary.
 
-    :param dict atom: the .mmcif dictionary to read.
+    :param dict site: the .mmcif atom_site columns to read.
+    :param int index: the row of the atom to add.
     :param dict aniso: lookup dictionary for anisotropy information.
     :param dict model: the model to update.
     :param str mol_type: non-polymer or water.
     :param dict names: the lookup dictionary for full name information."""
 
-    mol_id = make_residue_id(atom)
+    mol_id = make_residue_id(site, index)
+    atom_id = int(site["id"][index])
     try:
         model[mol_type][mol_id]["atoms"][
-         int(atom["id"])
-        ] = atom_dict_to_atom_dict(atom, aniso)
+         atom_id
+        ] = atom_site_to_atom_dict(site, index, aniso)
     except:
-        name = atom["auth_comp_id"]
+        name = site["auth_comp_id"][index]
         model[mol_type][mol_id] = {
          "name": name, "full_name": names.get(name),
-         "internal_id": atom["label_asym_id"],
-         "polymer": atom["auth_asym_id"],
-         "atoms": {int(atom["id"]): atom_dict_to_atom_dict(atom, aniso)},
+         "internal_id": site["label_asym_id"][index],
+         "polymer": site["auth_asym_id"][index],
+         "atoms": {atom_id: atom_site_to_atom_dict(site, index, aniso)},
         }
 
 
-def make_residue_id(d):
-    """Generates a residue ID for an atom.
+def make_residue_id(site, index):
+    """Generates a residue ID for a row of an atom_site table.
 
-    :param dict d: the atom dictionary to read.
+    :param dict site: the .mmcif atom_site columns to read.
+    :param int index: the row of the atom.
     :rtype: ``str``"""
 
-    insert = "" if d["pdbx_PDB_ins_code"] in "?." else d["pdbx_PDB_ins_code"]
-    return "{}.{}{}".format(d["auth_asym_id"], d["auth_seq_id"], insert)
+    insert = site["pdbx_PDB_ins_code"][index]
+    return "{}.{}{}".format(
+     site["auth_asym_id"][index], site["auth_seq_id"][index],
+     "" if insert in "?." else insert
+    )
 
 
-def add_sequences_to_polymers(model, mmcif_dict, entities):
+def add_sequences_to_polymers(model, sequences, entities):
     """Takes a pre-populated mapping of chain IDs to entity IDs, and uses them
     to add sequence information to a model.
 
     :param dict model: the model to update.
-    :param dict mmcif_dict: the .mmcif dictionary to read.
+    :param dict sequences: a mapping of entity IDs to sequences.
     :param dict entities: a mapping of chain IDs to entity IDs."""
 
-    sequences = make_sequences(mmcif_dict)
     for polymer in model["polymer"].values():
         polymer["sequence"] = sequences.get(
          entities.get(polymer["internal_id"], ""), ""
@@ -580,27 +706,35 @@ def make_sequences(mmcif_dict):
     :param dict mmcif_dict: the .mmcif dictionary to read.
     :rtype: ``dict``"""
 
-    return {e["id"]: "".join([
-     CODES.get(res["mon_id"], "X") for res in
-      mmcif_dict.get("entity_poly_seq", []) if res["entity_id"] == e["id"]
-    ]) for e in mmcif_dict.get("entity", []) if e["type"] == "polymer"}
+    sequences = {e["id"]: [] for e in get_rows(mmcif_dict, "entity")
+     if e["type"] == "polymer"}
+    residues = get_columns(mmcif_dict, "entity_poly_seq")
+    for entity_id, name in zip(
+     residues.get("entity_id", []), residues.get("mon_id", [])
+    ):
+        if entity_id in sequences:
+            sequences[entity_id].append(CODES.get(name, "X"))
+    return {id: "".join(codes) for id, codes in sequences.items()}
 
 
-def atom_dict_to_atom_dict(d, aniso_dict):
-    """Turns an .mmcif atom dictionary into an atomium atom data dictionary.
+def atom_site_to_atom_dict(site, index, aniso_dict):
+    """Turns a row of an .mmcif atom_site table into an atomium atom data
+    dictionary.
 
-    :param dict d: the .mmcif atom dictionary.
-    :param dict d: the mapping of atom IDs to anisotropy.
+    :param dict site: the .mmcif atom_site columns.
+    :param int index: the row of the atom.
+    :param dict aniso_dict: the mapping of atom IDs to anisotropy.
     :rtype: ``dict``"""
 
-    charge = "pdbx_formal_charge"
+    get = lambda key, default=None: site[key][index] if key in site else default
+    charge, alt_loc = get("pdbx_formal_charge", 0), get("label_alt_id")
     atom = {
-     "x": d["Cartn_x"], "y": d["Cartn_y"], "z": d["Cartn_z"],
-     "element": d["type_symbol"], "name": d.get("label_atom_id"),
-     "occupancy": d.get("occupancy", 1), "bvalue": d.get("B_iso_or_equiv"),
-     "charge": d.get(charge, 0) if d.get(charge) != "?" else 0,
-     "alt_loc": d.get("label_alt_id") if d.get("label_alt_id") != "." else None,
-     "anisotropy": aniso_dict.get(int(d["id"]), [0, 0, 0, 0, 0, 0])
+     "x": site["Cartn_x"][index], "y": site["Cartn_y"][index],
+     "z": site["Cartn_z"][index], "element": site["type_symbol"][index],
+     "name": get("label_atom_id"), "occupancy": get("occupancy", 1),
+     "bvalue": get("B_iso_or_equiv"), "charge": 0 if charge == "?" else charge,
+     "alt_loc": None if alt_loc == "." else alt_loc,
+     "anisotropy": aniso_dict.get(int(site["id"][index]), [0, 0, 0, 0, 0, 0])
     }
     for key in ["x", "y", "z", "charge", "bvalue", "occupancy"]:
         if atom[key] is not None: atom[key] = float(atom[key])
@@ -625,9 +759,9 @@ def mmcif_to_data_transfer(mmcif_dict, data_dict, d_cat, d_key, m_table, m_key,
 
     try:
         if multi:
-            value = [row[m_key] for row in mmcif_dict[m_table]]
+            value = list(get_columns(mmcif_dict, m_table)[m_key])
         else:
-            value = mmcif_dict[m_table][0][m_key]
+            value = get_columns(mmcif_dict, m_table)[m_key][0]
         if date: value = datetime.strptime(value, "%Y-%m-%d").date()
         if split: value = value.replace(", ", ",").split(",")
         if func: value = func(value)
@@ -2,20 +2,70 @@
 
 import msgpack
 import struct
+import numpy as np
 from collections import deque
+from collections.abc import Mapping
 from datetime import datetime
+from itertools import islice
 from .mmcif import get_structure_from_atom, create_entities, split_residue_id
-from .structures import Chain, Ligand
+from .structures import Model, Chain, Ligand, Residue, Atom
+from .data import data_dict_to_file
 
 def mmtf_bytes_to_mmtf_dict(bytestring):
     """Takes the raw bytestring of a .mmtf file and turns it into a normal,
     fully decoded JSON dictionary.
 
+    The dictionary returned is a :py:class:`.LazyMmtfDict`, so each field is
+    only decoded when it is first accessed.
+
     :patam bytes bytestring: the .mmtf filestring.
-    :rtype: ``dict``"""
+    :rtype: ``LazyMmtfDict``"""
 
     raw = msgpack.unpackb(bytestring)
-    return decode_dict(raw)
+    return LazyMmtfDict(raw)
+
+
+class LazyMmtfDict(Mapping):
+    """A read-only .mmtf dictionary which holds on to the raw msgpack values of
+    a file and only decodes a field the first time it is accessed. The decoded
+    value is then kept for later lookups.
+
+    Most of the cost of reading a .mmtf file is in decoding its large binary
+    fields, so reading just its metadata this way costs little more than
+    unpacking the msgpack itself.
+
+    :param dict raw: the unpacked msgpack dictionary."""
+
+    def __init__(self, raw):
+        self._raw = {
+         key.decode() if isinstance(key, bytes) else key: value
+         for key, value in raw.items()
+        }
+        self._decoded = {}
+
+
+    def __repr__(self):
+        return "<LazyMmtfDict ({} fields, {} decoded)>".format(
+         len(self._raw), len(self._decoded)
+        )
+
+
+    def __getitem__(self, key):
+        if key not in self._decoded:
+            self._decoded[key] = decode_value(self._raw[key])
+        return self._decoded[key]
+
+
+    def __iter__(self):
+        return iter(self._raw)
+
+
+    def __len__(self):
+        return len(self._raw)
+
+
+    def __contains__(self, key):
+        return key in self._raw
 
 
 def decode_dict(d):
@@ -26,22 +76,31 @@ def decode_dict(d):
     :param dict d: the dictionary to read.
     :rtype: ``dict``"""
 
-    new = {}
-    for key, value in d.items():
-        try:
-            new_value = value.decode()
-        except: new_value = value
-        if isinstance(new_value, str) and new_value and new_value[0] == "\x00":
-            new_value = new_value.encode()
-        if isinstance(new_value, bytes):
-            new_value = parse_binary_field(new_value)
-        if isinstance(new_value, list) and new_value:
-            if isinstance(new_value[0], dict):
-                new_value = [decode_dict(x) for x in new_value]
-            elif isinstance(new_value[0], bytes):
-                new_value = [x.decode() for x in new_value]
-        new[key.decode()] = new_value
-    return new
+    return {key.decode() if isinstance(key, bytes) else key: decode_value(value)
+     for key, value in d.items()}
+
+
+def decode_value(value):
+    """Takes a single value from a .mmtf dictionary and decodes it - turning
+    bytestrings into strings, unpacking .mmtf binary fields, and decoding any
+    dictionaries or bytestrings inside lists.
+
+    :param value: the value to decode.
+    :returns: the decoded value (type varies)."""
+
+    try:
+        new_value = value.decode()
+    except: new_value = value
+    if isinstance(new_value, str) and new_value and new_value[0] == "\x00":
+        new_value = new_value.encode()
+    if isinstance(new_value, bytes):
+        new_value = parse_binary_field(new_value)
+    if isinstance(new_value, list) and new_value:
+        if isinstance(new_value[0], dict):
+            new_value = [decode_dict(x) for x in new_value]
+        elif isinstance(new_value[0], bytes):
+            new_value = [x.decode() for x in new_value]
+    return new_value
 
 
 def parse_binary_field(b):
@@ -49,97 +108,103 @@ def parse_binary_field(b):
     special .mmtf encoding, as specified in its documentation. This function
     takes such a field and decodes it.
 
-    :param bytestring b: the field to parse.
-    :returns: the parsed result (type varies)."""
+    The field is read straight into a NumPy array of the big-endian type its
+    codec specifies, and all decoding is done on whole arrays.
 
+    :param bytestring b: the field to parse.
+    :rtype: ``numpy.ndarray``"""
 
     codec, length, params = struct.unpack(">iii", b[:12])
-    len4 = lambda b: int(len(b[12:]) / 4)
-    if codec == 1: return struct.unpack("f" * length, b[12:])
-    elif codec == 2: return struct.unpack("b" * length, b[12:])
-    elif codec == 3: return struct.unpack(">" + "h" * length, b[12:])
-    elif codec == 4: return struct.unpack(">" + "i" * length, b[12:])
+    if codec == 1: return np.frombuffer(b[12:], ">f4").astype(float)
+    elif codec == 2: return np.frombuffer(b[12:], ">i1").astype(np.int8)
+    elif codec == 3: return np.frombuffer(b[12:], ">i2").astype(np.int16)
+    elif codec == 4: return np.frombuffer(b[12:], ">i4").astype(np.int32)
     elif codec == 5:
-        chars = struct.unpack("c" * (length * 4), b[12:])
-        return [b"".join([
-         c for c in chars[i * 4: (i + 1) * 4] if c != b"\x00"
-        ]).decode() for i in range(length)]
+        return np.frombuffer(b[12:], "S{}".format(params)).astype(str)
     elif codec == 6:
-        integers = struct.unpack(">" + ("i" * len4(b)), b[12:])
-        return [chr(c) if c != 0 else "" for c in run_length_decode(integers)]
+        integers = np.frombuffer(b[12:], ">i4")
+        return run_length_decode(integers).astype(np.uint32).view("U1")
     elif codec == 7:
-        integers = struct.unpack(">" + ("i" * len4(b)), b[12:])
-        return run_length_decode(integers)
+        return run_length_decode(np.frombuffer(b[12:], ">i4"))
     elif codec == 8:
-        integers = struct.unpack(">" + ("i" * len4(b)), b[12:])
-        return delta_decode(run_length_decode(integers))
+        return delta_decode(run_length_decode(np.frombuffer(b[12:], ">i4")))
     elif codec == 9:
-        integers = struct.unpack(">" + ("i" * len4(b)), b[12:])
-        return [n / params for n in run_length_decode(integers)]
+        return run_length_decode(np.frombuffer(b[12:], ">i4")) / params
     elif codec == 10:
-        integers = struct.unpack(">" + ("h" * int(len(b[12:]) / 2)), b[12:])
-        return [n / params for n in delta_decode(recursive_decode(integers))]
+        integers = np.frombuffer(b[12:], ">i2")
+        return delta_decode(recursive_decode(integers)) / params
     else: raise ValueError(".mmtf error: {} is invalid codec".format(codec))
 
 
 def run_length_decode(integers):
-    """Expands a list of integers where every second integer is a count of the
-    integer before it.
+    """Expands an array of integers where every second integer is a count of
+    the integer before it.
 
-    :param list integers: the integers to decode.
-    :rtype: ``list``"""
+    :param numpy.ndarray integers: the integers to decode.
+    :rtype: ``numpy.ndarray``"""
 
-    x = []
-    for index, val in enumerate(integers[::2]):
-        x += [val] * integers[1::2][index]
-    return x
+    integers = np.asarray(integers, dtype=np.int32)
+    return np.repeat(integers[::2], integers[1::2])
 
 
 def delta_decode(integers):
-    """Turns a list of integers into a new list of integers where the values in
-    the first are treated as deltas to be applied to the previous value.
+    """Turns an array of integers into a new array of integers where the values
+    in the first are treated as deltas to be applied to the previous value.
 
-    :param list integers: the integers to decode.
-    :rtype: ``list``"""
+    :param numpy.ndarray integers: the integers to decode.
+    :rtype: ``numpy.ndarray``"""
 
-    array, last = [], 0
-    for i in integers:
-        last += i
-        array.append(last)
-    return array
+    return np.cumsum(integers, dtype=np.int64)
 
 
 def recursive_decode(integers, bits=16):
-    """Turns a list of integers into a new list of integers where the values in
-    the first are merged if it looks like a higher order integer split over two
-    integers.
+    """Turns an array of integers into a new array of integers where the values
+    in the first are merged if it looks like a higher order integer split over
+    several integers - every maximum or minimum value is added to the value
+    after it.
+
+    :param numpy.ndarray integers: the integers to decode.
+    :param int bits: the size of the encoded integers.
+    :rtype: ``numpy.ndarray``"""
+
+    integers = np.asarray(integers, dtype=np.int64)
+    power = 2 ** (bits - 1)
+    ends = np.flatnonzero((integers != power - 1) & (integers != -power))
+    totals = np.cumsum(integers)[ends]
+    return np.diff(totals, prepend=0)
 
-    (Code here adapted from the official python-mmtf package.)
 
-    :param list integers: the integers to decode.
+def to_list(value):
+    """Turns a decoded .mmtf field into a ``list`` of Python values, whether it
+    was decoded into an array or was a plain msgpack list.
+
+    :param value: the field to convert.
     :rtype: ``list``"""
 
-    new = []
-    power = 2 ** (bits - 1)
-    cutoff = [power - 1, 0 - power]
-    index = 0
-    while index < len(integers):
-        value = 0
-        while integers[index] in cutoff:
-            value += integers[index]
-            index += 1
-            if integers[index] == 0: break
-        value += integers[index]
-        index += 1
-        new.append(value)
-    return new
-
-
-def mmtf_dict_to_data_dict(mmtf_dict):
+    return value.tolist() if isinstance(value, np.ndarray) else list(value)
+
+
+def mmtf_dict_to_file(mmtf_dict):
+    """Converts an .mmtf dictionary into a :py:class:`.File`. The file's
+    annotation comes from a data dictionary as normal, but its models are made
+    directly from the .mmtf dictionary's arrays with
+    :py:func:`.mmtf_dict_to_models` - no model dictionaries are created.
+
+    :param dict mmtf_dict: the .mmtf dictionary.
+    :rtype: ``File``"""
+
+    f = data_dict_to_file(mmtf_dict_to_data_dict(mmtf_dict, models=False), "mmtf")
+    f._models = mmtf_dict_to_models(mmtf_dict)
+    for model in f._models: model._file = f
+    return f
+
+
+def mmtf_dict_to_data_dict(mmtf_dict, models=True):
     """Converts an .mmtf dictionary into an atomium data dictionary, with the
     same standard layout that the other file formats get converted into.
 
     :param dict mmtf_dict: the .mmtf dictionary.
+    :param bool models: if ``False``, the models list will be left empty.
     :rtype: ``dict``"""
 
     data_dict = {
@@ -172,15 +237,16 @@ def mmtf_dict_to_data_dict(mmtf_dict):
      "crystallography", "unit_cell", "unitCell", trim=3)
     if data_dict["geometry"]["crystallography"].get("space_group") == "NA":
         data_dict["geometry"]["crystallography"] = {}
+    chain_ids = to_list(mmtf_dict.get("chainIdList", []))
     data_dict["geometry"]["assemblies"] = [{
      "id": int(a["name"]), "software": None, "delta_energy": None,
      "buried_surface_area": None, "surface_area": None, "transformations": [{
-      "chains": [mmtf_dict["chainIdList"][i] for i in t["chainIndexList"]],
+      "chains": [chain_ids[i] for i in t["chainIndexList"]],
       "matrix": [t["matrix"][n * 4: (n * 4) + 3] for n in range(3)],
       "vector": t["matrix"][3:-4:4]} for t in a.get("transformList", [])
      ]
     } for a in mmtf_dict.get("bioAssemblyList", [])]
-    update_models_list(mmtf_dict, data_dict)
+    if models: update_models_list(mmtf_dict, data_dict)
     return data_dict
 
 
@@ -191,7 +257,7 @@ def update_models_list(mmtf_dict, data_dict):
     :param dict mmtf_dict: the .mmtf dictionary to read.
     :param dict data_dict: the data dictionary to update."""
 
-    atoms = get_atoms_list(mmtf_dict)
+    atoms = iter(get_atoms_list(mmtf_dict))
     group_definitions = get_group_definitions_list(mmtf_dict)
     groups = get_groups_list(mmtf_dict, group_definitions)
     chains = get_chains_list(mmtf_dict, groups)
@@ -213,11 +279,10 @@ def get_atoms_list(mmtf_dict):
     return [{
      "x": x, "y": y, "z": z, "alt_loc": a or None, "bvalue": b, "occupancy": o,
      "id": i
-    } for x, y, z, a, b, i, o in zip(
-     mmtf_dict["xCoordList"], mmtf_dict["yCoordList"], mmtf_dict["zCoordList"],
-     mmtf_dict["altLocList"], mmtf_dict["bFactorList"], mmtf_dict["atomIdList"],
-     mmtf_dict["occupancyList"]
-    )]
+    } for x, y, z, a, b, i, o in zip(*[to_list(mmtf_dict[key]) for key in (
+     "xCoordList", "yCoordList", "zCoordList", "altLocList", "bFactorList",
+     "atomIdList", "occupancyList"
+    )])]
 
 
 def get_group_definitions_list(mmtf_dict):
@@ -255,9 +320,10 @@ def get_groups_list(mmtf_dict, group_definitions):
      "number": id, "insert": insert, "secondary_structure": sec_struct[ss],
      **group_definitions[type_]
     } for id, insert, ss, type_, in zip(
-     mmtf_dict["groupIdList"], mmtf_dict["insCodeList"],
-     mmtf_dict.get("secStructList", [-1] * len(mmtf_dict["groupIdList"])),
-     mmtf_dict["groupTypeList"]
+     to_list(mmtf_dict["groupIdList"]), to_list(mmtf_dict["insCodeList"]),
+     to_list(mmtf_dict.get(
+      "secStructList", [-1] * len(mmtf_dict["groupIdList"])
+     )), to_list(mmtf_dict["groupTypeList"])
     )]
 
 
@@ -268,11 +334,13 @@ def get_chains_list(mmtf_dict, groups):
     :param dict mmtf_dict: the .mmtf dictionary to read.
     :rtype: ``list``"""
 
-    chains = []
-    for i_id, id, group_num in zip(mmtf_dict["chainIdList"],
-     mmtf_dict["chainNameList"], mmtf_dict["groupsPerChain"]):
-        chain = {"id": id, "internal_id": i_id, "groups": groups[:group_num]}
-        del groups[:group_num]
+    chains, start = [], 0
+    for i_id, id, group_num in zip(to_list(mmtf_dict["chainIdList"]),
+     to_list(mmtf_dict["chainNameList"]), to_list(mmtf_dict["groupsPerChain"])):
+        chain = {
+         "id": id, "internal_id": i_id, "groups": groups[start:start + group_num]
+        }
+        start += group_num
         for entity in mmtf_dict["entityList"]:
             if len(chains) in entity["chainIndexList"]:
                 chain["type"] = entity["type"]
@@ -289,7 +357,7 @@ def add_chain_to_model(chain, model, atoms):
 
     :param dict chain: the 'chain' to add.
     :param dict model: the model to add it to.
-    :param list atoms: the atoms list to work through."""
+    :param iterator atoms: the atoms to work through."""
 
     if chain["type"] == "polymer":
         polymer = {
@@ -311,13 +379,12 @@ def add_het_to_dict(group, chain, atoms, d, number=None):
 
     :param dict group: the group template the het should be based on.
     :param dict chain: the chain (in the real sense) the het is associated with.
-    :param list atoms: the atoms list to work through.
+    :param iterator atoms: the atoms to work through.
     :param dict d: the dictionary to add to.
     :param int number: if given, the residue number to use."""
 
     het_id = f"{chain['id']}.{group['number']}{group['insert']}"
-    het_atoms = atoms[:len(group["atoms"])]
-    del atoms[:len(het_atoms)]
+    het_atoms = list(islice(atoms, len(group["atoms"])))
     het_atoms = {a["id"]: {
      "anisotropy": [0] * 6, **a, **g_a
     } for a, g_a in zip(het_atoms, group["atoms"])}
@@ -355,6 +422,154 @@ def add_ss_to_chain(chain):
         del res["secondary_structure"]
 
 
+def mmtf_dict_to_models(mmtf_dict):
+    """Creates a list of :py:class:`.Model` objects directly from the arrays of
+    a .mmtf dictionary.
+
+    Chains, groups and atoms are stored in .mmtf files as consecutive runs, so
+    they are walked with running offsets into those arrays - each chain's
+    groups and each group's atoms are a slice starting where the previous one
+    ended.
+
+    :param dict mmtf_dict: the .mmtf dictionary to read.
+    :rtype: ``list``"""
+
+    atoms = [to_list(mmtf_dict[key]) for key in (
+     "xCoordList", "yCoordList", "zCoordList", "atomIdList", "bFactorList",
+     "altLocList", "occupancyList"
+    )]
+    groups = [to_list(mmtf_dict.get(key, default)) for key, default in (
+     ("groupIdList", None), ("insCodeList", None), ("groupTypeList", None),
+     ("secStructList", [-1] * len(mmtf_dict["groupIdList"]))
+    )]
+    templates = [(
+     group["groupName"], group["atomNameList"],
+     [element.upper() for element in group["elementList"]],
+     group["formalChargeList"]
+    ) for group in mmtf_dict["groupList"]]
+    entities = {}
+    for entity in mmtf_dict["entityList"]:
+        for index in entity["chainIndexList"]: entities.setdefault(index, entity)
+    chains = list(zip(
+     to_list(mmtf_dict["chainIdList"]), to_list(mmtf_dict["chainNameList"]),
+     to_list(mmtf_dict["groupsPerChain"])
+    ))
+    models, offsets = [], [0, 0, 0]
+    for chain_num in to_list(mmtf_dict["chainsPerModel"])[:mmtf_dict["numModels"]]:
+        models.append(create_mmtf_model(
+         chains, entities, groups, templates, atoms, offsets, chain_num
+        ))
+    return models
+
+
+def create_mmtf_model(chains, entities, groups, templates, atoms, offsets,
+ chain_num):
+    """Creates a single :py:class:`.Model` from the next run of chains in a
+    .mmtf file, moving the running chain, group and atom offsets on.
+
+    :param list chains: the ID, name and group count of every chain.
+    :param dict entities: the entity of each chain, by chain index.
+    :param list groups: the group ID, insert, type and secondary structure\
+    arrays.
+    :param list templates: the name, atom names, elements and charges of each\
+    group type.
+    :param list atoms: the atom coordinate, ID, B-factor, alt loc and\
+    occupancy arrays.
+    :param list offsets: the current chain, group and atom positions.
+    :param int chain_num: the number of chains in the model.
+    :rtype: ``Model``"""
+
+    polymers, hets = {}, {"non-polymer": {}, "water": {}}
+    for chain_index in range(offsets[0], offsets[0] + chain_num):
+        internal_id, id, group_num = chains[chain_index]
+        entity = entities[chain_index]
+        residues = {}
+        for group_index in range(offsets[1], offsets[1] + group_num):
+            type_ = groups[2][group_index]
+            het_id = "{}.{}{}".format(
+             id, groups[0][group_index], groups[1][group_index]
+            )
+            het_atoms = create_mmtf_atoms(templates[type_], atoms, offsets[2])
+            offsets[2] += len(templates[type_][1])
+            if entity["type"] == "polymer":
+                residues[het_id] = (Residue(
+                 *het_atoms, id=het_id, name=templates[type_][0]
+                ), groups[3][group_index])
+            else:
+                hets[entity["type"]][het_id] = (
+                 het_atoms, templates[type_][0], internal_id, id,
+                 entity.get("description")
+                )
+        offsets[1] += group_num
+        if entity["type"] == "polymer":
+            polymers[id] = create_mmtf_chain(
+             residues, id, internal_id, entity.get("sequence", "")
+            )
+    offsets[0] += chain_num
+    chains = list(polymers.values())
+    ligands = [Ligand(
+     *het_atoms, id=het_id, name=name, internal_id=internal_id,
+     chain=polymers.get(chain_id), full_name=full_name, water=type_ == "water"
+    ) for type_ in ("non-polymer", "water") for het_id, (
+     het_atoms, name, internal_id, chain_id, full_name
+    ) in hets[type_].items()]
+    return Model(*(chains + ligands))
+
+
+def create_mmtf_chain(residues, id, internal_id, sequence):
+    """Creates a :py:class:`.Chain` from its residues, linking them to each
+    other and grouping them into helices and strands using their secondary
+    structure codes.
+
+    :param dict residues: the residues and their secondary structure codes.
+    :param str id: the chain's ID.
+    :param str internal_id: the chain's internal ID.
+    :param str sequence: the chain's sequence.
+    :rtype: ``Chain``"""
+
+    sec_struct = [
+     "helices", None, "helices", "strands", "helices", "strands", None, None
+    ]
+    ss, in_ss = {"helices": [], "strands": []}, set()
+    for residue, code in residues.values():
+        current = sec_struct[code]
+        if current:
+            if current not in in_ss: ss[current].append([])
+            in_ss.add(current)
+            ss[current][-1].append(residue)
+        else: in_ss.clear()
+    residues = [residue for residue, code in residues.values()]
+    for res1, res2 in zip(residues[:-1], residues[1:]):
+        res1._next, res2._previous = res2, res1
+    return Chain(
+     *residues, id=id, internal_id=internal_id, sequence=sequence,
+     helices=ss["helices"], strands=ss["strands"]
+    )
+
+
+def create_mmtf_atoms(template, atoms, start):
+    """Creates the :py:class:`.Atom` objects of a single group, reading from
+    the atom arrays at the given position. If there is multiple occupancy, only
+    one position will be used.
+
+    :param tuple template: the group's name, atom names, elements and charges.
+    :param list atoms: the atom coordinate, ID, B-factor, alt loc and\
+    occupancy arrays.
+    :param int start: the position of the group's first atom.
+    :rtype: ``list``"""
+
+    end = start + len(template[1])
+    alt_locs, occupancies = atoms[5][start:end], atoms[6][start:end]
+    alt_loc = None
+    if any(o < 1 for o in occupancies) and any(alt_locs):
+        alt_loc = sorted(a for a in alt_locs if a)[0]
+    return [Atom(
+     element, x, y, z, id, name, charge, bvalue, [0] * 6
+    ) for x, y, z, id, bvalue, alt, occupancy, name, element, charge in zip(
+     *[column[start:end] for column in atoms], *template[1:]
+    ) if occupancy == 1 or not alt or alt == alt_loc]
+
+
 def mmtf_to_data_transfer(mmtf_dict, data_dict, d_cat, d_key, m_key,
                            date=False, first=False, trim=False):
     """A function for transfering a bit of data from a .mmtf dictionary to a
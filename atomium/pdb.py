@@ -4,6 +4,7 @@ from datetime import datetime
 import re
 from itertools import groupby, chain
 import valerius
+import numpy as np
 from math import ceil
 from .data import CODES
 from .structures import Residue, Ligand
@@ -46,6 +47,39 @@ def pdb_string_to_pdb_dict(filestring):
     return pdb_dict
 
 
+def pdb_lines_to_model_dicts(lines):
+    """Takes an iterable of .pdb records, such as an open file, and yields a
+    model dictionary for each model in turn - without ever holding more than
+    one model's records in memory at once.
+
+    The records which come before the first model, such as SEQRES, HELIX and
+    HETNAM, are parsed once and shared by every model.
+
+    :param lines: the records to read.
+    :rtype: ``generator``"""
+
+    header, model_lines, shared = {}, [], None
+    model_recs = ("ATOM", "HETATM", "ANISOU", "MODEL", "TER", "ENDMDL")
+    for line in lines:
+        if not line.strip(): continue
+        line = line.rstrip()
+        head = line[:6].rstrip()
+        if head in model_recs:
+            if shared is None:
+                shared = (make_sequences(header),
+                 make_secondary_structure(header), get_full_names(header))
+            if head == "ENDMDL":
+                if model_lines: yield model_lines_to_model_dict(
+                 model_lines, *shared
+                )
+                model_lines = []
+            elif head != "MODEL":
+                model_lines.append(line)
+        elif shared is None and head != "REMARK":
+            update_dict(header, head, line)
+    if model_lines: yield model_lines_to_model_dict(model_lines, *shared)
+
+
 def update_dict(d, key, value):
     """Takes a dictionary where the values are lists, and adds a value to one of
     the lists at the specific key. If the list doesn't exist, it creates it
@@ -144,21 +178,34 @@ def update_models_list(pdb_dict, data_dict):
     secondary_structure = make_secondary_structure(pdb_dict)
     full_names = get_full_names(pdb_dict)
     for model_lines in pdb_dict["MODEL"]:
-        aniso = make_aniso(model_lines)
-        last_ter = get_last_ter_line(model_lines)
-        model = {"polymer": {}, "non-polymer": {}, "water": {}}
-        for index, line in enumerate(model_lines):
-            if line[:6] in ["ATOM  ", "HETATM"]:
-                chain_id = line[21] if index < last_ter else id_from_line(line)
-                res_id = id_from_line(line)
-                if index < last_ter:
-                    add_atom_to_polymer(line, model, chain_id, res_id, aniso, full_names)
-                else:
-                    add_atom_to_non_polymer(line, model, res_id, aniso, full_names)
-            for chain_id, chain in model["polymer"].items():
-                chain["sequence"] = sequences.get(chain_id, "")
-        add_secondary_structure_to_polymers(model, secondary_structure)
-        data_dict["models"].append(model)
+        data_dict["models"].append(model_lines_to_model_dict(
+         model_lines, sequences, secondary_structure, full_names
+        ))
+
+
+def model_lines_to_model_dict(model_lines, sequences, secondary_structure,
+ full_names):
+    """Creates a model dictionary from the records of a single model. The ATOM
+    and HETATM records are parsed together into arrays by
+    :py:func:`.atom_lines_to_arrays`, and then grouped into residues.
+
+    :param list model_lines: the model's records.
+    :param dict sequences: the chain sequences to use.
+    :param dict secondary_structure: the helices and strands to use.
+    :param dict full_names: lookup dictionary for het full names.
+    :rtype: ``dict``"""
+
+    aniso = make_aniso(model_lines)
+    last_ter = get_last_ter_line(model_lines)
+    model = {"polymer": {}, "non-polymer": {}, "water": {}}
+    indices = [index for index, line in enumerate(model_lines)
+     if line[:6] in ["ATOM  ", "HETATM"]]
+    atoms = atom_lines_to_arrays([model_lines[i] for i in indices])
+    add_atoms_to_model(atoms, indices, last_ter, model, aniso, full_names)
+    for chain_id, chain in model["polymer"].items():
+        chain["sequence"] = sequences.get(chain_id, "")
+    add_secondary_structure_to_polymers(model, secondary_structure)
+    return model
 
 
 def extract_header(pdb_dict, description_dict):
@@ -446,97 +493,154 @@ def get_last_ter_line(model_lines):
     return last_ter
 
 
-def id_from_line(line):
-    """Creates a residue ID from an atom line.
+def atom_lines_to_arrays(lines):
+    """Parses a list of ATOM and HETATM records all at once. Because the records
+    are fixed-width, they can be laid out as the rows of a single character
+    array, and each field then read for every atom in one go by slicing out its
+    columns - rather than slicing and converting each record separately.
 
-    :param str line: the ATOM or HETATM line record.
-    :rtype: ``str``"""
+    Numeric fields are read from a byte copy of the records, as NumPy converts
+    bytes to numbers much faster than it does ``str`` objects.
+
+    A ``dict`` of arrays is returned, one per field. Blank occupancies are 1,
+    blank B-factors are ``nan`` and blank charges are 0.
+
+    :param list lines: the records to parse.
+    :rtype: ``dict``"""
+
+    chars = np.array(lines, dtype="U80").view("U1").reshape(len(lines), 80)
+    raw = np.frombuffer("".join(line[:80].ljust(80) for line in lines).encode(
+     "ascii", "replace"
+    ), dtype="S1").reshape(len(lines), 80)
+    text = lambda start, end: np.char.strip(chars[:, start:end].copy().view(
+     "U{}".format(end - start)
+    ).ravel())
+    number = lambda start, end, blank: np.where(
+     text(start, end) == "", blank, raw[:, start:end].copy().view(
+      "S{}".format(end - start)
+     ).ravel()
+    )
+    charges, inverse = np.unique(text(78, 80), return_inverse=True)
+    return {
+     "serial": number(6, 11, b"0").astype(int), "name": text(12, 16),
+     "alt_loc": text(16, 17), "res_name": text(17, 20),
+     "chain_id": text(21, 22), "res_number": text(22, 26),
+     "insert": text(26, 27), "coordinates": np.stack([
+      number(30, 38, b"0"), number(38, 46, b"0"), number(46, 54, b"0")
+     ], axis=1).astype(float), "occupancy": number(54, 60, b"1").astype(float),
+     "bvalue": number(60, 66, b"nan").astype(float), "element": text(76, 78),
+     "charge": np.array([parse_charge(c) for c in charges.tolist()],
+      dtype=int)[inverse.ravel()]
+    }
 
-    return "{}.{}{}".format(line[21], line[22:26].strip(), line[26].strip())
 
+def parse_charge(charge):
+    """Converts the charge field of an atom record to an integer. The sign can
+    come before or after the number, and a blank field is 0.
 
-def add_atom_to_polymer(line, model, chain_id, res_id, aniso_dict, full_names):
-    """Takes an .pdb ATOM or HETATM record, converts it, and adds it to a
-    polymer dictionary.
+    :param str charge: the field to convert.
+    :rtype: ``int``"""
+
+    if not charge.strip(): return 0
+    try:
+        return int(charge.strip())
+    except: return int(charge[::-1].strip())
 
-    :param dict line: the line to read.
+
+def add_atoms_to_model(atoms, indices, last_ter, model, aniso_dict, full_names):
+    """Takes the arrays produced from a model's atom records and groups them
+    into the polymer, non-polymer and water residues of a model dictionary.
+    Atoms which appear before the last TER record are polymer atoms.
+
+    :param dict atoms: the atom arrays to read.
+    :param list indices: the position of each atom's record in the model.
+    :param int last_ter: the position of the model's last TER record.
+    :param dict model: the model to update.
+    :param dict aniso_dict: lookup dictionary for anisotropy information.
+    :param dict full_names: lookup dictionary for het full names."""
+
+    bvalues = [None if b != b else b for b in atoms["bvalue"].tolist()]
+    rows = zip(
+     indices, atoms["serial"].tolist(), atoms["name"].tolist(),
+     atoms["alt_loc"].tolist(), atoms["res_name"].tolist(),
+     atoms["chain_id"].tolist(), atoms["res_number"].tolist(),
+     atoms["insert"].tolist(), *atoms["coordinates"].T.tolist(),
+     atoms["occupancy"].tolist(), bvalues, atoms["element"].tolist(),
+     atoms["charge"].tolist()
+    )
+    for (index, serial, name, alt_loc, res_name, chain_id, res_number, insert,
+     x, y, z, occupancy, bvalue, element, charge) in rows:
+        atom = {
+         "occupancy": occupancy, "bvalue": bvalue, "charge": charge,
+         "anisotropy": aniso_dict.get(serial, [0, 0, 0, 0, 0, 0]),
+         "name": name or None, "alt_loc": alt_loc or None,
+         "x": x, "y": y, "z": z, "element": element or None
+        }
+        res_id = "{}.{}{}".format(chain_id or " ", res_number, insert)
+        if index < last_ter:
+            add_atom_to_polymer(
+             atom, serial, res_name, model, chain_id or " ", res_id, full_names
+            )
+        else:
+            add_atom_to_non_polymer(
+             atom, serial, res_name, model, chain_id or " ", res_id, full_names
+            )
+
+
+def add_atom_to_polymer(atom, serial, name, model, chain_id, res_id, full_names):
+    """Takes an atom dictionary and adds it to a polymer dictionary, creating
+    the residue and chain if needed.
+
+    :param dict atom: the atom to add.
+    :param int serial: the atom's ID.
+    :param str name: the name of the atom's residue.
     :param dict model: the model to update.
     :param str chain_id: the chain ID to add to.
     :param str res_id: the molecule ID to add to.
-    :param dict aniso_dict: lookup dictionary for anisotropy information."""
+    :param dict full_names: lookup dictionary for het full names."""
 
     try:
-        model["polymer"][chain_id]["residues"][res_id]["atoms"][
-         int(line[6:11])
-        ] = atom_line_to_dict(line, aniso_dict)
+        model["polymer"][chain_id]["residues"][res_id]["atoms"][serial] = atom
     except:
-        name = line[17:20].strip()
         try:
             model["polymer"][chain_id]["residues"][res_id] = {
              "name": name, "full_name": full_names.get(name),
-             "atoms": {int(line[6:11]): atom_line_to_dict(line, aniso_dict)},
+             "atoms": {serial: atom},
              "number": len(model["polymer"][chain_id]["residues"]) + 1
             }
         except:
             model["polymer"][chain_id] = {
              "internal_id": chain_id, "helices": [], "strands": [],
              "residues": {res_id: {
-              "name": line[17:20].strip(),
-              "atoms": {int(line[6:11]): atom_line_to_dict(line, aniso_dict)},
+              "name": name, "atoms": {serial: atom},
               "number": 1, "full_name": None,
              }}
             }
 
 
-def add_atom_to_non_polymer(line, model, res_id, aniso_dict, full_names):
-    """Takes an .pdb ATOM or HETATM record, converts it, and adds it to a
-    non-polymer dictionary.
+def add_atom_to_non_polymer(atom, serial, name, model, chain_id, res_id,
+ full_names):
+    """Takes an atom dictionary and adds it to a non-polymer dictionary,
+    creating the molecule if needed.
 
-    :param dict line: the line to read.
+    :param dict atom: the atom to add.
+    :param int serial: the atom's ID.
+    :param str name: the name of the atom's molecule.
     :param dict model: the model to update.
+    :param str chain_id: the chain the molecule is associated with.
     :param str res_id: the molecule ID to add to.
-    :param dict aniso_dict: lookup dictionary for anisotropy information."""
+    :param dict full_names: lookup dictionary for het full names."""
 
-    key = "water" if line[17:20] in ["HOH", "DOD"] else "non-polymer"
+    key = "water" if name in ["HOH", "DOD"] else "non-polymer"
     try:
-        model[key][res_id]["atoms"][
-         int(line[6:11])
-        ] = atom_line_to_dict(line, aniso_dict)
+        model[key][res_id]["atoms"][serial] = atom
     except:
-        name = line[17:20].strip()
         model[key][res_id] = {
          "name": name, "full_name": full_names.get(name),
-         "internal_id": line[21], "polymer": line[21],
-         "atoms": {int(line[6:11]): atom_line_to_dict(line, aniso_dict)}
+         "internal_id": chain_id, "polymer": chain_id, "atoms": {serial: atom}
         }
 
 
-def atom_line_to_dict(line, aniso_dict):
-    """Converts an ATOM or HETATM record to an atom dictionary.
-
-    :param str line: the record to convert.
-    :param dict aniso_dict: the anisotropy dictionary to use.
-    :rtype: ``dict``"""
-
-    a = {
-     "occupancy": 1, "bvalue": None, "charge": 0,
-     "anisotropy": aniso_dict.get(int(line[6:11].strip()), [0, 0, 0, 0, 0, 0])
-    }
-    a["name"] = line[12:16].strip() or None
-    a["alt_loc"] = line[16].strip() or None
-    a["x"] = float(line[30:38].strip())
-    a["y"] = float(line[38:46].strip())
-    a["z"] = float(line[46:54].strip())
-    if line[54:60].strip(): a["occupancy"] = float(line[54:60].strip())
-    if line[60:66].strip(): a["bvalue"] = float(line[60:66].strip())
-    a["element"] = line[76:78].strip() or None
-    if line[78:80].strip():
-        try:
-            a["charge"] = int(line[78:80].strip())
-        except: a["charge"] = int(line[78:80][::-1].strip())
-    return a
-
-
 def merge_lines(lines, start, join=" "):
     """Gets a single continuous string from a sequence of lines.
 
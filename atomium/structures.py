@@ -3,8 +3,9 @@
 import numpy as np
 import rmsd
 import math
+import itertools
 import warnings
-from collections import Counter, OrderedDict, defaultdict
+from collections import Counter, OrderedDict
 from .base import StructureClass, query, StructureSet
 
 class AtomStructure:
@@ -19,6 +20,7 @@ class AtomStructure:
 
     def __init__(self, id=None, name=None):
         self._id, self._name = id, name
+        self._cache = {}
 
 
     def __eq__(self, other):
@@ -55,6 +57,7 @@ class AtomStructure:
     @name.setter
     def name(self, name):
         self._name = name
+        StructureSet.changes += 1
 
 
     @property
@@ -63,7 +66,9 @@ class AtomStructure:
 
         :rtype: ``float``"""
 
-        return round(sum([atom.mass for atom in self.atoms()]), 12)
+        return self._cached("mass", lambda: round(
+         float(self._atom_values("masses").sum()), 12
+        ))
 
 
     @property
@@ -82,7 +87,9 @@ class AtomStructure:
 
         :rtype: ``Counter``"""
 
-        return Counter([atom.element for atom in self.atoms()])
+        return Counter(self._cached(
+         "formula", lambda: Counter([atom.element for atom in self.atoms()])
+        ))
 
 
     @property
@@ -92,9 +99,11 @@ class AtomStructure:
 
         :rtype: ``tuple``"""
 
-        mass = self.mass
-        locations = np.array([a._location * a.mass for a in self.atoms()])
-        return np.sum(locations, axis=0) / mass
+        def calculate():
+            arrays, rows = self._atom_arrays()
+            locations = arrays.coordinates[rows] * arrays.masses[rows, None]
+            return np.sum(locations, axis=0) / self.mass
+        return self._cached("center_of_mass", calculate, moves=True).copy()
 
 
     @property
@@ -105,13 +114,12 @@ class AtomStructure:
 
         :rtype: ``float``"""
 
-        center_of_mass = self.center_of_mass
-        atoms = self.atoms()
-        square_deviation = sum(
-         [atom.distance_to(center_of_mass) ** 2 for atom in atoms]
-        )
-        mean_square_deviation = square_deviation / len(atoms)
-        return np.sqrt(mean_square_deviation)
+        def calculate():
+            deviations = self._atom_values("coordinates") - self.center_of_mass
+            square_deviation = np.sum(deviations ** 2)
+            mean_square_deviation = square_deviation / len(deviations)
+            return np.sqrt(mean_square_deviation)
+        return self._cached("radius_of_gyration", calculate, moves=True)
 
 
     def pairing_with(self, structure):
@@ -129,26 +137,48 @@ class AtomStructure:
         atoms.
         :rtype: ``dict``"""
 
+        return dict(zip(*self._paired_atoms(structure)))
+
+
+    def _paired_atoms(self, structure):
+        """Pairs this structure's atoms with another structure's atoms, as in
+        :py:meth:`.pairing_with`, but returns the pairing as two tuples of
+        atoms in matching order.
+
+        :param AtomStructure structure: the structure to pair with.
+        :raises ValueError: if the other structure has a different number of\
+        atoms.
+        :rtype: ``tuple``"""
+
         atoms = self.atoms()
         other_atoms = structure.atoms()
         if len(atoms) != len(other_atoms):
             raise ValueError("{} and {} have different numbers of atoms".format(
              self, structure
             ))
-        pair = {}
-        common_ids = set(a._id for a in atoms) & set(a._id for a in other_atoms)
         id_atoms = {a._id: a for a in atoms}
         id_other_atoms = {a._id: a for a in other_atoms}
-        for id_ in common_ids:
-            pair[id_atoms[id_]] = id_other_atoms[id_]
-            atoms.remove(id_atoms[id_])
-            other_atoms.remove(id_other_atoms[id_])
-        atoms, other_atoms = list(atoms), list(other_atoms)
-        for l in atoms, other_atoms:
-            l.sort(key=lambda a: (
-             a._id, a._element, a._name, id(a)
-            ))
-        return {**pair, **{a1: a2 for a1, a2 in zip(atoms, other_atoms)}}
+        common_ids = id_atoms.keys() & id_other_atoms.keys()
+        paired = [id_atoms[id_] for id_ in common_ids]
+        other_paired = [id_other_atoms[id_] for id_ in common_ids]
+        done, other_done = set(paired), set(other_paired)
+        key = lambda a: (a._id, a._element, a._name, id(a))
+        paired += sorted([a for a in atoms if a not in done], key=key)
+        other_paired += sorted(
+         [a for a in other_atoms if a not in other_done], key=key
+        )
+        return tuple(paired), tuple(other_paired)
+
+
+    def _centered_coordinates(self, atoms):
+        """Gets the coordinates of some of the structure's atoms, in the order
+        given, relative to the structure's :py:meth:`.center_of_mass`.
+
+        :param atoms: the atoms to get coordinates for.
+        :rtype: ``numpy.ndarray``"""
+
+        arrays, rows = AtomArrays.of(atoms)
+        return arrays.coordinates[rows] - self.center_of_mass
 
 
     def rmsd_with(self, structure):
@@ -160,15 +190,83 @@ class AtomStructure:
         atoms.
         :rtype: ``float``"""
 
-        pairing = self.pairing_with(structure)
-        coords1, coords2 = [[a.location for a in atoms]
-         for atoms in zip(*pairing.items())]
-        c1, c2 = self.center_of_mass, structure.center_of_mass
-        coords1 = [[x - c1[0], y - c1[1], z - c1[2]] for x, y, z in coords1]
-        coords2 = [[x - c2[0], y - c2[1], z - c2[2]] for x, y, z in coords2]
+        atoms, other_atoms = self._paired_atoms(structure)
+        coords1 = self._centered_coordinates(atoms)
+        coords2 = structure._centered_coordinates(other_atoms)
         return round(rmsd.kabsch_rmsd(coords1, coords2), 12)
 
 
+    def superpose(self, structure, apply=False):
+        """Works out the rotation and translation which would move this
+        structure onto another with the smallest possible RMSD, pairing their
+        atoms as :py:meth:`.pairing_with` does. They are returned as a 3x3
+        matrix and a vector, to be applied in that order (as with
+        :py:meth:`.transform` and :py:meth:`.translate`).
+
+        The atoms are superposed about their unweighted centroids rather than
+        their centres of mass, as the RMSD being minimised is unweighted.
+
+            >>> matrix, vector = model2.superpose(model1, apply=True)
+
+        :param AtomStructure structure: the structure to superpose onto.
+        :param bool apply: if ``True``, the structure will also be moved.
+        :raises ValueError: if the other structure has a different number of\
+        atoms.
+        :rtype: ``tuple``"""
+
+        atoms, other_atoms = self._paired_atoms(structure)
+        (arrays1, rows1), (arrays2, rows2) = map(
+         AtomArrays.of, (atoms, other_atoms)
+        )
+        coords1 = arrays1.coordinates[rows1]
+        coords2 = arrays2.coordinates[rows2]
+        centroid1, centroid2 = coords1.mean(axis=0), coords2.mean(axis=0)
+        matrix = rmsd.kabsch(coords1 - centroid1, coords2 - centroid2).T
+        vector = centroid2 - np.dot(matrix, centroid1)
+        if apply:
+            self.transform(matrix)
+            self.translate(vector)
+        return matrix, vector
+
+
+    @staticmethod
+    def rmsd_matrix(*structures):
+        r"""Calculates the RMSD between every pair of some structures - for
+        example all the models of an NMR ensemble - and returns them as a
+        symmetric matrix.
+
+        The atoms of each structure are paired with those of the first once,
+        and all the superpositions are then done together as array
+        operations, which is much faster than calling :py:meth:`.rmsd_with`
+        for every pair.
+
+        :param \*structures: the structures to compare.
+        :raises ValueError: if the structures have different numbers of atoms.
+        :rtype: ``numpy.ndarray``"""
+
+        if not structures: return np.zeros((0, 0))
+        atoms = tuple(structures[0].atoms())
+        coordinates = []
+        for structure in structures:
+            pairing = structures[0].pairing_with(structure)
+            coordinates.append(structure._centered_coordinates(
+             [pairing[atom] for atom in atoms]
+            ))
+        coordinates = np.array(coordinates)
+        matrix = np.zeros((len(structures), len(structures)))
+        for index, coords1 in enumerate(coordinates[:-1]):
+            others = coordinates[index + 1:]
+            covariance = np.einsum("nx,mny->mxy", coords1, others)
+            v, _, w = np.linalg.svd(covariance)
+            flip = np.linalg.det(v) * np.linalg.det(w) < 0
+            v[flip, :, -1] *= -1
+            rotated = np.einsum("nx,mxy->mny", coords1, v @ w)
+            square_deviation = ((rotated - others) ** 2).sum(axis=(1, 2))
+            values = np.sqrt(square_deviation / len(atoms))
+            matrix[index, index + 1:] = matrix[index + 1:, index] = values
+        return np.round(matrix, 12)
+
+
     def create_grid(self, size=1, margin=0):
         """A generator which models a grid around the structure and returns the
         coordinates of all the points in that grid. The origin is always one of
@@ -179,11 +277,12 @@ class AtomStructure:
         coordinates. The default is 0.
         :rtype: ``tuple``"""
 
-        atom_locations = [atom.location for atom in self.atoms()]
+        arrays, rows = self._atom_arrays()
+        atom_locations = arrays.coordinates[rows]
         dimension_values = []
         for dimension in range(3):
-            coordinates = [loc[dimension] for loc in atom_locations]
-            min_, max_ = min(coordinates) - margin, max(coordinates) + margin
+            coordinates = atom_locations[:, dimension]
+            min_, max_ = coordinates.min() - margin, coordinates.max() + margin
             values = [0]
             while values[0] > min_: values.insert(0, values[0] - size)
             while values[-1] < max_: values.append(values[-1] + size)
@@ -235,31 +334,19 @@ class AtomStructure:
 
     def atoms_in_sphere(self, location, radius, *args, **kwargs):
         """Returns all the atoms in a given sphere within this structure. This
-        will be a lot faster if the structure is a :py:class:`.Model` and if
-        :py:meth:`.optimise_distances` has been called, as it won't have to
-        search all atoms.
+        will be a lot faster if the structure is a :py:class:`.Model`, as it
+        will use the model's spatial index rather than search all atoms.
 
         :param tuple location: the centre of the sphere.
         :param float radius: the radius of the sphere.
         :rtype: ``set``"""
 
-        if "_internal_grid" in self.__dict__ and self._internal_grid:
-            r, atoms = math.ceil(radius / 10), set()
-            x, y, z = [int(math.floor(n / 10)) * 10 for n in location]
-            x_range, y_range, z_range = [
-             [(val - (n * 10)) for n in range(1, r + 1)][::-1] + [val] + [
-              (val + n * 10) for n in range(1, r + 1)
-             ] for val in (x, y, z)
-            ]
-            for x in x_range:
-                for y in y_range:
-                    for z in z_range:
-                        atoms = atoms.union(self._internal_grid[x][y][z])
-            atoms = StructureSet(*atoms)
-            atoms = query(lambda self: atoms)(self, *args, **kwargs)
-        else:
-            atoms = self.atoms(*args, **kwargs)
-        return {a for a in atoms if a.distance_to(location) <= radius}
+        atoms = tuple(self.atoms(*args, **kwargs))
+        arrays, rows = AtomArrays.of(atoms)
+        distances = np.linalg.norm(
+         arrays.coordinates[rows] - np.array(location, dtype=float), axis=1
+        )
+        return {atom for atom, d in zip(atoms, distances) if d <= radius}
 
 
     def pairwise_atoms(self, *args, **kwargs):
@@ -267,6 +354,9 @@ class AtomStructure:
         structure. There will be no duplicates in the returned generator, and
         the number of returned pairs will be a triangle number.
 
+        For distances between large numbers of atoms, use
+        :py:meth:`.distance_matrix` instead.
+
         :rtype: ``tuple``"""
 
         atoms = list(self.atoms(*args, **kwargs))
@@ -275,40 +365,72 @@ class AtomStructure:
                 yield {atoms[a_index], atoms[o_index]}
 
 
-    def nearby_atoms(self, *args, **kwargs):
+    def distance_matrix(self, *args, cutoff=None, **kwargs):
+        """Calculates the distances between all of the structure's atoms (or
+        those of them that match the query arguments, which are the same as
+        for ``atoms()``). The atoms are returned too, sorted by ID, and their
+        order is the order of the matrix's rows and columns.
+
+        Without a cutoff the matrix is a dense NumPy array. With one, only the
+        distances within the cutoff are found, and they are returned as the
+        three arrays of a sparse COO matrix - the row indices, the column
+        indices, and the distances themselves. Both (i, j) and (j, i) are
+        included, but an atom's zero distance to itself is not.
+
+            >>> atoms, matrix = residue.distance_matrix(element="C")
+            >>> atoms, (rows, columns, distances) = model.distance_matrix(cutoff=4)
+
+        :param float cutoff: if given, only distances within this are found.
+        :rtype: ``tuple``"""
+
+        atoms = tuple(sorted(self.atoms(*args, **kwargs), key=lambda a: a._id))
+        arrays, rows = AtomArrays.of(atoms)
+        coordinates = arrays.coordinates[rows]
+        if cutoff is None:
+            square_distances = np.zeros((len(atoms), len(atoms)))
+            for dimension in range(3):
+                values = coordinates[:, dimension]
+                square_distances += (values[:, None] - values[None, :]) ** 2
+            return atoms, np.sqrt(square_distances)
+        grid = AtomGrid(coordinates, cutoff or 1)
+        rows, columns, distances = grid.pairs(coordinates, cutoff)
+        different = rows != columns
+        return atoms, (rows[different], columns[different], distances[different])
+
+
+    def nearby_atoms(self, cutoff, *args, **kwargs):
         """Returns all atoms within a given distance of this structure,
         excluding the structure's own atoms.
 
-        This will be a lot faster if the model's
-        :py:meth:`.optimise_distances` has been called, as it won't have to
-        search all atoms.
+        The search is done for all the structure's atoms at once using the
+        model's spatial index.
 
         :param float cutoff: the distance cutoff to use.
         :rtype: ``set``"""
 
-        atoms = set()
-        for atom in self.atoms():
-            atoms.update(atom.nearby_atoms(*args, **kwargs))
-        return atoms - self.atoms()
+        return self.atoms_within(cutoff, *args, **kwargs) - self.atoms()
     
 
-    def nearby_hets(self, *args, **kwargs):
+    def nearby_hets(self, *args, residues=True, ligands=True, **kwargs):
         """Returns all other het structures within a given distance of this
         structure, excluding itself.
 
-        This will be a lot faster if the model's
-        :py:meth:`.optimise_distances` has been called, as it won't have to
-        search all atoms.
+        The search is done for all the structure's atoms at once using the
+        model's spatial index.
 
         :param float cutoff: the distance cutoff to use.
+        :param bool residues: if ``False``, residues will not be returned.
+        :param bool ligands: if ``False``, ligands will not be returned.
         :rtype: ``set``"""
 
-        structures = set()
-        hets = set()
-        for atom in self.atoms():
-            structures.update(atom.nearby_hets(*args, **kwargs))
-            hets.add(atom.het)
-        return structures - hets
+        structures = {atom.het for atom in self.atoms_within(*args, **kwargs)}
+        structures -= {atom.het for atom in self.atoms()}
+        structures.discard(None)
+        if not residues:
+            structures = {s for s in structures if not isinstance(s, Residue)}
+        if not ligands:
+            structures = {s for s in structures if not (isinstance(s, Ligand))}
+        return structures
     
 
     def nearby_chains(self, *args, **kwargs):
@@ -318,12 +440,29 @@ class AtomStructure:
         :param float cutoff: the distance cutoff to use.
         :rtype: ``set``"""
 
-        structures = set()
-        chains = set()
-        for atom in self.atoms():
-            structures.update(atom.nearby_chains(*args, **kwargs))
-            chains.add(atom.chain)
-        return structures - chains
+        chains = {atom.chain for atom in self.atoms_within(*args, **kwargs)}
+        chains -= {atom.chain for atom in self.atoms()}
+        chains.discard(None)
+        return chains
+
+
+    def atoms_within(self, cutoff, *args, **kwargs):
+        """Returns all the atoms in the structure's :py:class:`.Model` which are
+        within a given distance of any of this structure's atoms - including
+        this structure's own atoms. If the structure is not part of a model, no
+        atoms will be returned.
+
+        :param float cutoff: the distance cutoff to use.
+        :rtype: ``set``"""
+
+        atoms = self.atoms()
+        model = next((atom.model for atom in atoms), None)
+        if model is None: return set()
+        model._atom_arrays()
+        arrays, rows = AtomArrays.of(atoms)
+        return model.atoms_in_spheres(
+         arrays.coordinates[rows], cutoff, *args, **kwargs
+        )
 
 
     def translate(self, dx=0, dy=0, dz=0, trim=12):
@@ -342,13 +481,15 @@ class AtomStructure:
             _,_,_ = dx
             vector = dx
         except TypeError: vector = (dx, dy, dz)
-        Atom.translate_atoms(vector, *self.atoms())
-        self.trim(trim)
+        arrays, rows = self._atom_arrays()
+        arrays.translate(vector, rows, trim)
 
 
     def transform(self, matrix, trim=12):
         """Transforms the structure using a 3x3 matrix supplied. This is useful
         if the :py:meth:`.rotate` method isn't powerful enough for your needs.
+        A 4x4 homogeneous matrix can also be given, to rotate and translate the
+        structure in one step.
 
         :param array matrix: A NumPy matrix representing the transformation.\
         You can supply a list of lists if you like and it will be converted to\
@@ -357,8 +498,8 @@ class AtomStructure:
         after transforming - the default is 12 decimal places but this can be\
         set to ``None`` if no rounding is to be done."""
 
-        Atom.transform_atoms(matrix, *self.atoms())
-        self.trim(trim)
+        arrays, rows = self._atom_arrays()
+        arrays.transform(matrix, rows, trim)
 
 
     def rotate(self, angle, axis, trim=12):
@@ -371,8 +512,23 @@ class AtomStructure:
         after translating - the default is 12 decimal places but this can be\
         set to ``None`` if no rounding is to be done."""
 
-        Atom.rotate_atoms(angle, axis, *self.atoms())
-        self.trim(trim)
+        arrays, rows = self._atom_arrays()
+        arrays.transform(Atom.rotation_matrix(angle, axis), rows, trim)
+
+
+    def apply(self, *operations, trim=12):
+        r"""Moves the structure by a series of operations, in the order given.
+        They are combined into a single matrix first (see
+        :py:meth:`.Atom.transformation_matrix`), so the atoms are only moved,
+        and rounded, once:
+
+            >>> chain.apply(("rotate", math.pi, "x"), ("translate", 12, -10.5, 0))
+
+        :param \*operations: the matrices and named operations to apply.
+        :param int trim: the places to round the atoms' coordinates to after
+         moving (12 by default), or ``None`` for no rounding."""
+
+        self.transform(Atom.transformation_matrix(*operations), trim)
 
 
     def trim(self, places):
@@ -382,8 +538,59 @@ class AtomStructure:
         :param int places: The number of places to round the coordinates to. If\
         ``None``, no rounding will be done."""
 
-        for atom in self.atoms():
-            atom.trim(places)
+        if places is not None:
+            arrays, rows = self._atom_arrays()
+            arrays.trim(places, rows)
+
+
+    def _atom_arrays(self):
+        """Gets an :py:class:`.AtomArrays` store holding the structure's atoms,
+        and the rows within it that are those atoms.
+
+        :rtype: ``tuple``"""
+
+        return AtomArrays.of(self.atoms())
+
+
+    def _atom_values(self, name):
+        """Gets one of the arrays of an :py:class:`.AtomArrays` store, for just
+        the structure's atoms.
+
+        :param str name: the array to get, such as ``"masses"``.
+        :rtype: ``numpy.ndarray``"""
+
+        arrays, rows = self._atom_arrays()
+        return getattr(arrays, name)[rows]
+
+
+    def _cached(self, name, calculate, moves=False, sources=()):
+        """Gets some calculated property of the structure, only calculating it
+        the first time it is asked for. Properties made from other structure
+        sets are calculated again if any of those sets have been replaced
+        since.
+
+        Properties which depend on the atoms' locations are tagged with the
+        :py:class:`.AtomArrays` store the atoms are attached to and its count
+        of movements, and are calculated again if that store has moved or been
+        replaced since. If the atoms aren't all attached to one store, there is
+        nothing to tell if they have moved, and so these are not kept.
+
+        :param str name: the name of the property.
+        :param calculate: the function which calculates the property.
+        :param bool moves: if ``True``, atom movements make the value outdated.
+        :param tuple sources: the objects the value is made from."""
+
+        cached = self._cache.get(name)
+        if cached is None or len(cached[0]) != len(sources) or not all(
+         a is b for a, b in zip(cached[0], sources)
+        ) or moves and not (
+         cached[1][0].attached and not cached[1][0].stale
+         and cached[1][0].moves == cached[1][1]
+        ):
+            arrays = self._atom_arrays()[0] if moves else None
+            stamp = (arrays, arrays.moves) if moves else None
+            cached = self._cache[name] = (sources, stamp, calculate())
+        return cached[2]
 
 
 
@@ -429,12 +636,14 @@ class Het(AtomStructure):
     def __init__(self, id, name, full_name, *atoms):
         AtomStructure.__init__(self, id, name)
         self._full_name = full_name
-        for atom in atoms: atom._het = self
+        for atom in atoms:
+            if atom._het is not None: StructureSet.changes += 1
+            atom._het = self
         self._atoms = StructureSet(*atoms)
 
 
     def __contains__(self, atom):
-        return atom in self._atoms.structures
+        return atom in self._atoms or atom in self._atoms.structures
     
 
     @property
@@ -482,6 +691,8 @@ class Model(AtomStructure, metaclass=StructureClass):
     :param \*molecules: The chains, ligands, and waters that will inhabit the\
     model."""
 
+    from atomium import data as __data
+
     def __init__(self, *molecules, file=None):
         AtomStructure.__init__(self, None, None)
         self._chains = set()
@@ -496,7 +707,7 @@ class Model(AtomStructure, metaclass=StructureClass):
         self._ligands = StructureSet(*self._ligands)
         self._waters = StructureSet(*self._waters)
         self._file = file
-        self._internal_grid = None
+        self._arrays, self._cell_size = None, 5
 
 
     def __repr__(self):
@@ -508,8 +719,8 @@ class Model(AtomStructure, metaclass=StructureClass):
 
 
     def __contains__(self, obj):
-        return (obj in self.molecules() or obj in self.residues()
-         or obj in self.atoms())
+        if isinstance(obj, Atom): return obj in self._all_atoms()
+        return obj in self._all_molecules() or obj in self._all_residues()
 
 
     @property
@@ -548,7 +759,7 @@ class Model(AtomStructure, metaclass=StructureClass):
 
         :rtype: ``set``"""
 
-        return self._chains + self._ligands + self._waters
+        return self._all_molecules()
 
 
     def residues(self):
@@ -556,10 +767,7 @@ class Model(AtomStructure, metaclass=StructureClass):
 
         :rtype: ``set``"""
 
-        res = []
-        for chain in self._chains.structures:
-            res += chain.residues()
-        return StructureSet(*res)
+        return self._all_residues()
 
 
     def atoms(self):
@@ -567,34 +775,247 @@ class Model(AtomStructure, metaclass=StructureClass):
 
         :rtype: ``set``"""
 
-        atoms = set()
-        for mol in self.molecules():
-            try:
-                atoms.update(mol._atoms.structures)
-            except:
-                for res in mol._residues.structures:
-                    atoms.update(res._atoms.structures)
-        return StructureSet(*atoms)
+        return self._all_atoms()
 
 
     def dehydrate(self):
         """Removes all water ligands from the model."""
 
         self._waters = StructureSet()
-    
+        self._arrays, self._cache = None, {}
+
+
+    def _all_molecules(self):
+        """Gets the :py:class:`.StructureSet` of all the model's molecules,
+        which is kept until its chains, ligands or waters are replaced.
+
+        :rtype: ``StructureSet``"""
+
+        return self._cached(
+         "molecules", lambda: self._chains + self._ligands + self._waters,
+         sources=(self._chains, self._ligands, self._waters)
+        )
+
+
+    def _all_residues(self):
+        """Gets the :py:class:`.StructureSet` of all the residues in the model's
+        chains, which is kept until the chains or their residues are replaced.
+
+        :rtype: ``StructureSet``"""
+
+        chains = self._chains.structures
+        return self._cached("residues", lambda: StructureSet(*[
+         res for chain in chains for res in chain._residues.structures
+        ]), sources=(self._chains, *[chain._residues for chain in chains]))
+
+
+    def _all_atoms(self):
+        """Gets the :py:class:`.StructureSet` of all the atoms in the model's
+        molecules, which is kept until its molecules or their residues are
+        replaced.
+
+        :rtype: ``StructureSet``"""
+
+        def atoms():
+            atoms = []
+            for mol in self._all_molecules().structures:
+                if isinstance(mol, Chain):
+                    for res in mol._residues.structures:
+                        atoms += res._atoms.structures
+                else:
+                    atoms += mol._atoms.structures
+            return StructureSet(*atoms)
+        return self._cached("atoms", atoms, sources=(
+         self._all_molecules(), *[chain._residues
+         for chain in self._chains.structures]
+        ))
+
+
+    def _atom_arrays(self):
+        """Gets the model's own :py:class:`.AtomArrays` store, creating it (and
+        attaching the model's atoms to it) if it doesn't exist yet or if any of
+        the atoms have since been attached to some other store.
+
+        :rtype: ``tuple``"""
+
+        if self._arrays is None or self._arrays.stale:
+            self._arrays = AtomArrays(*self._all_atoms().structures)
+        return self._arrays, slice(None)
+
+
+    def optimise_distances(self, cell_size=5):
+        """Builds the model's spatial index now, with a given cell size, rather
+        than waiting for the first distance search to build it with the default
+        cell size of 5 Angstroms.
+
+        Small cells make searches with small cutoffs faster, large cells suit
+        larger cutoffs. The index is rebuilt automatically whenever the model's
+        atoms are moved.
+
+        :param float cell_size: the width of the index's cubic cells."""
+
+        self._cell_size = cell_size
+        self._atom_arrays()[0].grid(cell_size)
+
+
+    def atoms_in_sphere(self, location, radius, *args, **kwargs):
+        """Returns all the atoms in a given sphere within this model, using the
+        model's spatial index.
 
-    def optimise_distances(self):
-        """Calling this method makes finding atoms within a sphere faster, and
-        consequently makes all 'nearby' methods faster. It organises the atoms
-        in the model into grids, so that only relevant atoms are checked for
-        distances."""
+        :param tuple location: the centre of the sphere.
+        :param float radius: the radius of the sphere.
+        :rtype: ``set``"""
+
+        return self.atoms_in_spheres([location], radius, *args, **kwargs)
+
+
+    def atoms_in_spheres(self, locations, radius, *args, **kwargs):
+        """Returns all the atoms within a given distance of any of several
+        locations, using a single search of the model's spatial index.
+
+        :param locations: the centres of the spheres, as an (N, 3) array or\
+        a list of coordinates.
+        :param float radius: the radius of the spheres.
+        :rtype: ``set``"""
+
+        arrays, rows = self._atom_arrays()
+        _, indices, _ = arrays.grid(self._cell_size).pairs(locations, radius)
+        atoms = [arrays.atoms[index] for index in np.unique(indices)]
+        if args or kwargs:
+            atoms = StructureSet(*atoms)
+            return query(lambda self: atoms)(self, *args, **kwargs)
+        return set(atoms)
+
+
+    def nearest_atoms(self, location, k=1):
+        """Returns the atoms of the model nearest to some location, closest
+        first, using the model's spatial index.
+
+        :param tuple location: the location to search around.
+        :param int k: the number of atoms to return.
+        :rtype: ``tuple``"""
+
+        arrays, rows = self._atom_arrays()
+        indices, _ = arrays.grid(self._cell_size).nearest(location, k)
+        return tuple(arrays.atoms[index] for index in indices)
+
+
+    def symmetry_mates(self, radius):
+        """Makes a new model from the copies of this model which neighbour it in
+        its crystal, using the space group and unit cell of the file it came
+        from. A copy is a neighbour if any of its atoms are within a given
+        distance of this model's atoms.
+
+        Every symmetry operator and unit cell translation is ruled in or out at
+        once by comparing bounding boxes, and atoms are only made for the
+        neighbours themselves:
+
+            >>> pdb = atomium.fetch('1lol')
+            >>> pdb.model.symmetry_mates(4)
+            <Model (20 chains, 40 ligands)>
 
-        self._internal_grid = defaultdict(
-         lambda: defaultdict(lambda: defaultdict(set))
+        :param float radius: the distance to look for neighbours within.
+        :raises ValueError: if there is no space group and unit cell to use, or\
+        the unit cell is a placeholder or too small for the search.
+        :rtype: ``Model``"""
+
+        arrays = self._atom_arrays()[0]
+        molecules = self.__data.molecules_by_internal_id(self)
+        return self.__data.assemble_model(
+         molecules, self.__data.symmetry_mate_transformations(
+          arrays, arrays.grid(self._cell_size), list(molecules),
+          getattr(self._file, "_crystallography", {}), radius
+         )
         )
-        for atom in self.atoms():
-            x, y, z = [int(math.floor(n / 10)) * 10 for n in atom.location]
-            self._internal_grid[x][y][z].add(atom)
+
+
+    @property
+    def atom_arrays(self):
+        """The model's :py:class:`.AtomArrays` store, which holds the
+        coordinates and other properties of all its atoms as NumPy arrays. The
+        store's ``atoms`` are in the same order as the arrays' rows.
+
+        :rtype: ``AtomArrays``"""
+
+        return self._atom_arrays()[0]
+
+
+    def contacts(self, cutoff, between=None, level="atom"):
+        """Finds every pair of atoms in the model within a given distance of
+        each other, using a single search of the model's spatial index.
+
+        At the ``"atom"`` level two arrays are returned - an (N, 2) array of
+        each pair's row indices in the model's :py:attr:`.atom_arrays`, and the
+        distances between them.
+
+        At the ``"het"`` and ``"chain"`` levels, these are grouped into contacts
+        between different residues and ligands, or between different chains,
+        and a ``dict`` is returned mapping each pair of structures to the
+        shortest distance between them.
+
+        By default all pairs are found, but two groups of structures or atoms
+        can be given instead, in which case only pairs with an atom in each
+        group are returned (in that order):
+
+            >>> model.contacts(4, between=(model.chain("A"), model.ligands()), level="het")
+
+        :param float cutoff: the distance cutoff to use.
+        :param tuple between: two structures, atoms, or collections of them.
+        :param str level: ``"atom"``, ``"het"`` or ``"chain"``.
+        :raises ValueError: if the level is not one of these.
+        :rtype: ``tuple`` or ``dict``"""
+
+        if level not in ("atom", "het", "chain"):
+            raise ValueError("'{}' is not a valid contact level".format(level))
+        arrays, rows = self._atom_arrays()
+        grid = arrays.grid(self._cell_size)
+        if between is None:
+            first, second, distances = grid.pairs(arrays.coordinates, cutoff)
+            keep = first < second
+        else:
+            group1, group2 = [self._rows_of(group) for group in between]
+            first, second, distances = grid.pairs(
+             arrays.coordinates[group1], cutoff
+            )
+            first = group1[first]
+            in_group2 = np.zeros(len(arrays), dtype=bool)
+            in_group2[group2] = True
+            keep = in_group2[second] & (first != second)
+        pairs = np.stack([first[keep], second[keep]], axis=1)
+        distances = distances[keep]
+        if level == "atom": return pairs, distances
+        labels = {}
+        ids = np.array([-1 if s is None else labels.setdefault(s, len(labels))
+         for s in [getattr(atom, level) for atom in arrays.atoms]], dtype=int)
+        structures, count = list(labels), len(labels)
+        id1, id2 = ids[pairs[:, 0]], ids[pairs[:, 1]]
+        keep = (id1 != id2) & (id1 >= 0) & (id2 >= 0)
+        id1, id2, distances = id1[keep], id2[keep], distances[keep]
+        if between is None:
+            id1, id2 = np.minimum(id1, id2), np.maximum(id1, id2)
+        keys, inverse = np.unique(id1 * count + id2, return_inverse=True)
+        shortest = np.full(len(keys), np.inf)
+        np.minimum.at(shortest, inverse, distances)
+        return {(structures[key // count], structures[key % count]): distance
+         for key, distance in zip(keys.tolist(), shortest.tolist())}
+
+
+    def _rows_of(self, group):
+        """Takes a structure, an atom, or a collection of them, and gets the
+        rows of the model's :py:class:`.AtomArrays` store which hold their
+        atoms. Atoms not in the model are ignored.
+
+        :param group: the structures or atoms.
+        :rtype: ``numpy.ndarray``"""
+
+        if isinstance(group, (AtomStructure, Atom)): group = [group]
+        atoms = set()
+        for obj in group:
+            atoms.update(obj.atoms() if isinstance(obj, AtomStructure) else {obj})
+        arrays = self._atom_arrays()[0]
+        return np.array(sorted(
+         atom._index for atom in atoms if atom._arrays is arrays
+        ), dtype=int)
 
 
     #TODO copy
@@ -605,7 +1026,9 @@ class Chain(Molecule, metaclass=StructureClass):
     """A sequence of residues. Unlike other structures, they are iterable, and
     have a length.
 
-    Residues can also be accessed using indexing.
+    Residues can also be accessed using indexing - by position, by residue ID,
+    or with a slice for a range of residues. This works on the chain's stored
+    order of residues, so it takes the same time however long the chain is.
 
     :param \*residues: The residues that will make up the chain.
     :param str id: the chain's unique ID.
@@ -619,11 +1042,14 @@ class Chain(Molecule, metaclass=StructureClass):
          self, kwargs.get("id"), kwargs.get("name"), kwargs.get("internal_id")
         )
         self._sequence = sequence
-        for res in residues: res._chain = self
+        for res in residues:
+            if res._chain is not None: StructureSet.changes += 1
+            res._chain = self
         self._residues = StructureSet(*residues)
         self._model = None
         self._helices = helices or []
         self._strands = strands or []
+        self._map_secondary_structure()
 
 
     def __repr__(self):
@@ -639,11 +1065,16 @@ class Chain(Molecule, metaclass=StructureClass):
 
 
     def __getitem__(self, key):
-        return self.residues()[key]
+        if isinstance(key, str):
+            residue = self._residues.get(key)
+            if residue is None: raise KeyError(key)
+            return residue
+        return self._residues.structures[key]
 
 
     def __contains__(self, obj):
-        return obj in self._residues.structures or obj in self.atoms()
+        if isinstance(obj, Atom): return obj in self._all_atoms()
+        return obj in self._residues or obj in self._residues.structures
 
 
     @property
@@ -669,6 +1100,12 @@ class Chain(Molecule, metaclass=StructureClass):
         :rtype: ``tuple``"""
 
         return tuple(self._helices)
+
+
+    @helices.setter
+    def helices(self, helices):
+        self._helices = list(helices)
+        self._map_secondary_structure()
     
 
     @property
@@ -680,6 +1117,32 @@ class Chain(Molecule, metaclass=StructureClass):
         return tuple(self._strands)
 
 
+    @strands.setter
+    def strands(self, strands):
+        self._strands = list(strands)
+        self._map_secondary_structure()
+
+
+    @property
+    def secondary_structure(self):
+        """The secondary structure of every residue in the chain, in order, as
+        a string - 'H' for residues in an alpha helix, 'E' for residues in a
+        beta strand, and '-' for any others.
+
+        :rtype: ``str``"""
+
+        def labels():
+            for res in self._residues.structures:
+                helix, strand = self._ss.get(res, (None, None))
+                yield "-" if helix is strand is None else "E" if (
+                 helix is None
+                ) else "H"
+        return self._cached(
+         "secondary_structure", lambda: "".join(labels()),
+         sources=(self._residues, self._ss)
+        )
+
+
     @property
     def length(self):
         """Returns the number of residues in the chain.
@@ -696,11 +1159,27 @@ class Chain(Molecule, metaclass=StructureClass):
         :rtype: ``str``"""
 
         return "".join(r.code for r in self.residues())
+
+
+    def _map_secondary_structure(self):
+        """Makes the chain's map of residues to the helix and strand (if any)
+        that they are part of, so that residues don't need to search every
+        helix and strand to find out."""
+
+        self._ss = {}
+        for n, elements in enumerate((self._helices, self._strands)):
+            for element in elements:
+                for res in element:
+                    self._ss.setdefault(res, [None, None])[n] = element
     
 
     def copy(self, id=None, residue_ids=None, atom_ids=None):
         """Creates a copy of the chain, with new atoms and residues.
 
+        The new atoms are all made at once, and until either chain is moved or
+        otherwise changed, they share the original atoms' stored coordinates
+        and values rather than having copies of their own.
+
         :param str id: if given, the ID of the new chain.
         :param function residue_ids: a callable which, if given, will generate\
         new residue IDs.
@@ -709,11 +1188,16 @@ class Chain(Molecule, metaclass=StructureClass):
         :rtype: ``Chain``"""
 
         residue_ids = residue_ids or (lambda i: i)
-        residues = {r: r.copy(
-         id=residue_ids(r.id), atom_ids=atom_ids
-        ) for r in self.residues()}
-        for r in self.residues():
-            residues[r].next = residues[r.next] if r.next else None
+        atoms = iter(Atom.copy_atoms(*[atom for r in self._residues.structures
+         for atom in r._atoms.structures], atom_ids=atom_ids))
+        residues = {r: r.__class__(
+         *[next(atoms) for _ in range(len(r._atoms))],
+         id=residue_ids(r.id) or r._id, name=r._name
+        ) for r in self._residues.structures}
+        for r, copy in residues.items():
+            if r._next:
+                copy._next = residues[r._next]
+                copy._next._previous = copy
         return Chain(
          *residues.values(), id=id or self._id, internal_id=self._internal_id,
          name=self._name, sequence=self._sequence,
@@ -730,15 +1214,35 @@ class Chain(Molecule, metaclass=StructureClass):
         return self._residues
 
 
+    def index(self, residue):
+        """Returns the position of a residue in the chain. The residue can be
+        given either as a :py:class:`.Residue` or as a residue ID.
+
+        :param residue: the residue to find.
+        :raises ValueError: if the residue isn't in the chain.
+        :rtype: ``int``"""
+
+        if isinstance(residue, str): residue = self._residues.get(residue)
+        positions = self._cached("positions", lambda: {
+         res: n for n, res in enumerate(self._residues.structures)
+        }, sources=(self._residues,))
+        try:
+            return positions[residue]
+        except KeyError:
+            raise ValueError(f"{residue} is not in the chain")
+
+
     def ligands(self):
         """Returns all the ligands associated with the chain - but only if the
         chain is part of a model.
 
         :rtype: ``set``"""
 
-        return StructureSet() if self._model is None else StructureSet(
-         *[l for l in self._model._ligands.structures if l._chain is self]
-        )
+        if self._model is None: return StructureSet()
+        ligands = self._model._ligands
+        return self._cached("ligands", lambda: StructureSet(
+         *[l for l in ligands.structures if l._chain is self]
+        ), sources=(ligands,))
 
 
     def atoms(self):
@@ -746,10 +1250,19 @@ class Chain(Molecule, metaclass=StructureClass):
 
         :rtype: ``set``"""
 
-        atoms = set()
-        for res in self._residues.structures:
-            atoms.update(res._atoms.structures)
-        return StructureSet(*atoms)
+        return self._all_atoms()
+
+
+    def _all_atoms(self):
+        """Gets the :py:class:`.StructureSet` of all the atoms in the chain's
+        residues, which is kept until the residues are replaced.
+
+        :rtype: ``StructureSet``"""
+
+        return self._cached("atoms", lambda: StructureSet(*[
+         atom for res in self._residues.structures
+         for atom in res._atoms.structures
+        ]), sources=(self._residues,))
 
 
 
@@ -795,12 +1308,7 @@ class Ligand(Molecule, Het, metaclass=StructureClass):
         atom IDs.
         :rtype: ``Ligand``"""
 
-        atoms = list(self.atoms())
-        if atom_ids:
-            new_ids = [atom_ids(a.id) for a in atoms]
-            atoms = [a.copy(id=id) for a, id in zip(atoms, new_ids)]
-        else:
-            atoms = [a.copy() for a in self.atoms()]
+        atoms = Atom.copy_atoms(*self._atoms.structures, atom_ids=atom_ids)
         return self.__class__(*atoms, id=id or self._id,
          name=self._name, internal_id=self._internal_id, water=self._water)
 
@@ -894,8 +1402,7 @@ class Residue(Het, metaclass=StructureClass):
         :rtype: ``bool``"""
 
         if self.chain:
-            for helix in self.chain.helices:
-                if self in helix: return True
+            return self.chain._ss.get(self, (None, None))[0] is not None
         return False
     
 
@@ -906,8 +1413,7 @@ class Residue(Het, metaclass=StructureClass):
         :rtype: ``bool``"""
 
         if self.chain:
-            for strand in self.chain.strands:
-                if self in strand: return True
+            return self.chain._ss.get(self, (None, None))[1] is not None
         return False
 
 
@@ -919,12 +1425,7 @@ class Residue(Het, metaclass=StructureClass):
         generate new atom IDs.
         :rtype: ``Residue``"""
 
-        atoms = list(self.atoms())
-        if atom_ids:
-            new_ids = [atom_ids(a.id) for a in atoms]
-            atoms = [a.copy(id=id) for a, id in zip(atoms, new_ids)]
-        else:
-            atoms = [a.copy() for a in self.atoms()]
+        atoms = Atom.copy_atoms(*self._atoms.structures, atom_ids=atom_ids)
         return self.__class__(*atoms, id=id or self._id, name=self._name)
     
 
@@ -962,15 +1463,16 @@ class Atom:
 
     __slots__ = [
      "_element", "_location", "_id", "_name", "_charge",
-     "_bvalue", "_anisotropy", "_het", "_bonded_atoms",
+     "_bvalue", "_anisotropy", "_het", "_bonded_atoms", "_arrays", "_index",
     ]
 
     def __init__(self, element, x, y, z, id, name, charge, bvalue, anisotropy):
-        self._location = np.array([x, y, z])
+        self._location = np.array([x, y, z], dtype=float)
         self._element = element
         self._id, self._name, self._charge = id, name, charge
         self._bvalue, self._anisotropy = bvalue, anisotropy
-        self._het, self._bonded_atoms = None, set()
+        self._het, self._bonded_atoms = None, None
+        self._arrays, self._index = None, None
 
 
     def __repr__(self):
@@ -984,7 +1486,9 @@ class Atom:
     def __eq__(self, other):
         if not isinstance(other, Atom): return False
         for attr in self.__slots__:
-            if attr not in ("_id", "_het", "_bonded_atoms", "_location"):
+            if attr not in (
+             "_id", "_het", "_bonded_atoms", "_location", "_arrays", "_index"
+            ):
                 if getattr(self, attr) != getattr(other, attr): return False
             if list(self._location) != list(other._location): return False
         return True
@@ -995,27 +1499,59 @@ class Atom:
 
 
     @staticmethod
-    def translate_atoms(vector, *atoms):
-        """Translates multiple atoms using some vector.
+    def translate_atoms(vector, *atoms, trim=None):
+        r"""Translates multiple atoms using some vector.
 
         :param vector: the three values representing the delta position.
-        :param \*atoms: the atoms to translate."""
+        :param \*atoms: the atoms to translate.
+        :param int trim: if given, the places to round the coordinates to."""
 
-        for atom in atoms:
-            atom._location += np.array(vector)
+        arrays, rows = AtomArrays.of(atoms)
+        arrays.translate(vector, rows, trim)
 
 
     @staticmethod
-    def transform_atoms(matrix, *atoms):
-        """Transforms multiple atoms using some matrix.
+    def transform_atoms(matrix, *atoms, trim=None):
+        r"""Transforms multiple atoms using some matrix - either a 3x3 matrix or
+        a 4x4 homogeneous matrix.
 
         :param matrix: the transformation matrix.
-        :param \*atoms: the atoms to transform."""
+        :param \*atoms: the atoms to transform.
+        :param int trim: if given, the places to round the coordinates to."""
 
-        locations = [list(a) for a in atoms]
-        output = np.dot(np.array(matrix), np.array(locations).transpose())
-        for atom, location in zip(atoms, output.transpose()):
-            atom._location = location
+        arrays, rows = AtomArrays.of(atoms)
+        arrays.transform(matrix, rows, trim)
+
+
+    @staticmethod
+    def copy_atoms(*atoms, atom_ids=None):
+        r"""Copies multiple atoms at once. Rather than each copy getting its own
+        location array, the copies are attached to a single new
+        :py:class:`.AtomArrays` store, which shares the arrays of the original
+        atoms' store until either store is changed (see
+        :py:meth:`.AtomArrays.copy`). The store of the atoms' model is made
+        first if needed - atoms with no store are copied one by one.
+
+        :param \*atoms: the atoms to copy.
+        :param function atom_ids: if given, a callable making new atom IDs.
+        :rtype: ``list``"""
+
+        model = atoms[0].model if atoms else None
+        if model is not None: model._atom_arrays()
+        arrays, rows = AtomArrays.attached(atoms)
+        copies = []
+        for atom in atoms:
+            copy = Atom.__new__(Atom)
+            copy._element, copy._name = atom._element, atom._name
+            copy._id = (atom_ids(atom._id) if atom_ids else None) or atom._id
+            copy._charge, copy._bvalue = atom._charge, atom._bvalue
+            copy._anisotropy = atom._anisotropy
+            copy._het, copy._bonded_atoms = None, None
+            copy._arrays, copy._index = None, None
+            if arrays is None: copy._location = atom._location.copy()
+            copies.append(copy)
+        if arrays is not None: arrays.copy(copies, rows)
+        return copies
 
 
     @staticmethod
@@ -1026,6 +1562,65 @@ class Atom:
         :param str axis: the axis to rotate around (x, y, or z).
         :param \*atoms: the atoms to rotate."""
 
+        Atom.transform_atoms(
+         Atom.rotation_matrix(angle, axis), *atoms, **kwargs
+        )
+
+
+    @staticmethod
+    def transformation_matrix(*operations):
+        r"""Combines a series of operations into a single 4x4 homogeneous
+        matrix, which performs them all in the order given.
+
+        Each operation can be a 3x3 or 4x4 matrix, or a tuple of the name of one
+        of the ways of moving structures followed by its arguments -
+        ``("translate", dx, dy, dz)`` (or a single vector),
+        ``("transform", matrix)`` or ``("rotate", angle, axis)``.
+
+        :param \*operations: the operations to combine.
+        :raises ValueError: if an operation is not recognised.
+        :rtype: ``numpy.ndarray``"""
+
+        combined = np.identity(4)
+        for operation in operations:
+            matrix = np.identity(4)
+            name = None
+            if isinstance(operation, tuple) and operation: name = operation[0]
+            if isinstance(name, str):
+                args = list(operation[1:])
+                if name == "translate":
+                    matrix[:3, 3] = args[0] if np.ndim(args[0]) else (
+                     args + [0] * (3 - len(args))
+                    )
+                elif name == "rotate":
+                    matrix[:3, :3] = Atom.rotation_matrix(*args)
+                elif name == "transform":
+                    matrix = Atom.transformation_matrix(args[0])
+                else:
+                    raise ValueError("'{}' is not a valid operation".format(name))
+            else:
+                operation = np.array(operation, dtype=float)
+                if operation.shape == (3, 3):
+                    matrix[:3, :3] = operation
+                elif operation.shape == (4, 4):
+                    matrix = operation
+                else:
+                    raise ValueError("{} is not a valid operation".format(
+                     operation.shape
+                    ))
+            combined = matrix @ combined
+        return combined
+
+
+    @staticmethod
+    def rotation_matrix(angle, axis):
+        """Creates the matrix for a rotation about one of the three axes.
+
+        :param float angle: the angle to rotate by in radians.
+        :param str axis: the axis to rotate around (x, y, or z).
+        :raises ValueError: if the axis is not x, y, or z.
+        :rtype: ``numpy.ndarray``"""
+
         try:
             axis = [1 if i == "xyz".index(axis) else 0 for i in range(3)]
         except ValueError:
@@ -1036,11 +1631,11 @@ class Atom:
         b, c, d = -axis * np.sin(angle / 2)
         aa, bb, cc, dd = a * a, b * b, c * c, d * d
         bc, ad, ac, ab, bd, cd = b * c, a * d, a * c, a * b, b * d, c * d
-        Atom.transform_atoms(np.array([
+        return np.array([
          [aa + bb - cc - dd, 2 * (bc + ad), 2 * (bd - ac)],
          [2 * (bc - ad), aa + cc - bb - dd, 2 * (cd + ab)],
          [2 * (bd + ac), 2 * (cd - ab), aa + dd - bb - cc]
-        ]), *atoms, **kwargs)
+        ])
 
 
     @property
@@ -1085,6 +1680,7 @@ class Atom:
     @name.setter
     def name(self, name):
         self._name = name
+        StructureSet.changes += 1
 
 
     @property
@@ -1099,6 +1695,10 @@ class Atom:
     @charge.setter
     def charge(self, charge):
         self._charge = charge
+        StructureSet.changes += 1
+        if self._arrays is not None:
+            self._arrays._own()
+            self._arrays.charges[self._index] = AtomArrays.number(charge)
 
 
     @property
@@ -1114,6 +1714,10 @@ class Atom:
     @bvalue.setter
     def bvalue(self, bvalue):
         self._bvalue = bvalue
+        StructureSet.changes += 1
+        if self._arrays is not None:
+            self._arrays._own()
+            self._arrays.bvalues[self._index] = AtomArrays.number(bvalue)
 
 
     @property
@@ -1132,6 +1736,7 @@ class Atom:
 
         :rtype: ``set```"""
 
+        if self._bonded_atoms is None: self._bonded_atoms = set()
         return self._bonded_atoms
 
 
@@ -1225,7 +1830,7 @@ class Atom:
         :rtype: ``Atom``"""
 
         return Atom(
-         self._element, *self._location, id or self._id, self._name,
+         self._element, *self._location.tolist(), id or self._id, self._name,
          self._charge, self._bvalue, self._anisotropy
         )
     
@@ -1269,7 +1874,7 @@ class Atom:
         :rtype: ``set``"""
 
         if self.model:
-            atoms =  self.model.atoms_in_sphere(
+            atoms = self.model.atoms_in_sphere(
              self.location, cutoff, *args, **kwargs
             )
             try:
@@ -1338,8 +1943,7 @@ class Atom:
             _,_,_ = dx
             vector = dx
         except TypeError: vector = (dx, dy, dz)
-        Atom.translate_atoms(vector, self)
-        self.trim(trim)
+        Atom.translate_atoms(vector, self, trim=trim)
 
 
     def transform(self, matrix, trim=12):
@@ -1353,8 +1957,7 @@ class Atom:
         after transforming - the default is 12 decimal places but this can be\
         set to ``None`` if no rounding is to be done."""
 
-        Atom.transform_atoms(matrix, self)
-        self.trim(trim)
+        Atom.transform_atoms(matrix, self, trim=trim)
 
 
     def rotate(self, angle, axis, trim=12):
@@ -1367,8 +1970,20 @@ class Atom:
         after rotating - the default is 12 decimal places but this can be\
         set to ``None`` if no rounding is to be done."""
 
-        Atom.rotate_atoms(angle, axis, self)
-        self.trim(trim)
+        Atom.rotate_atoms(angle, axis, self, trim=trim)
+
+
+    def apply(self, *operations, trim=12):
+        r"""Moves the atom by a series of operations, in the order given - see
+        :py:meth:`.transformation_matrix`.
+
+        :param \*operations: the matrices and named operations to apply.
+        :param int trim: the places to round the atom's coordinates to after
+         moving (12 by default), or ``None`` for no rounding."""
+
+        Atom.transform_atoms(
+         Atom.transformation_matrix(*operations), self, trim=trim
+        )
 
 
     def move_to(self, x, y, z):
@@ -1378,7 +1993,9 @@ class Atom:
         :param number y: The atom's new y coordinate.
         :param number z: The atom's new z coordinate."""
 
+        if self._arrays is not None: self._arrays._own()
         self._location[0], self._location[1], self._location[2] = x, y, z
+        if self._arrays is not None: self._arrays.moved()
 
 
     def trim(self, places):
@@ -1389,7 +2006,9 @@ class Atom:
         ``None``, no rounding will be done."""
 
         if places is not None:
-            self._location = np.round(self._location, places)
+            if self._arrays is not None: self._arrays._own()
+            np.round(self._location, places, out=self._location)
+            if self._arrays is not None: self._arrays.moved()
 
 
     def bond(self, other):
@@ -1397,5 +2016,402 @@ class Atom:
 
         :param Atom other: the other atom to bond to."""
         
-        self._bonded_atoms.add(other)
-        other._bonded_atoms.add(self)
+        self.bonded_atoms.add(other)
+        other.bonded_atoms.add(self)
+
+
+
+class AtomArrays:
+    """A store of the coordinates, elements, masses, B-values and charges of
+    some atoms, held as parallel NumPy arrays so that calculations and
+    movements involving all of them can be done in single vectorised
+    operations rather than atom by atom.
+
+    Each :py:class:`.Model` keeps one of these for all of its atoms. When a
+    store is attached to its atoms, each atom's location becomes a row of the
+    store's ``coordinates`` array, and moving the atom moves that row (and vice
+    versa). An atom can only be attached to one store at a time - attaching it
+    to a new one marks the old one as stale.
+
+    :param \*atoms: The atoms to store.
+    :param bool attach: If ``False``, the atoms' values are copied into the\
+    store but the atoms are otherwise left alone, and movements of the store\
+    are copied back to them."""
+
+    from atomium import data as __data
+
+    def __init__(self, *atoms, attach=True):
+        self.atoms, self.attached, self.stale = atoms, attach, False
+        self._grid, self._shared, self.moves = None, False, 0
+        self.coordinates = np.array(
+         [atom._location for atom in atoms], dtype=float
+        ).reshape(len(atoms), 3)
+        self.elements = np.array([atom._element or "" for atom in atoms])
+        table = self.__data.PERIODIC_TABLE
+        elements, inverse = np.unique(self.elements, return_inverse=True)
+        self.masses = np.array(
+         [table.get(element.upper(), 0) for element in elements.tolist()],
+         dtype=float
+        )[inverse]
+        self.bvalues = np.array(
+         [self.number(atom._bvalue) for atom in atoms], dtype=float
+        )
+        self.charges = np.array(
+         [self.number(atom._charge) for atom in atoms], dtype=float
+        )
+        if attach:
+            for index, atom in enumerate(atoms):
+                if atom._arrays is not None and atom._arrays is not self:
+                    atom._arrays.stale = True
+                atom._location = self.coordinates[index]
+                atom._arrays, atom._index = self, index
+
+
+    def __repr__(self):
+        return "<AtomArrays ({} atom{})>".format(
+         len(self.atoms), "" if len(self.atoms) == 1 else "s"
+        )
+
+
+    def __len__(self):
+        return len(self.atoms)
+
+
+    @staticmethod
+    def number(value):
+        """Converts an atom property to a value that can be stored in a float
+        array - ``None`` becomes ``nan``.
+
+        :param value: the value to convert.
+        :rtype: ``float``"""
+
+        return np.nan if value is None else value
+
+
+    @staticmethod
+    def of(atoms):
+        """Gets a store through which some atoms can be worked with in bulk,
+        along with the rows of that store which are those atoms.
+
+        If the atoms are all attached to the same up-to-date store, that store
+        is used. Otherwise a detached store of just those atoms is made.
+
+        :param atoms: the atoms to get a store for.
+        :rtype: ``tuple``"""
+
+        atoms = tuple(atoms)
+        arrays, rows = AtomArrays.attached(atoms)
+        if arrays is not None: return arrays, rows
+        return AtomArrays(*atoms, attach=False), slice(None)
+
+
+    @staticmethod
+    def attached(atoms):
+        """Gets the up-to-date store that some atoms are all attached to, and
+        the rows of that store which are those atoms - or two ``None`` values
+        if there isn't one.
+
+        :param tuple atoms: the atoms to look at.
+        :rtype: ``tuple``"""
+
+        arrays = atoms[0]._arrays if atoms else None
+        if arrays is not None and not arrays.stale and all(
+         atom._arrays is arrays for atom in atoms
+        ):
+            return arrays, np.fromiter(
+             (atom._index for atom in atoms), dtype=int, count=len(atoms)
+            )
+        return None, None
+
+
+    def copy(self, atoms, rows=slice(None)):
+        """Makes a store for copies of some of this store's atoms, and attaches
+        the copies to it.
+
+        If the rows are a single run, the new store's arrays are views of this
+        store's arrays rather than copies of them, and both stores are marked
+        as shared - whichever is changed first takes its own copy of its arrays
+        before changing them, so that changes never show up in the other.
+
+        :param atoms: the new atoms, one for each row.
+        :param rows: the rows the new atoms are copies of (by default all of\
+        them).
+        :rtype: ``AtomArrays``"""
+
+        if not isinstance(rows, slice) and len(rows) and (
+         rows[-1] - rows[0] == len(rows) - 1
+        ) and (np.diff(rows) == 1).all():
+            rows = slice(int(rows[0]), int(rows[-1]) + 1)
+        copy = AtomArrays.__new__(AtomArrays)
+        copy.atoms, copy.attached, copy.stale = tuple(atoms), True, False
+        copy._grid, copy._shared = None, isinstance(rows, slice)
+        copy.moves = 0
+        self._shared = self._shared or copy._shared
+        for name in ("coordinates", "elements", "masses", "bvalues", "charges"):
+            setattr(copy, name, getattr(self, name)[rows])
+        for index, (atom, location) in enumerate(
+         zip(copy.atoms, copy.coordinates)
+        ):
+            atom._location, atom._arrays, atom._index = location, copy, index
+        return copy
+
+
+    def translate(self, vector, rows=slice(None), trim=None):
+        """Translates some rows of the store by a vector.
+
+        :param vector: the three values representing the delta position.
+        :param rows: the rows to move (by default all of them).
+        :param int trim: if given, the places to round the moved rows to."""
+
+        coordinates = self.coordinates[rows] + np.array(vector, dtype=float)
+        self._set(rows, coordinates, trim)
+
+
+    def transform(self, matrix, rows=slice(None), trim=None):
+        """Transforms some rows of the store using a matrix - either a 3x3
+        matrix, or a 4x4 homogeneous matrix whose last column is a translation.
+        The rows are moved with a single matrix multiplication, and rounded
+        (if at all) once afterwards.
+
+        :param matrix: the transformation matrix.
+        :param rows: the rows to move (by default all of them).
+        :param int trim: if given, the places to round the moved rows to."""
+
+        matrix = np.array(matrix, dtype=float)
+        coordinates = self.coordinates[rows] @ matrix[:3, :3].T
+        if matrix.shape == (4, 4): coordinates += matrix[:3, 3]
+        self._set(rows, coordinates, trim)
+
+
+    def trim(self, places, rows=slice(None)):
+        """Rounds some rows of the store to a given number of decimal places.
+
+        :param int places: the number of places to round to.
+        :param rows: the rows to round (by default all of them)."""
+
+        self._own()
+        self.coordinates[rows] = np.round(self.coordinates[rows], places)
+        self.moved()
+
+
+    def _set(self, rows, coordinates, trim=None):
+        """Puts new coordinates into some rows of the store, rounding them
+        first if needed.
+
+        :param rows: the rows to update.
+        :param numpy.ndarray coordinates: the new coordinates.
+        :param int trim: if given, the places to round the coordinates to."""
+
+        if trim is not None: np.round(coordinates, trim, out=coordinates)
+        self._own()
+        self.coordinates[rows] = coordinates
+        self.moved()
+
+
+    def _own(self):
+        """Makes sure the store's arrays are its own, and not shared with a copy
+        of it (or an original), before they are changed. The attached atoms'
+        locations are moved over to the new coordinates array."""
+
+        if self._shared:
+            for name in (
+             "coordinates", "elements", "masses", "bvalues", "charges"
+            ):
+                setattr(self, name, getattr(self, name).copy())
+            if self.attached:
+                for atom, location in zip(self.atoms, self.coordinates):
+                    if atom._arrays is self: atom._location = location
+            self._shared = False
+
+
+    def moved(self):
+        """Called whenever the store's coordinates change. It discards the
+        spatial index, and if the store is detached from its atoms, copies its
+        coordinates back to them.
+
+        The store keeps a count of its movements, so that anything calculated
+        from its coordinates can tell if it is out of date."""
+
+        self.moves += 1
+        self._grid = None
+        if not self.attached:
+            for atom, location in zip(self.atoms, self.coordinates):
+                if atom._arrays is not None: atom._arrays._own()
+                atom._location[:] = location
+                if atom._arrays is not None: atom._arrays.moved()
+
+
+    def grid(self, cell_size=None):
+        """Gets an :py:class:`.AtomGrid` spatial index of the store's
+        coordinates. It is made the first time it is needed, and again after
+        the coordinates change or if a different cell size is asked for.
+
+        :param float cell_size: the width of the grid's cells, if not 5.
+        :rtype: ``AtomGrid``"""
+
+        if self._grid is None or (
+         cell_size is not None and cell_size != self._grid.cell_size
+        ):
+            self._grid = AtomGrid(self.coordinates, cell_size or 5)
+        return self._grid
+
+
+
+class AtomGrid:
+    """A spatial index of some coordinates, in the form of a cell list. Space
+    is divided into cubic cells and the coordinates are sorted by the cell they
+    are in, so that a search around a location only has to measure distances
+    to the coordinates in the cells near it.
+
+    Searches are vectorised - any number of locations can be searched around
+    in one call.
+
+    :param coordinates: the (N, 3) array of coordinates to index.
+    :param float cell_size: the width of each cell."""
+
+    def __init__(self, coordinates, cell_size=5):
+        self.coordinates, self.cell_size = coordinates, cell_size
+        if len(coordinates):
+            self.origin = coordinates.min(axis=0)
+            cells = self.cells(coordinates)
+            self.shape = cells.max(axis=0) + 1
+        else:
+            self.origin = np.zeros(3)
+            cells = np.zeros((0, 3), dtype=int)
+            self.shape = np.ones(3, dtype=int)
+        keys = self.keys(cells)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+
+    def __repr__(self):
+        return "<AtomGrid ({} cells of {})>".format(
+         "x".join(str(n) for n in self.shape), self.cell_size
+        )
+
+
+    def cells(self, locations):
+        """Works out which cell each of some locations is in.
+
+        :param locations: an (N, 3) array of locations.
+        :rtype: ``numpy.ndarray``"""
+
+        return np.floor(
+         (locations - self.origin) / self.cell_size
+        ).astype(np.int64)
+
+
+    def keys(self, cells):
+        """Turns cell positions into single integer keys.
+
+        :param cells: an (N, 3) array of cell positions.
+        :rtype: ``numpy.ndarray``"""
+
+        return (cells[:, 0] * self.shape[1] + cells[:, 1]) * self.shape[2] + (
+         cells[:, 2]
+        )
+
+
+    def pairs(self, locations, radius):
+        """Finds every pairing of a location with an indexed coordinate that is
+        within a given distance of it.
+
+        Three arrays are returned - the index of the location in each pair, the
+        index of the coordinate in each pair, and the distance between them.
+
+        :param locations: the locations to search around, as an (N, 3) array\
+        or a list of coordinates.
+        :param float radius: the distance to search within.
+        :rtype: ``tuple``"""
+
+        locations = np.array(locations, dtype=float).reshape(-1, 3)
+        found = [[np.zeros(0, dtype=int)] * 2 + [np.zeros(0)]]
+        for location_indices, positions in self.candidates(locations, radius):
+            indices = self.order[positions]
+            distances = np.linalg.norm(
+             self.coordinates[indices] - locations[location_indices], axis=1
+            )
+            within = distances <= radius
+            found.append((
+             location_indices[within], indices[within], distances[within]
+            ))
+        return tuple(np.concatenate(arrays) for arrays in zip(*found))
+
+
+    def candidates(self, locations, radius):
+        """A generator which yields, in batches, the coordinates which are in
+        cells close enough to some locations that they might be within a given
+        distance of them. Each batch is an array of location indices and an
+        array of positions within the sorted coordinates.
+
+        If there are only a few locations they are searched around one at a
+        time, otherwise each neighbouring cell offset is checked for all the
+        locations at once.
+
+        :param locations: an (N, 3) array of locations.
+        :param float radius: the distance to search within.
+        :rtype: ``tuple``"""
+
+        reach = int(math.ceil(radius / self.cell_size))
+        centres = self.cells(locations)
+        if len(locations) <= (2 * reach + 1) ** 3:
+            for index, centre in enumerate(centres):
+                low = np.maximum(centre - reach, 0)
+                high = np.minimum(centre + reach, self.shape - 1)
+                if np.any(low > high): continue
+                x, y, z = [np.arange(l, h + 1) for l, h in zip(low, high)]
+                keys = ((x[:, None, None] * self.shape[1] + y[None, :, None])
+                 * self.shape[2] + z[None, None, :]).ravel()
+                positions = self.lookup(keys)
+                yield np.full(len(positions), index), positions
+        else:
+            offsets = range(-reach, reach + 1)
+            for offset in itertools.product(offsets, repeat=3):
+                cells = centres + offset
+                valid = np.nonzero(np.all(
+                 (cells >= 0) & (cells < self.shape), axis=1
+                ))[0]
+                positions, counts = self.lookup(self.keys(cells[valid]), True)
+                yield np.repeat(valid, counts), positions
+
+
+    def lookup(self, keys, counts=False):
+        """Gets the positions, within the sorted coordinates, of all the
+        coordinates in some cells.
+
+        :param keys: the keys of the cells to look in.
+        :param bool counts: if ``True``, the number of coordinates found in\
+        each cell will be returned too.
+        :rtype: ``numpy.ndarray``"""
+
+        starts = np.searchsorted(self.sorted_keys, keys, "left")
+        cell_counts = np.searchsorted(self.sorted_keys, keys, "right") - starts
+        total = cell_counts.sum()
+        offsets = starts - np.cumsum(cell_counts) + cell_counts
+        positions = np.repeat(offsets, cell_counts) + np.arange(total)
+        return (positions, cell_counts) if counts else positions
+
+
+    def nearest(self, location, k=1):
+        """Finds the k indexed coordinates nearest to some location. Two arrays
+        are returned - their indices, and their distances from the location,
+        closest first.
+
+        :param location: the location to search around.
+        :param int k: the number of coordinates to find.
+        :rtype: ``tuple``"""
+
+        location = np.array(location, dtype=float)
+        k = min(k, len(self.coordinates))
+        if k < 1: return np.zeros(0, dtype=int), np.zeros(0)
+        furthest = np.linalg.norm(np.maximum(
+         np.abs(location - self.coordinates.min(axis=0)),
+         np.abs(location - self.coordinates.max(axis=0))
+        ))
+        radius = self.cell_size
+        while True:
+            _, indices, distances = self.pairs([location], radius)
+            if len(indices) >= k or radius > furthest: break
+            radius *= 2
+        order = np.argsort(distances, kind="stable")[:k]
+        return indices[order], distances[order]
@@ -6,8 +6,10 @@ import paramiko
 from requests import get
 from .mmcif import mmcif_string_to_mmcif_dict, mmcif_dict_to_data_dict
 from .mmtf import mmtf_bytes_to_mmtf_dict, mmtf_dict_to_data_dict
+from .mmtf import mmtf_dict_to_file
 from .pdb import pdb_string_to_pdb_dict, pdb_dict_to_data_dict
-from .data import data_dict_to_file
+from .pdb import pdb_lines_to_model_dicts
+from .data import data_dict_to_file, model_dict_to_model
 
 def open(path, *args, **kwargs):
     """Opens a file at a given path, works out what filetype it is, and parses
@@ -25,6 +27,11 @@ def open(path, *args, **kwargs):
     :param str path: the location of the file.
     :param bool file_dict: if ``True``, parsing will stop at the file ``dict``.
     :param bool data_dict: if ``True``, parsing will stop at the data ``dict``.
+    :param bool columnar: if ``True``, .cif file ``dict`` tables will be\
+    columns rather than rows.
+    :param set categories: if given, only these .cif categories will be read.
+    :param bool lazy: if ``True``, .cif file ``dict`` tables will only be\
+    read when accessed.
     :rtype: ``File``"""
 
     if str(path)[-3:] == ".gz":
@@ -41,6 +48,37 @@ def open(path, *args, **kwargs):
         return parse_string(filestring, path, *args, **kwargs)
 
 
+def iter_models(path):
+    """Opens a file and yields its models one at a time, as fully processed
+    :py:class:`.Model` objects.
+
+    For .pdb files the file is read incrementally, so only one model's records
+    are ever held in memory - which makes it possible to go through NMR
+    ensembles and trajectories with thousands of frames:
+
+        >>> for model in atomium.iter_models("trajectory.pdb"):
+        ...     print(model.center_of_mass)
+
+    Other file types are opened in full and their models then yielded.
+
+    If the file extension is .gz, the file will be unzipped as it is read.
+
+    :param str path: the location of the file.
+    :rtype: ``generator``"""
+
+    path = str(path)
+    if path[-3:] == ".gz" and path[:-3].endswith(".pdb"):
+        with gzip.open(path, "rt") as f:
+            for model_dict in pdb_lines_to_model_dicts(f):
+                yield model_dict_to_model(model_dict)
+    elif path.endswith(".pdb"):
+        with builtins.open(path) as f:
+            for model_dict in pdb_lines_to_model_dicts(f):
+                yield model_dict_to_model(model_dict)
+    else:
+        yield from open(path).models
+
+
 def fetch(code, *args, **kwargs):
     """Fetches a file from a remote location via HTTP.
 
@@ -104,7 +142,7 @@ def fetch_over_ssh(hostname, username, path, *args, password=None, **kwargs):
     return parse_string(filestring, path, *args, **kwargs)
 
 
-def parse_string(filestring, path, file_dict=False, data_dict=False):
+def parse_string(filestring, path, file_dict=False, data_dict=False, **kwargs):
     """Takes a filestring and parses it in the appropriate way. You must provide
     the string to parse itself, and some other string that ends in either .cif,
     .mmtf, or .cif - that will determine how the file is parsed.
@@ -112,6 +150,16 @@ def parse_string(filestring, path, file_dict=False, data_dict=False):
     (If this cannot be inferred from the path string, atomium will guess based
     on the filestring contents.)
 
+    Any other keyword arguments are passed to the function which creates the
+    file ``dict`` - for example ``columnar=True`` for .cif files. The .cif
+    options ``columnar``, ``categories`` and ``lazy`` are ignored for .pdb and
+    .mmtf files.
+
+    When parsing goes beyond the file ``dict``, .cif files are always read into
+    columnar form, as the data ``dict`` can be made from that directly.
+
+    .mmtf files are turned into models directly, without a data ``dict``.
+
     :param str filestring: the contents of some file.
     :param str path: the filename of the file of origin.
     :param bool file_dict: if ``True``, parsing will stop at the file ``dict``.
@@ -119,7 +167,14 @@ def parse_string(filestring, path, file_dict=False, data_dict=False):
     :rtype: ``File``"""
 
     file_func, data_func = get_parse_functions(filestring, path)
-    parsed = file_func(filestring)
+    if file_func is not mmcif_string_to_mmcif_dict:
+        for option in ("columnar", "categories", "lazy"):
+            kwargs.pop(option, None)
+    elif not file_dict:
+        kwargs["columnar"] = True
+    parsed = file_func(filestring, **kwargs)
+    if not file_dict and not data_dict and data_func is mmtf_dict_to_data_dict:
+        return mmtf_dict_to_file(parsed)
     if not file_dict:
         parsed = data_func(parsed)
         if not data_dict:
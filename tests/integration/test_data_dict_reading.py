@@ -436,4 +436,29 @@ class ModelDictTests(DataDictTest):
             self.assertEqual(len(d["models"][0]["non-polymer"]), 0)
             self.assertEqual(len(d["models"][0]["water"]), 140)
             for water in d["models"][0]["water"].values():
-                self.assertEqual(water["name"], "DOD")
\ No newline at end of file
+                self.assertEqual(water["name"], "DOD")
+
+    def test_pdb_data_dict_atom_fields(self):
+        from atomium.utilities import parse_string
+        d = parse_string("\n".join([
+         "ATOM      1  N   VAL A  11       3.696  33.898  63.219  1.00 21.50           N",
+         "ATOM      2  CA AVAL A  11       3.198  33.218  61.983  0.60 19.76           C1-",
+         "ATOM      3  CA BVAL A  11       3.198  33.218  61.983",
+         "TER       4      VAL A  11",
+         "HETATM    5 MG    MG A 101     -10.5     1.2     2.0   1.00 30.00          MG+2",
+        ]), "x.pdb", data_dict=True)["models"][0]
+        atoms = d["polymer"]["A"]["residues"]["A.11"]["atoms"]
+        self.assertEqual(atoms[1], {
+         "element": "N", "name": "N", "x": 3.696, "y": 33.898, "z": 63.219,
+         "bvalue": 21.5, "charge": 0, "occupancy": 1, "alt_loc": None,
+         "anisotropy": [0, 0, 0, 0, 0, 0]
+        })
+        self.assertEqual(atoms[2]["charge"], -1)
+        self.assertEqual(atoms[2]["alt_loc"], "A")
+        self.assertEqual(atoms[3]["occupancy"], 1)
+        self.assertIsNone(atoms[3]["bvalue"])
+        self.assertIsNone(atoms[3]["element"])
+        ion = d["non-polymer"]["A.101"]
+        self.assertEqual(ion["name"], "MG")
+        self.assertEqual(ion["atoms"][5]["x"], -10.5)
+        self.assertEqual(ion["atoms"][5]["charge"], 2)
@@ -27,6 +27,94 @@ class MmcifFileDictReadingTests(TestCase):
         self.assertTrue(d["citation"][0]["title"].endswith("decarboxylase."))
 
 
+    def test_1lol_columnar_file_dict(self):
+        d = atomium.open(
+         "tests/integration/files/1lol.cif", file_dict=True, columnar=True
+        )
+        self.assertEqual(d["entry"], {"id": ["1LOL"]})
+        self.assertEqual(d["audit_author"], {
+         "name": ["Wu, N.", "Pai, E.F."], "pdbx_ordinal": ["1", "2"]
+        })
+        self.assertEqual(len(d["atom_site"]["id"]), 3431)
+        self.assertEqual(d["atom_site"]["Cartn_x"][:3], ["3.696", "3.198", "3.914"])
+        data_dict = atomium.mmcif.mmcif_dict_to_data_dict(d)
+        self.assertEqual(data_dict["description"]["authors"], ["Wu, N.", "Pai, E.F."])
+        self.assertEqual(
+         data_dict["models"][0]["polymer"]["A"]["residues"]["A.11"]["atoms"][1]["x"], 3.696
+        )
+        for ext in ("pdb", "mmtf"):
+            path = "tests/integration/files/1lol." + ext
+            self.assertEqual(
+             atomium.open(path, file_dict=True, columnar=True).keys(),
+             atomium.open(path, file_dict=True).keys()
+            )
+            f = atomium.open(path, columnar=True)
+            self.assertEqual(len(f.model.atoms()), 3431)
+
+
+    def test_1lol_selected_categories(self):
+        d = atomium.open(
+         "tests/integration/files/1lol.cif", file_dict=True,
+         categories={"entry", "struct", "atom_site"}
+        )
+        self.assertEqual(set(d.keys()), {"entry", "struct", "atom_site"})
+        self.assertEqual(d["entry"], [{"id": "1LOL"}])
+        self.assertEqual(len(d["atom_site"]), 3431)
+        f = atomium.open(
+         "tests/integration/files/1lol.cif", categories={"entry", "atom_site"}
+        )
+        self.assertEqual(f.code, "1LOL")
+        self.assertIsNone(f.title)
+        self.assertEqual(len(f.model.chains()), 2)
+        self.assertEqual(len(f.model.ligands()), 4)
+        self.assertEqual(len(f.model.waters()), 180)
+        for ext in ("pdb", "mmtf"):
+            f = atomium.open(
+             "tests/integration/files/1lol." + ext, categories={"entry"}
+            )
+            self.assertEqual(f.code, "1LOL")
+            self.assertEqual(len(f.model.atoms()), 3431)
+
+
+    def test_1lol_lazy_file_dict(self):
+        d = atomium.open("tests/integration/files/1lol.cif", file_dict=True)
+        lazy = atomium.open(
+         "tests/integration/files/1lol.cif", file_dict=True, lazy=True
+        )
+        self.assertEqual(list(lazy.keys()), list(d.keys()))
+        self.assertEqual(lazy._tables, {})
+        self.assertEqual(lazy["struct"], d["struct"])
+        self.assertEqual(list(lazy._tables.keys()), ["struct"])
+        self.assertNotIn("xxx", lazy)
+        self.assertIsNone(lazy.get("xxx"))
+        self.assertEqual(lazy, d)
+        for ext in ("pdb", "mmtf"):
+            path = "tests/integration/files/1lol." + ext
+            self.assertEqual(
+             atomium.open(path, file_dict=True, lazy=True).keys(),
+             atomium.open(path, file_dict=True).keys()
+            )
+            f = atomium.open(path, lazy=True)
+            self.assertEqual(len(f.model.atoms()), 3431)
+
+
+    def test_quoted_values_and_text_fields(self):
+        d = atomium.mmcif.mmcif_string_to_mmcif_dict("\n".join([
+         "data_TEST", "#", "_struct.title", ";Line one", "line 'two'", ";",
+         "_struct.pdbx_descriptor 'it's here' # comment", "#", "loop_",
+         "_atom_site.id", "_atom_site.label_atom_id", "_atom_site.auth_comp_id",
+         "1 \"O5'\" DA", "2 C5' 'D A'", "3", "N1", ";DA", ";", "#"
+        ]))
+        self.assertEqual(d["struct"], [
+         {"title": "Line one line 'two'", "pdbx_descriptor": "it's here"}
+        ])
+        self.assertEqual(d["atom_site"], [
+         {"id": "1", "label_atom_id": "O5'", "auth_comp_id": "DA"},
+         {"id": "2", "label_atom_id": "C5'", "auth_comp_id": "D A"},
+         {"id": "3", "label_atom_id": "N1", "auth_comp_id": "DA"}
+        ])
+
+
 
 class MmtfFileDictReadingTests(TestCase):
 
@@ -38,19 +126,30 @@ class MmtfFileDictReadingTests(TestCase):
         self.assertAlmostEqual(d["resolution"], 1.9, delta=0.00005)
         self.assertEqual(d["numAtoms"], 3431)
         self.assertEqual(len(d["secStructList"]), 602)
-        self.assertEqual(d["secStructList"][:5], (7, 4, 4, 4, 3))
+        self.assertEqual(d["secStructList"][:5].tolist(), [7, 4, 4, 4, 3])
         self.assertEqual(len(d["bondAtomList"]), 828)
-        self.assertEqual(d["bondAtomList"][:6], (7, 2, 15, 9, 23, 17))
-        self.assertEqual(d["chainIdList"], list("ABCDEFGH"))
-        self.assertEqual(d["insCodeList"], [""] * 602)
-        self.assertEqual(d["sequenceIndexList"][:6], [10, 11, 12, 13, 14, 15])
-        self.assertEqual(d["occupancyList"], [1.0] * 3431)
-        self.assertEqual(d["xCoordList"][:3], [3.696, 3.198, 3.914])
-        self.assertEqual(d["bFactorList"][:3], [21.5, 19.76, 19.29])
+        self.assertEqual(d["bondAtomList"][:6].tolist(), [7, 2, 15, 9, 23, 17])
+        self.assertEqual(d["chainIdList"].tolist(), list("ABCDEFGH"))
+        self.assertEqual(d["insCodeList"].tolist(), [""] * 602)
+        self.assertEqual(d["sequenceIndexList"][:6].tolist(), [10, 11, 12, 13, 14, 15])
+        self.assertEqual(d["occupancyList"].tolist(), [1.0] * 3431)
+        self.assertEqual(d["xCoordList"][:3].tolist(), [3.696, 3.198, 3.914])
+        self.assertEqual(d["bFactorList"][:3].tolist(), [21.5, 19.76, 19.29])
         self.assertEqual(d["groupList"][0]["groupName"], "ASN")
         self.assertEqual(d["groupList"][0]["atomNameList"][:3], ["N", "CA", "C"])
 
 
+    def test_1lol_file_dict_fields_decoded_lazily(self):
+        d = atomium.open("tests/integration/files/1lol.mmtf", file_dict=True)
+        self.assertEqual(len(d), 39)
+        self.assertIn("bondAtomList", d)
+        self.assertEqual(d._decoded, {})
+        self.assertEqual(d["structureId"], "1LOL")
+        self.assertEqual(list(d._decoded.keys()), ["structureId"])
+        self.assertIs(d["xCoordList"], d["xCoordList"])
+        self.assertIsNone(d.get("xxx"))
+
+
     def test_1igt_file_dict(self):
         d = atomium.open("tests/integration/files/1igt.mmtf", file_dict=True)
         self.assertEqual(d["mmtfVersion"], "1.0.0")
@@ -1,5 +1,7 @@
 from datetime import date
+import gc
 import math
+import weakref
 import atomium
 from unittest import TestCase
 
@@ -289,6 +291,7 @@ class DeNovoStructureTests(TestCase):
         self.assertFalse(res2.strand)
         self.assertFalse(res3.helix)
         self.assertTrue(res3.strand)
+        self.assertEqual(chain1.secondary_structure, "HHE")
 
         # Check chain magic methods
         self.assertEqual(chain1.length, 3)
@@ -323,6 +326,12 @@ class DeNovoStructureTests(TestCase):
         self.assertIs(chain2[2].previous, chain2[1])
         self.assertEqual(chain2.helices, ((chain2[0], chain2[1]),))
         self.assertEqual(chain2.strands, ((chain2[2],),))
+        self.assertEqual(chain2.secondary_structure, "HHE")
+        self.assertTrue(chain2[2].strand)
+        chain2.strands = []
+        self.assertFalse(chain2[2].strand)
+        self.assertEqual(chain2.secondary_structure, "HH-")
+        chain2.strands = [(chain2[2],)]
 
         # Move chain into place
         chain2.rotate(math.pi, "x")
@@ -642,6 +651,24 @@ class FileReadingTests(TestCase):
             self.assertEqual(len(all_atoms), 18270)
 
 
+    def test_5xme_model_iteration(self):
+        x_values = [
+         33.969, 34.064, 37.369, 36.023, 35.245,
+         35.835, 37.525, 35.062, 36.244, 37.677
+        ]
+        for e in ["cif", "mmtf", "pdb"]:
+            models = atomium.iter_models("tests/integration/files/5xme." + e)
+            self.assertFalse(isinstance(models, list))
+            count = 0
+            for x, model in zip(x_values, models):
+                self.assertEqual(len(model.atoms()), 1827)
+                self.assertEqual(model.chain().sequence[:3], "MHH")
+                atom = model.chain()[0].atom(name="N")
+                self.assertEqual(atom.location[0], x)
+                count += 1
+            self.assertEqual(count, 10)
+
+
     def test_1cbn(self):
         for e in ["cif", "mmtf", "pdb"]:
             f = atomium.open("tests/integration/files/1cbn." + e)
@@ -655,6 +682,499 @@ class FileReadingTests(TestCase):
                     self.assertEqual(len(residue.atoms(name=name)), 1)
 
 
+    def test_mmtf_models_match_data_dict_models(self):
+        from atomium.data import data_dict_to_file
+        for code in ["1igt", "1lol", "4opj"]:
+            path = "tests/integration/files/{}.mmtf".format(code)
+            model = atomium.open(path).model
+            expected = data_dict_to_file(
+             atomium.open(path, data_dict=True), "mmtf"
+            ).model
+            for chain in expected.chains():
+                other = model.chain(chain.id)
+                self.assertEqual(
+                 [r.id for r in other.residues()], [r.id for r in chain.residues()]
+                )
+                self.assertEqual(other.internal_id, chain.internal_id)
+                self.assertEqual(other.sequence, chain.sequence)
+                self.assertEqual(
+                 [[r.id for r in h] for h in other.helices],
+                 [[r.id for r in h] for h in chain.helices]
+                )
+                self.assertIs(other[1].previous, other[0])
+            ligands = {l.id: l for l in model.ligands() | model.waters()}
+            for ligand in expected.ligands() | expected.waters():
+                other = ligands[ligand.id]
+                self.assertEqual(other.name, ligand.name)
+                self.assertIs(other.chain, model.chain(ligand.chain.id))
+            self.assertEqual(
+             sorted((a.id, a.name, tuple(a.location), a.bvalue) for a in model.atoms()),
+             sorted((a.id, a.name, tuple(a.location), a.bvalue) for a in expected.atoms())
+            )
+
+
+    def test_model_coordinate_store(self):
+        model = atomium.open("tests/integration/files/1lol.cif").model
+        atoms = model.atoms()
+        arrays, rows = model._atom_arrays()
+        self.assertEqual(arrays.coordinates.shape, (len(atoms), 3))
+        for atom in atoms:
+            self.assertEqual(atom.location, tuple(arrays.coordinates[atom._index]))
+            self.assertEqual(atom.bvalue, arrays.bvalues[atom._index])
+        atom = model.atom(1)
+        atom.move_to(1, 2, 3)
+        self.assertEqual(tuple(arrays.coordinates[atom._index]), (1, 2, 3))
+        model.translate(10, 0, 0)
+        self.assertEqual(atom.location, (11, 2, 3))
+        model.chain("A").translate(-10, 0, 0)
+        self.assertEqual(atom.location, (1, 2, 3))
+        atom.bvalue = 99
+        self.assertEqual(arrays.bvalues[atom._index], 99)
+        self.assertIs(model._atom_arrays()[0], arrays)
+        com = model.center_of_mass
+        square_deviation = sum(a.distance_to(com) ** 2 for a in atoms)
+        self.assertAlmostEqual(
+         model.radius_of_gyration, (square_deviation / len(atoms)) ** 0.5,
+         delta=0.000001
+        )
+        other = atomium.structures.Model(*model.chains())
+        other.translate(1, 0, 0)
+        self.assertTrue(arrays.stale)
+        self.assertEqual(atom.location, (2, 2, 3))
+        self.assertIsNot(model._atom_arrays()[0], arrays)
+
+
+    def test_cached_structure_properties(self):
+        model = atomium.open("tests/integration/files/1lol.cif").model
+        residue = model.residue("A.42")
+        mass = sum(atom.mass for atom in residue.atoms())
+        self.assertAlmostEqual(residue.mass, mass, delta=0.000001)
+        self.assertIs(residue.mass, residue.mass)
+        formula = residue.formula
+        formula["C"] = 0
+        self.assertNotEqual(residue.formula["C"], 0)
+        com, rg = residue.center_of_mass, residue.radius_of_gyration
+        x, com[0] = com[0], 1000
+        self.assertEqual(residue.center_of_mass[0], x)
+        residue.translate(10, 0, 0)
+        self.assertAlmostEqual(residue.center_of_mass[0], x + 10, delta=0.001)
+        self.assertAlmostEqual(residue.radius_of_gyration, rg, delta=0.000001)
+        atom = residue.atom(name="CA")
+        atom.move_to(*(residue.center_of_mass + 50))
+        self.assertGreater(residue.radius_of_gyration, rg + 1)
+        model.translate(0, 0, 5)
+        self.assertAlmostEqual(
+         residue.center_of_mass[2], model.residue("A.42").center_of_mass[2],
+         delta=0.000001
+        )
+        waters = model.mass
+        model.dehydrate()
+        self.assertLess(model.mass, waters)
+        self.assertEqual(model.formula, sum(
+         [mol.formula for mol in model.molecules()], atomium.structures.Counter()
+        ))
+        other = atomium.open("tests/integration/files/1lol.cif").model
+        com = other.center_of_mass
+        cached = other._cache["center_of_mass"]
+        model.translate(1, 1, 1)
+        model.atom(1586).move_to(0, 0, 0)
+        self.assertEqual(other.center_of_mass.tolist(), com.tolist())
+        self.assertIs(other._cache["center_of_mass"], cached)
+        other.atom(1586).move_to(0, 0, 0)
+        self.assertNotEqual(other.center_of_mass.tolist(), com.tolist())
+        atom1 = atomium.Atom("C", 0, 0, 0, 1, "C1", 0, 0, [0] * 6)
+        atom2 = atomium.Atom("C", 2, 0, 0, 2, "C2", 0, 0, [0] * 6)
+        residue = atomium.Residue(atom1, atom2)
+        self.assertEqual(residue.center_of_mass.tolist(), [1, 0, 0])
+        atom2.move_to(4, 0, 0)
+        self.assertEqual(residue.center_of_mass.tolist(), [2, 0, 0])
+
+
+    def test_5xme_superposition(self):
+        models = atomium.open("tests/integration/files/5xme.pdb").models
+        matrix = atomium.Model.rmsd_matrix(*models)
+        self.assertEqual(matrix.shape, (10, 10))
+        self.assertTrue((matrix == matrix.T).all())
+        self.assertTrue((matrix.diagonal() == 0).all())
+        for i in range(3):
+            for j in range(3):
+                self.assertAlmostEqual(
+                 matrix[i, j], models[i].rmsd_with(models[j]), delta=0.000001
+                )
+        rmsd = models[1].rmsd_with(models[2])
+        pairing = models[1].pairing_with(models[2])
+        self.assertEqual(len(pairing), len(models[1].atoms()))
+        self.assertTrue(all(a1.id == a2.id for a1, a2 in pairing.items()))
+        matrix, vector = models[1].superpose(models[2])
+        self.assertEqual(matrix.shape, (3, 3))
+        for row in matrix:
+            self.assertAlmostEqual(sum(row ** 2), 1, delta=0.000001)
+        self.assertEqual(models[1].rmsd_with(models[2]), rmsd)
+        models[1].superpose(models[2], apply=True)
+        deviation = sum(
+         a1.distance_to(a2) ** 2 for a1, a2 in pairing.items()
+        ) / len(pairing)
+        self.assertLess(deviation ** 0.5, rmsd)
+        self.assertAlmostEqual(deviation ** 0.5, rmsd, delta=0.001)
+        matrix, vector = models[1].superpose(models[2])
+        for i in range(3):
+            self.assertAlmostEqual(vector[i], 0, delta=0.000001)
+            for j in range(3):
+                self.assertAlmostEqual(matrix[i, j], i == j, delta=0.000001)
+
+
+    def test_queries_follow_renames(self):
+        model = atomium.open("tests/integration/files/1lol.cif").model
+        his = model.atoms(element="C", het__name="HIS")
+        self.assertEqual(his, {
+         a for a in model.atoms() if a.element == "C" and a.het.name == "HIS"
+        })
+        residue = next(iter(his)).het
+        residue.name = "HIX"
+        self.assertEqual(
+         model.atoms(element="C", het__name="HIS"), his - residue.atoms()
+        )
+        atom = model.atom(name="CA", het__name="HIX")
+        atom.name = "CX"
+        self.assertEqual(model.atoms(name="CX"), {atom})
+
+
+    def test_query_values_are_not_kept(self):
+        model = atomium.open("tests/integration/files/1lol.cif").model
+        residue = model.residue("A.11")
+        self.assertEqual(model.atoms(het=residue), residue.atoms())
+        self.assertEqual(len(model.ligands(chain=model.chain("A"))), 2)
+        ref = weakref.ref(model)
+        del model, residue
+        gc.collect()
+        self.assertIsNone(ref())
+
+
+    def test_model_spatial_index(self):
+        model = atomium.open("tests/integration/files/1lol.cif").model
+        atom = model.atom(1586)
+        near = atom.nearby_atoms(4)
+        for cell_size in [1, 2.5, 10]:
+            model.optimise_distances(cell_size=cell_size)
+            self.assertEqual(atom.nearby_atoms(4), near)
+        self.assertEqual(model.nearest_atoms(atom.location, k=1), (atom,))
+        nearest = model.nearest_atoms(atom.location, k=4)
+        self.assertEqual(len(nearest), 4)
+        distances = [atom.distance_to(a) for a in nearest]
+        self.assertEqual(distances, sorted(distances))
+        self.assertTrue(set(nearest[1:]) < near)
+        locations = [atom.location, model.atom(905).location]
+        self.assertEqual(
+         model.atoms_in_spheres(locations, 4),
+         model.atoms_in_sphere(locations[0], 4) |
+         model.atoms_in_sphere(locations[1], 4)
+        )
+        residue = atom.het
+        self.assertEqual(
+         residue.nearby_atoms(3),
+         set.union(*[a.nearby_atoms(3) for a in residue.atoms()]) - residue.atoms()
+        )
+        model.translate(100, 0, 0)
+        self.assertEqual(atom.nearby_atoms(4), near)
+        self.assertEqual(model.atoms_in_sphere(locations[0], 4), set())
+        atom.move_to(1000, 1000, 1000)
+        self.assertEqual(atom.nearby_atoms(4), set())
+
+
+    def test_model_contacts(self):
+        model = atomium.open("tests/integration/files/1lol.cif").model
+        pairs, distances = model.contacts(3.5)
+        atoms = model.atom_arrays.atoms
+        self.assertEqual(pairs.shape, (len(distances), 2))
+        self.assertTrue((distances <= 3.5).all())
+        atom = model.atom(1586)
+        self.assertEqual(
+         {atoms[j if atoms[i] is atom else i] for i, j in pairs
+          if atom in (atoms[i], atoms[j])}, atom.nearby_atoms(3.5)
+        )
+        hets = model.contacts(4, level="het")
+        residue = model.residue("A.42")
+        self.assertEqual(
+         {b if a is residue else a for a, b in hets if residue in (a, b)},
+         residue.nearby_hets(4)
+        )
+        chain_a, chain_b = model.chain("A"), model.chain("B")
+        self.assertEqual(
+         [set(pair) for pair in model.contacts(5, level="chain")],
+         [{chain_a, chain_b}]
+        )
+        ligand = model.ligand("A.5001")
+        contacts = model.contacts(4, between=(chain_a, ligand), level="het")
+        self.assertEqual(
+         set(contacts), {(r, ligand) for r in ligand.nearby_hets(4, ligands=False)}
+        )
+        for (residue, _), distance in contacts.items():
+            self.assertAlmostEqual(min(
+             a1.distance_to(a2) for a1 in residue.atoms() for a2 in ligand.atoms()
+            ), distance, delta=0.000001)
+        with self.assertRaises(ValueError):
+            model.contacts(4, level="residue")
+
+
+    def test_structure_aggregates(self):
+        model = atomium.open("tests/integration/files/1lol.cif").model
+        atoms, chain = model.atoms(), model.chain("A")
+        self.assertIs(model._all_atoms(), model._all_atoms())
+        self.assertEqual(len(atoms), 3431)
+        self.assertEqual(model.atoms(), atoms)
+        self.assertEqual(chain.atoms(), {
+         a for res in chain.residues() for a in res.atoms()
+        })
+        atom = chain.atom(name="CA")
+        self.assertIn(atom, chain)
+        self.assertIn(atom, model)
+        self.assertIn(atom.het, chain)
+        self.assertNotIn(atom, model.chain("B"))
+        self.assertIn(atom.copy(), atom.het)
+        other = atomium.open("tests/integration/files/1lol.cif").model
+        self.assertEqual(other.chain("A").residues()[0], chain.residues()[0])
+        self.assertIn(other.chain("A").residues()[0], chain)
+        self.assertNotIn(other.chain("A").residues()[0], model)
+        self.assertNotIn(other.chain("A").atom(name="CA"), model)
+        self.assertNotIn(other.chain("A"), model)
+        residues = chain.residues()
+        chain._residues = atomium.base.StructureSet(*residues[:10])
+        self.assertEqual(chain.atoms(), {
+         a for res in residues[:10] for a in res.atoms()
+        })
+        self.assertNotIn(residues[10], model)
+        self.assertEqual(len(model.residues()), len(model.chain("B")) + 10)
+        waters = len(model.waters())
+        model.dehydrate()
+        self.assertLess(len(model.atoms()), len(atoms) - waters)
+        self.assertEqual(len(model.molecules()), 6)
+
+
+    def test_chain_indexing(self):
+        chain = atomium.open("tests/integration/files/1lol.cif").model.chain("A")
+        residues = chain.residues()
+        self.assertIs(chain[0], residues[0])
+        self.assertIs(chain[-1], residues[-1])
+        self.assertEqual(chain[10:20], residues[10:20])
+        self.assertIs(chain["A.42"], chain.residue("A.42"))
+        with self.assertRaises(KeyError): chain["B.42"]
+        for n, residue in enumerate(residues):
+            self.assertEqual(chain.index(residue), n)
+        self.assertEqual(chain.index("A.42"), residues.index(chain["A.42"]))
+        with self.assertRaises(ValueError): chain.index("B.42")
+
+
+    def test_secondary_structure_map(self):
+        model = atomium.open("tests/integration/files/1lol.cif").model
+        for chain in model.chains():
+            labels = chain.secondary_structure
+            self.assertEqual(len(labels), len(chain))
+            for residue, label in zip(chain, labels):
+                helix = any(residue in helix for helix in chain.helices)
+                strand = any(residue in strand for strand in chain.strands)
+                self.assertEqual(residue.helix, helix)
+                self.assertEqual(residue.strand, strand)
+                self.assertEqual(label, "H" if helix else "E" if strand else "-")
+            self.assertIn("H", labels)
+            self.assertIn("E", labels)
+
+
+    def test_assembly_transformations(self):
+        f = atomium.open("tests/integration/files/1xda.cif")
+        assembly = [a for a in f.assemblies if a["id"] == 7][0]
+        model = f.generate_assembly(7)
+        self.assertEqual(len(model.atoms()), sum(
+         len(mol.atoms()) for t in assembly["transformations"]
+         for mol in f.model.molecules() if mol._internal_id in t["chains"]
+        ))
+        arrays, rows = model._atom_arrays()
+        self.assertIs(arrays, model._arrays)
+        for atom in model.atoms():
+            self.assertIs(atom._arrays, arrays)
+        source = f.model.atom(element="ZN", het__id="B.30")
+        copies = [a for a in model.atoms() if a.het.id == source.het.id
+         and a.name == source.name]
+        self.assertEqual(len(copies), 3)
+        expected = [tuple(round(sum(
+         m * n for m, n in zip(row, source.location)
+        ) + v, 6) for row, v in zip(t["matrix"], t["vector"]))
+         for t in assembly["transformations"]]
+        self.assertEqual(
+         sorted(tuple(round(n, 6) for n in a.location) for a in copies),
+         sorted(expected)
+        )
+
+
+    def test_lazy_assembly(self):
+        f = atomium.open("tests/integration/files/1xda.cif")
+        view = f.generate_assembly(5, lazy=True)
+        model = f.generate_assembly(5)
+        self.assertEqual(len(view), 3)
+        self.assertIs(view.model, f.model)
+        self.assertAlmostEqual(view.mass, model.mass, delta=0.000001)
+        for a, b in zip(view.center_of_mass, model.center_of_mass):
+            self.assertAlmostEqual(a, b, delta=0.000001)
+        copy = view.copy(1)
+        self.assertIs(view.copy(1), copy)
+        self.assertEqual(
+         {mol.id for mol in copy.molecules()},
+         {mol.id for mol in view.molecules(1)}
+        )
+        atoms, coordinates = view.atoms(1), view.coordinates(1)
+        self.assertEqual(len(atoms), len(copy.atoms()))
+        locations = {
+         (a.het.id, a.id): tuple(round(n, 6) for n in a.location)
+         for a in copy.atoms()
+        }
+        for atom, location in zip(atoms, coordinates):
+            self.assertEqual(
+             locations[(atom.het.id, atom.id)],
+             tuple(round(n, 6) for n in location)
+            )
+        zn = model.atom(element="ZN")
+        found = view.atoms_in_sphere(zn.location, 5)
+        expected = model.atoms_in_sphere(zn.location, 5)
+        self.assertEqual(len(found), len(expected))
+        self.assertEqual(
+         sorted((a.het.id, a.name) for n, a in found),
+         sorted((a.het.id, a.name) for a in expected)
+        )
+        for n, atom in found:
+            self.assertLessEqual(math.dist(
+             view.coordinates(n)[view.atoms(n).index(atom)], zn.location
+            ), 5)
+        found = view.atoms_in_sphere(zn.location, 5, element="N")
+        self.assertEqual(
+         len(found), len(model.atoms_in_sphere(zn.location, 5, element="N"))
+        )
+        f.model.dehydrate()
+        self.assertEqual(len(view.atoms(1)), len(copy.atoms()) - len(
+         [a for a in copy.atoms() if a.het.name == "HOH"]
+        ))
+
+
+    def test_crystal_symmetry(self):
+        f = atomium.open("tests/integration/files/1cbn.cif")
+        model = f.model
+        self.assertIs(model.file, f)
+        cell = f.generate_unit_cell()
+        self.assertEqual(len(cell.chains()), 2 * len(model.chains()))
+        self.assertEqual(len(cell.atoms()), 2 * len(model.atoms()))
+        self.assertAlmostEqual(cell.mass, 2 * model.mass, delta=0.001)
+        mates = model.symmetry_mates(4)
+        self.assertEqual(len(mates.chains()), 10)
+        locations = [atom.location for atom in mates.atoms()]
+        self.assertTrue(model.atoms_in_spheres(locations, 4))
+        self.assertFalse(model.atoms_in_spheres(locations, 0.01))
+        self.assertGreater(len(model.symmetry_mates(8).chains()), 10)
+        f = atomium.open("tests/integration/files/1cbn.mmtf")
+        self.assertIs(f.model.file, f)
+        cell = f.generate_unit_cell()
+        self.assertEqual(len(cell.chains()), 2 * len(f.model.chains()))
+        self.assertEqual(len(f.model.symmetry_mates(4).chains()), 10)
+        model = atomium.open("tests/integration/files/5xme.cif").model
+        with self.assertRaises(ValueError):
+            model.symmetry_mates(4)
+        model = atomium.open("tests/integration/files/5xme.pdb").model
+        with self.assertRaises(ValueError):
+            model.symmetry_mates(4)
+        with self.assertRaises(ValueError):
+            f.model.symmetry_mates(500)
+
+
+    def test_transformation_pipeline(self):
+        model = atomium.open("tests/integration/files/1lol.cif").model
+        chain = model.chain("A")
+        copy1, copy2 = chain.copy(), chain.copy()
+        copy1.rotate(math.pi / 3, "z")
+        copy1.translate(5, -2, 1)
+        copy1.transform([[0, 0, 1], [0, 1, 0], [-1, 0, 0]])
+        copy2.apply(
+         ("rotate", math.pi / 3, "z"), ("translate", (5, -2, 1)),
+         ("transform", [[0, 0, 1], [0, 1, 0], [-1, 0, 0]])
+        )
+        chain.transform(atomium.Atom.transformation_matrix(
+         ("rotate", math.pi / 3, "z"), ("translate", 5, -2, 1),
+         [[0, 0, 1], [0, 1, 0], [-1, 0, 0]]
+        ), trim=None)
+        for copy in (copy1, copy2):
+            for res1, res2 in zip(chain.residues(), copy.residues()):
+                for atom in res1.atoms():
+                    for a, b in zip(atom.location, res2.atom(atom.id).location):
+                        self.assertAlmostEqual(a, b, delta=0.000001)
+        atom = model.atom(1)
+        x, y, z = atom.location
+        model.transform([[1, 0, 0, 1], [0, -1, 0, 2], [0, 0, 1, 3], [0, 0, 0, 1]])
+        self.assertEqual(tuple(atom.location), (
+         round(x + 1, 12), round(2 - y, 12), round(z + 3, 12)
+        ))
+        atom.apply(("translate", 1), ("rotate", math.pi, "z"))
+        self.assertAlmostEqual(atom.location[0], -x - 2, delta=0.000001)
+        with self.assertRaises(ValueError):
+            chain.apply(("scale", 2))
+        with self.assertRaises(ValueError):
+            chain.apply([1, 2, 3])
+
+
+    def test_copies_share_storage(self):
+        model = atomium.open("tests/integration/files/1lol.cif").model
+        chain = model.chain("A")
+        atom = chain[0].atom(name="CA")
+        location, bvalue = atom.location, atom.bvalue
+        copy1, copy2 = chain.copy(), chain.copy()
+        atom1, atom2 = copy1[0].atom(name="CA"), copy2[0].atom(name="CA")
+        self.assertEqual(atom1.location, location)
+        self.assertEqual(atom1.bonded_atoms, set())
+        self.assertIs(copy1[1].previous, copy1[0])
+        self.assertIs(copy1.helices[0][0].chain, copy1)
+        copy1.translate(10, 0, 0)
+        self.assertEqual(atom.location, location)
+        self.assertEqual(atom2.location, location)
+        self.assertAlmostEqual(atom1.location[0], location[0] + 10, delta=0.000001)
+        model.translate(0, 5, 0)
+        self.assertEqual(atom2.location, location)
+        atom2.move_to(1, 2, 3)
+        atom2.bvalue = bvalue + 10
+        self.assertAlmostEqual(atom.location[1], location[1] + 5, delta=0.000001)
+        self.assertEqual(atom.bvalue, bvalue)
+        self.assertNotEqual(
+         copy2[0].atom(name="N").location, chain[0].atom(name="N").location
+        )
+        copy3 = copy2.copy()
+        atom2.bvalue = bvalue
+        self.assertEqual(copy3[0].atom(name="CA").bvalue, bvalue + 10)
+        self.assertEqual(copy3[0].atom(name="CA").location, (1, 2, 3))
+
+
+    def test_distance_matrix(self):
+        model = atomium.open("tests/integration/files/1lol.cif").model
+        residue = model.residue("A.42")
+        atoms, matrix = residue.distance_matrix()
+        self.assertEqual(set(atoms), residue.atoms())
+        self.assertEqual([a.id for a in atoms], sorted(a.id for a in atoms))
+        self.assertEqual(matrix.shape, (len(atoms), len(atoms)))
+        for i, atom1 in enumerate(atoms):
+            for j, atom2 in enumerate(atoms):
+                self.assertAlmostEqual(
+                 matrix[i, j], atom1.distance_to(atom2), delta=0.000001
+                )
+        carbons, matrix = residue.distance_matrix(element="C")
+        self.assertEqual(set(carbons), residue.atoms(element="C"))
+        self.assertEqual(matrix.shape, (len(carbons), len(carbons)))
+        chain = model.chain("A")
+        atoms, (rows, columns, distances) = chain.distance_matrix(cutoff=3)
+        self.assertEqual(len(atoms), len(chain.atoms()))
+        self.assertTrue((distances <= 3).all())
+        self.assertFalse((rows == columns).any())
+        pairs = set(zip(rows.tolist(), columns.tolist()))
+        self.assertEqual(pairs, {(j, i) for i, j in pairs})
+        atom = atoms[100]
+        self.assertEqual(
+         {atoms[j] for i, j in pairs if i == 100},
+         atom.nearby_atoms(3) & chain.atoms()
+        )
+
+
     def test_1xda(self):
         for e in ["cif", "mmtf", "pdb"]:
             f = atomium.open("tests/integration/files/1xda." + e)
@@ -0,0 +1,16 @@
+import sys
+sys.path.insert(0, ".")
+from timeit import timeit
+from atomium.mmcif import mmcif_string_to_mmcif_dict
+
+# Which files should the .cif parser be timed on?
+files = sys.argv[1:] or [
+ "1lol.cif", "1cbn.cif", "1xda.cif", "4opj.cif", "1m4x.cif", "5xme.cif"
+]
+
+# Time how long each takes to become an mmcif dict
+for filename in files:
+    with open("tests/integration/files/" + filename) as f:
+        filestring = f.read()
+    seconds = timeit(lambda: mmcif_string_to_mmcif_dict(filestring), number=5)
+    print("{:<12}{:>10.4f}s".format(filename, seconds / 5))
@@ -1,4 +1,6 @@
+import numpy as np
 from collections import OrderedDict
+from types import SimpleNamespace
 from unittest import TestCase
 from unittest.mock import Mock, patch, PropertyMock, MagicMock
 from atomium.base import *
@@ -64,6 +66,14 @@ class AttributeMatchingTests(TestCase):
         self.assertTrue(attribute_matches_value(10, 10, ["height", "gte"]))
 
 
+    def test_ordering_match_falls_back_to_operators(self):
+        self.assertTrue(attribute_matches_value(1, 0.5, ["charge", "gt"]))
+        self.assertFalse(attribute_matches_value(1, 1.5, ["charge", "gt"]))
+        self.assertTrue(attribute_matches_value(1, 1.0, ["charge", "le"]))
+        self.assertFalse(attribute_matches_value(None, 1, ["charge", "gt"]))
+        self.assertFalse(attribute_matches_value(None, 1, ["charge", "lt"]))
+
+
 
 class ObjectFilteringTests(TestCase):
 
@@ -89,10 +99,97 @@ class ObjectFilteringTests(TestCase):
 
 
 
+class FilterCompilingTests(TestCase):
+
+    def setUp(self):
+        self.structures = [SimpleNamespace(x=1), SimpleNamespace(x=3),
+         SimpleNamespace(x=2)]
+        self.objects = Mock(structures=self.structures)
+        self.objects.column.side_effect = TypeError
+
+
+    def test_can_compile_filter(self):
+        f = compile_filter("x__gt", 1)
+        self.assertEqual(f(self.objects, np.arange(3)).tolist(), [1, 2])
+        self.assertEqual(f(self.objects, np.array([0, 2])).tolist(), [2])
+
+
+    def test_compiled_filters_are_cached(self):
+        self.assertIs(compile_filter("x__lt", 2), compile_filter("x__lt", 2))
+        self.assertIsNot(compile_filter("x__lt", 2), compile_filter("x__lt", 3))
+        self.assertIsNot(compile_filter("x", [1]), compile_filter("x", [1]))
+
+
+    def test_can_filter_on_column(self):
+        self.objects.structures = self.structures + [SimpleNamespace(x=4)]
+        self.objects.column.side_effect = None
+        self.objects.column.return_value = (np.array([0, 1, 1, 2]), ["C", "N", "O"])
+        f = compile_filter("element__regex", "C|O")
+        self.assertTrue(f.indexed)
+        self.assertEqual(f(self.objects, np.array([0, 1, 3])).tolist(), [0, 3])
+        self.objects.column.assert_called_with("element")
+        f = compile_filter("het__name", "N")
+        self.assertEqual(f(self.objects, np.array([0, 1, 3])).tolist(), [1])
+        self.objects.column.assert_called_with("het__name")
+
+
+    def test_can_filter_whole_set_with_index(self):
+        self.objects.structures = self.structures + [SimpleNamespace(x=4)]
+        self.objects.column.side_effect = None
+        self.objects.column.return_value = (np.array([0, 1, 1, 2]), ["C", "N", "O"])
+        self.objects.index.return_value = [
+         np.array([0]), np.array([1, 2]), np.array([3])
+        ]
+        f = compile_filter("element__regex", "C|O")
+        self.assertEqual(f(self.objects, np.arange(4)).tolist(), [0, 3])
+        self.objects.index.assert_called_with("element")
+
+
+    def test_can_filter_with_range_index(self):
+        self.objects.range_index.return_value = (
+         np.array([1.0, 2.0, 3.0]), np.array([0, 2, 1])
+        )
+        f = compile_filter("bvalue__gt", 1)
+        self.assertTrue(f.indexed)
+        self.assertEqual(f(self.objects, np.arange(3)).tolist(), [1, 2])
+        self.assertEqual(f(self.objects, np.array([0, 2])).tolist(), [2])
+        self.objects.range_index.assert_called_with("bvalue")
+        f = compile_filter("charge__le", 2)
+        self.assertEqual(f(self.objects, np.arange(3)).tolist(), [0, 2])
+        self.assertFalse(compile_filter("x__gt", 1).indexed)
+        self.assertFalse(compile_filter("bvalue__gt", "1").indexed)
+
+
+    def test_range_index_matches_scan(self):
+        structures = [
+         Mock(_id=n, charge=c) for n, c in enumerate([1, None, 2.5, 0, 1.0])
+        ]
+        s = StructureSet(*structures)
+        for key in ["charge__gt", "charge__lt", "charge__ge", "charge__le"]:
+            for value in [0.5, 1, 1.0, 2, 3.0]:
+                f = compile_filter(key, value)
+                components = key.split("__")
+                scanned = [n for n, structure in enumerate(structures) if
+                 attribute_matches_value(structure.charge, value, components)]
+                self.assertEqual(f(s, np.arange(5)).tolist(), scanned)
+                self.assertEqual(f(s, np.array([1, 2, 3])).tolist(), [
+                 n for n in scanned if n in (1, 2, 3)
+                ])
+        self.assertEqual(compile_filter("charge__gt", 1)(
+         s, np.arange(5)
+        ).tolist(), [2])
+        self.assertEqual(compile_filter("charge__gt", 0.5)(
+         s, np.arange(5)
+        ).tolist(), [0, 2, 4])
+
+
+
 class QueryDecoratorTests(TestCase):
 
     def setUp(self):
-        self.s = Mock(structures={2, 4, 6}, ids={1, 3, 5})
+        self.s = Mock(
+         structures=[2, 4, 6], members=frozenset([2, 4, 6]), ids={1, 3, 5}
+        )
         self.f = lambda s: self.s
 
 
@@ -101,20 +198,23 @@ class QueryDecoratorTests(TestCase):
         self.assertEqual(f(self), {2, 4, 6})
 
 
-    @patch("atomium.base.filter_objects")
-    def test_can_get_filtered_objects(self, mock_filter):
-        mock_filter.side_effect = [Mock(structures={20}, ids={10})]
+    @patch("atomium.base.compile_filter")
+    def test_can_get_filtered_objects(self, mock_compile):
+        mock_compile.return_value.side_effect = [np.array([0, 2]), np.array([2])]
         f = query(self.f)
-        self.assertEqual(f(self, a=1), {20})
-        mock_filter.assert_any_call(self.s, "a", 1)
+        self.assertEqual(f(self, a=1, b=2), {6})
+        mock_compile.assert_any_call("a", 1)
+        mock_compile.assert_any_call("b", 2)
+        args = mock_compile.return_value.call_args_list
+        self.assertEqual(args[1][0][1].tolist(), [0, 2])
 
 
-    @patch("atomium.base.filter_objects")
-    def test_can_get_filtered_objects_as_tuple(self, mock_filter):
-        mock_filter.side_effect = [Mock(structures={2}, ids={1})]
+    @patch("atomium.base.compile_filter")
+    def test_can_get_filtered_objects_as_tuple(self, mock_compile):
+        mock_compile.return_value.return_value = np.array([0, 2])
         f = query(self.f, tuple_=True)
-        self.assertEqual(f(self, a=1), (2,))
-        mock_filter.assert_any_call(self.s, "a", 1)
+        self.assertEqual(f(self, a=1), (2, 6))
+        mock_compile.assert_called_with("a", 1)
 
 
     def test_can_get_objects_by_id(self):
@@ -223,12 +323,22 @@ class StructureSetTests(TestCase):
     def test_can_get_structure_set_structures(self):
         objects = [Mock(_id=n) for n in range(5)]
         s = StructureSet(*objects)
-        self.assertEqual(s.structures, objects)
+        self.assertEqual(s.structures, tuple(objects))
+        self.assertIs(s.structures, s.structures)
         objects[2]._id = 0
         s = StructureSet(*objects)
         self.assertEqual(set(s.structures), set(objects))
     
 
+    def test_can_check_structure_set_membership(self):
+        objects = [Mock(_id=n) for n in range(5)]
+        s = StructureSet(*objects[:4])
+        self.assertEqual(s.members, frozenset(objects[:4]))
+        self.assertIn(objects[2], s)
+        self.assertNotIn(objects[4], s)
+        self.assertEqual(list(s), list(objects[:4]))
+
+
     def test_can_get_structures_by_id(self):
         objects = [Mock(_id=n) for n in range(5)]
         s = StructureSet(*objects)
@@ -56,4 +56,61 @@ class StructureSetGettingTests(StructureSetTest):
     def test_can_get_structure_by_id(self):
         s = StructureSet(*self.structures)
         self.assertEqual(s.get(1), self.structures[0])
-        self.assertIn(s.get(2), self.structures[1:])
\ No newline at end of file
+        self.assertIn(s.get(2), self.structures[1:])
+
+
+
+class StructureSetColumnTests(StructureSetTest):
+
+    def setUp(self):
+        StructureSetTest.setUp(self)
+        for structure, name in zip(self.structures, ["A", "B", "A"]):
+            structure.name = name
+
+
+    def test_can_get_column(self):
+        s = StructureSet(*self.structures)
+        codes, values = s.column("name")
+        self.assertEqual(
+         [values[code] for code in codes], [st.name for st in s.structures]
+        )
+        self.assertEqual(sorted(values), ["A", "B"])
+
+
+    def test_columns_are_cached_until_changes(self):
+        s = StructureSet(*self.structures)
+        codes, values = s.column("name")
+        self.assertIs(s.column("name")[0], codes)
+        self.structures[0].name = "C"
+        StructureSet.changes += 1
+        codes, values = s.column("name")
+        self.assertEqual(
+         [values[code] for code in codes], [st.name for st in s.structures]
+        )
+
+
+    def test_can_get_index(self):
+        s = StructureSet(*self.structures)
+        codes, values = s.column("name")
+        index = s.index("name")
+        self.assertIs(s.index("name"), index)
+        self.assertEqual(
+         {values[code]: sorted(positions.tolist())
+         for code, positions in enumerate(index)},
+         {name: [n for n, st in enumerate(s.structures) if st.name == name]
+         for name in "AB"}
+        )
+
+
+    def test_can_get_range_index(self):
+        for structure, bvalue in zip(self.structures, [3, None, float("nan")]):
+            structure.bvalue = bvalue
+        s = StructureSet(*self.structures)
+        numbers, order = s.range_index("bvalue")
+        self.assertEqual(numbers.tolist(), [3])
+        self.assertEqual(len(order), 1)
+        self.assertIs(s.structures[order[0]], self.structures[0])
+        self.assertIs(s.range_index("bvalue")[0], numbers)
+        self.structures[2].bvalue = 1
+        StructureSet.changes += 1
+        self.assertEqual(s.range_index("bvalue")[0].tolist(), [1, 3])